@@ -7,6 +7,9 @@ from app.admin.services import AdminService
 from app.admin.schemas import (
     DashboardOverviewResponse,
     CourseAnalyticsResponse,
+    CourseCacheStatsResponse,
+    CourseCounterReconciliationResponse,
+    PartitionMaintenanceResponse,
 )
 
 # Initialize router and service
@@ -46,3 +49,46 @@ async def get_course_analytics(
 ):
     """Get course analytics (Admin only)"""
     return await admin_service.get_course_analytics(session, limit=limit)
+
+
+@admin_router.get(
+    "/stats/cache",
+    response_model=CourseCacheStatsResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(admin_only)],
+    summary="Get course cache statistics",
+    description="Get hits, misses and hit ratio of the course detail and catalog cache, and of this worker's in-process caches (Admin only)",
+)
+async def get_course_cache_stats():
+    """Get course cache statistics (Admin only)"""
+    return await admin_service.get_course_cache_stats()
+
+
+@admin_router.post(
+    "/maintenance/course-counters",
+    response_model=CourseCounterReconciliationResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(admin_only)],
+    summary="Reconcile course engagement counters",
+    description="Recount favourites and completions of every course and correct counters that drifted (Admin only)",
+)
+async def reconcile_course_counters(
+    session: AsyncSession = Depends(get_session),
+):
+    """Reconcile course engagement counters (Admin only)"""
+    return await admin_service.reconcile_course_counters(session)
+
+
+@admin_router.post(
+    "/maintenance/partitions",
+    response_model=PartitionMaintenanceResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(admin_only)],
+    summary="Maintain table partitions",
+    description="Create upcoming monthly chat message partitions and detach those past retention (Admin only)",
+)
+async def maintain_partitions(
+    session: AsyncSession = Depends(get_session),
+):
+    """Maintain table partitions (Admin only)"""
+    return await admin_service.maintain_partitions(session)
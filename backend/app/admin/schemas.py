@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List
+from typing import Dict, List, Optional
 import uuid
 
 
@@ -74,3 +74,42 @@ class CourseAnalyticsResponse(BaseModel):
     courses_by_industry: List[IndustryCourseStats]
     courses_by_niche: List[NicheCourseStats]
     recent_course_activity: List[RecentCourseActivity]
+
+
+class CourseCounterReconciliationResponse(BaseModel):
+    """Schema for the result of recounting course engagement counters"""
+
+    courses_corrected: int
+
+
+class PartitionMaintenanceResponse(BaseModel):
+    """Schema for the result of partition maintenance"""
+
+    created: List[str]
+    detached: List[str]
+
+
+# ==================== CACHE SCHEMAS ====================
+
+
+class CacheKindStats(BaseModel):
+    """Schema for lookups of one kind of cache entry"""
+
+    hits: int
+    misses: int
+    hit_ratio: Optional[float]
+
+
+class LocalCacheStats(CacheKindStats):
+    """Schema for one in-process cache of the worker that answered"""
+
+    entries: int
+
+
+class CourseCacheStatsResponse(BaseModel):
+    """Schema for cache statistics; detail and list are across all workers"""
+
+    detail: CacheKindStats
+    list: CacheKindStats
+    # In-process caches by name, of the worker that answered
+    local: Dict[str, LocalCacheStats]
@@ -16,7 +16,14 @@ from app.admin.schemas import (
     IndustryCourseStats,
     NicheCourseStats,
     RecentCourseActivity,
+    CourseCacheStatsResponse,
+    CourseCounterReconciliationResponse,
+    PartitionMaintenanceResponse,
 )
+from app.core.partitions import maintain_partitions
+from app.core.ttl_cache import ttl_caches
+from app.course.cache import course_cache
+from app.course.services import CourseService
 
 
 class AdminService:
@@ -76,18 +83,13 @@ class AdminService:
         active_users_result = await session.exec(active_users_query)
         active_users_30d = active_users_result.first() or 0
 
-        # Single query for progress stats
-        total_completions_query = select(func.count(UserCourseProgress.id)).where(
-            UserCourseProgress.is_completed == True
+        # Progress totals from the per-course counters
+        progress_totals_query = select(
+            func.coalesce(func.sum(Course.completion_count), 0),
+            func.coalesce(func.sum(Course.favourite_count), 0),
         )
-        total_completions_result = await session.exec(total_completions_query)
-        total_completions = total_completions_result.first() or 0
-
-        total_favourites_query = select(func.count(UserCourseProgress.id)).where(
-            UserCourseProgress.is_favourite == True
-        )
-        total_favourites_result = await session.exec(total_favourites_query)
-        total_favourites = total_favourites_result.first() or 0
+        progress_totals_result = await session.exec(progress_totals_query)
+        total_completions, total_favourites = progress_totals_result.one()
 
         # Users with completions
         users_with_completions_query = select(
@@ -125,78 +127,60 @@ class AdminService:
     ) -> CourseAnalyticsResponse:
         """Get course analytics - HIGHLY OPTIMIZED with JOINs and aggregations"""
 
-        # OPTIMIZATION: Single query to get all course stats with JOINs
-        # Get all courses with their industry and niche names, and progress stats
-        course_stats_query = (
-            select(
-                Course.id,
-                Course.title,
-                Industry.name.label("industry_name"),
-                Niche.name.label("niche_name"),
-                func.sum(
-                    case((UserCourseProgress.is_completed == True, 1), else_=0)
-                ).label("completions"),
-                func.sum(
-                    case((UserCourseProgress.is_favourite == True, 1), else_=0)
-                ).label("favourites"),
-            )
-            .select_from(Course)
-            .join(Industry, Course.industry_id == Industry.id, isouter=True)
-            .join(Niche, Course.niche_id == Niche.id, isouter=True)
-            .join(
-                UserCourseProgress,
-                Course.id == UserCourseProgress.course_id,
-                isouter=True,
+        # Top courses come straight from the denormalized counters: each list is a
+        # backward scan of the (counter, id) index instead of a GROUP BY over all
+        # progress rows
+        def top_courses_query(counter):
+            return (
+                select(
+                    Course.id,
+                    Course.title,
+                    Industry.name.label("industry_name"),
+                    Niche.name.label("niche_name"),
+                    Course.completion_count,
+                    Course.favourite_count,
+                )
+                .select_from(Course)
+                .join(Industry, Course.industry_id == Industry.id, isouter=True)
+                .join(Niche, Course.niche_id == Niche.id, isouter=True)
+                .order_by(counter.desc(), Course.id.desc())
+                .limit(limit)
             )
-            .group_by(Course.id, Course.title, Industry.name, Niche.name)
-        )
-
-        course_stats_result = await session.exec(course_stats_query)
-        all_course_stats = course_stats_result.all()
 
-        # Convert to CourseStatsItem objects
-        course_stats_list = [
-            CourseStatsItem(
-                course_id=row[0],
-                title=row[1],
-                industry_name=row[2] or "Unknown",
-                niche_name=row[3] or "Unknown",
-                completions=int(row[4] or 0),
-                favourites=int(row[5] or 0),
-            )
-            for row in all_course_stats
-        ]
+        def course_stats(rows) -> List[CourseStatsItem]:
+            return [
+                CourseStatsItem(
+                    course_id=row[0],
+                    title=row[1],
+                    industry_name=row[2] or "Unknown",
+                    niche_name=row[3] or "Unknown",
+                    completions=row[4],
+                    favourites=row[5],
+                )
+                for row in rows
+            ]
 
-        # Sort and get top courses by completions
-        top_completions = sorted(
-            course_stats_list, key=lambda x: x.completions, reverse=True
-        )[:limit]
+        top_completions_result = await session.exec(
+            top_courses_query(Course.completion_count)
+        )
+        top_completions = course_stats(top_completions_result.all())
 
-        # Sort and get top courses by favourites
-        top_favourites = sorted(
-            course_stats_list, key=lambda x: x.favourites, reverse=True
-        )[:limit]
+        top_favourites_result = await session.exec(
+            top_courses_query(Course.favourite_count)
+        )
+        top_favourites = course_stats(top_favourites_result.all())
 
-        # OPTIMIZATION: Single query with JOINs to get industry stats
+        # Industry totals sum the counters of their courses
         industry_stats_query = (
             select(
                 Industry.id,
                 Industry.name,
-                func.count(func.distinct(Course.id)).label("course_count"),
-                func.sum(
-                    case((UserCourseProgress.is_completed == True, 1), else_=0)
-                ).label("total_completions"),
-                func.sum(
-                    case((UserCourseProgress.is_favourite == True, 1), else_=0)
-                ).label("total_favourites"),
+                func.count(Course.id).label("course_count"),
+                func.sum(Course.completion_count).label("total_completions"),
+                func.sum(Course.favourite_count).label("total_favourites"),
             )
             .select_from(Industry)
             .join(Course, Industry.id == Course.industry_id, isouter=True)
-            .join(
-                UserCourseProgress,
-                Course.id == UserCourseProgress.course_id,
-                isouter=True,
-            )
             .group_by(Industry.id, Industry.name)
         )
 
@@ -212,28 +196,19 @@ class AdminService:
             for row in industry_stats_result.all()
         ]
 
-        # OPTIMIZATION: Single query with JOINs to get niche stats
+        # Niche totals, likewise
         niche_stats_query = (
             select(
                 Niche.id,
                 Niche.name,
                 Industry.name.label("industry_name"),
-                func.count(func.distinct(Course.id)).label("course_count"),
-                func.sum(
-                    case((UserCourseProgress.is_completed == True, 1), else_=0)
-                ).label("total_completions"),
-                func.sum(
-                    case((UserCourseProgress.is_favourite == True, 1), else_=0)
-                ).label("total_favourites"),
+                func.count(Course.id).label("course_count"),
+                func.sum(Course.completion_count).label("total_completions"),
+                func.sum(Course.favourite_count).label("total_favourites"),
             )
             .select_from(Niche)
             .join(Industry, Niche.industry_id == Industry.id, isouter=True)
             .join(Course, Niche.id == Course.niche_id, isouter=True)
-            .join(
-                UserCourseProgress,
-                Course.id == UserCourseProgress.course_id,
-                isouter=True,
-            )
             .group_by(Niche.id, Niche.name, Industry.name)
         )
 
@@ -345,3 +320,24 @@ class AdminService:
             courses_by_niche=courses_by_niche,
             recent_course_activity=recent_activity,
         )
+
+    async def reconcile_course_counters(
+        self, session: AsyncSession
+    ) -> CourseCounterReconciliationResponse:
+        """Recount course favourites and completions and fix any drift"""
+        corrected = await CourseService().reconcile_engagement_counters(session)
+        return CourseCounterReconciliationResponse(courses_corrected=corrected)
+
+    async def maintain_partitions(
+        self, session: AsyncSession
+    ) -> PartitionMaintenanceResponse:
+        """Create upcoming partitions and detach expired ones"""
+        created, detached = await maintain_partitions(session)
+        return PartitionMaintenanceResponse(created=created, detached=detached)
+
+    async def get_course_cache_stats(self) -> CourseCacheStatsResponse:
+        """Get hit ratio of the course detail and catalog cache"""
+        return CourseCacheStatsResponse(
+            **await course_cache.stats(),
+            local={name: cache.stats() for name, cache in ttl_caches.items()},
+        )
@@ -1,10 +1,12 @@
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy import select, func
-from typing import List, Optional
+from sqlalchemy import select, func, insert
+from typing import Dict, List, Optional
 import uuid
 from datetime import datetime
+from app.core.ids import uuid7
 from app.models.chat import Chat, ChatMessage
 from app.ai_chat.schemas import ChatCreate, ChatMessageCreate
+from app.ai_chat.telemetry import AnalysisTelemetry, message_columns
 
 
 class ChatService:
@@ -15,12 +17,18 @@ class ChatService:
         user_id: uuid.UUID,
         chat_data: ChatCreate,
         session: AsyncSession,
+        telemetry: Optional[AnalysisTelemetry] = None,
+        clause_findings: Optional[Dict[str, str]] = None,
     ) -> Chat:
-        """Create a new chat with messages"""
+        """
+        Create a new chat with messages; telemetry is stored on the assistant message.
+        clause_findings are the analysis's per-clause findings for the contract text.
+        """
         chat = Chat(
             user_id=user_id,
             title=chat_data.title,
             contract_text=getattr(chat_data, "contract_text", None),
+            clause_findings=clause_findings,
         )
         session.add(chat)
         await session.flush()  # Get the chat ID
@@ -32,6 +40,7 @@ class ChatService:
                 role=msg_data.role,
                 content=msg_data.content,
                 reasoning=msg_data.reasoning,
+                **(message_columns(telemetry) if msg_data.role == "assistant" else {}),
             )
             session.add(message)
 
@@ -39,6 +48,70 @@ class ChatService:
         await session.refresh(chat, ["messages"])
         return chat
 
+    async def create_chats_bulk(
+        self,
+        user_id: uuid.UUID,
+        chats_data: List[ChatCreate],
+        session: AsyncSession,
+        telemetries: Optional[List[Optional[AnalysisTelemetry]]] = None,
+        clause_findings: Optional[List[Optional[Dict[str, str]]]] = None,
+    ) -> List[uuid.UUID]:
+        """
+        Create many chats with their messages using one multi-row insert per table.
+        telemetries and clause_findings, if given, line up with chats_data.
+        """
+        if not chats_data:
+            return []
+        telemetries = telemetries or [None] * len(chats_data)
+        clause_findings = clause_findings or [None] * len(chats_data)
+        # Every row of a multi-row insert needs the same columns
+        no_telemetry = dict.fromkeys(
+            ["model", "prompt_tokens", "completion_tokens", "latency_ms", "telemetry"]
+        )
+
+        now = datetime.utcnow()
+        chat_rows = []
+        message_rows = []
+        for chat_data, telemetry, findings in zip(
+            chats_data, telemetries, clause_findings
+        ):
+            chat_id = uuid7()
+            chat_rows.append(
+                {
+                    "id": chat_id,
+                    "user_id": user_id,
+                    "title": chat_data.title,
+                    "contract_text": chat_data.contract_text,
+                    "clause_findings": findings,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+            for msg_data in chat_data.messages:
+                message_rows.append(
+                    {
+                        "id": uuid7(),
+                        "chat_id": chat_id,
+                        "role": msg_data.role,
+                        "content": msg_data.content,
+                        "reasoning": msg_data.reasoning,
+                        "created_at": now,
+                        **no_telemetry,
+                        **(
+                            message_columns(telemetry)
+                            if msg_data.role == "assistant"
+                            else {}
+                        ),
+                    }
+                )
+
+        await session.execute(insert(Chat), chat_rows)
+        if message_rows:
+            await session.execute(insert(ChatMessage), message_rows)
+        await session.commit()
+
+        return [row["id"] for row in chat_rows]
+
     async def get_user_chats(
         self,
         user_id: uuid.UUID,
@@ -93,6 +166,7 @@ class ChatService:
         user_id: uuid.UUID,
         message_data: ChatMessageCreate,
         session: AsyncSession,
+        telemetry: Optional[AnalysisTelemetry] = None,
     ) -> ChatMessage:
         """Add a message to an existing chat"""
         # Verify chat belongs to user
@@ -105,6 +179,7 @@ class ChatService:
             role=message_data.role,
             content=message_data.content,
             reasoning=message_data.reasoning,
+            **message_columns(telemetry),
         )
         session.add(message)
 
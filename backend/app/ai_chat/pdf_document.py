@@ -0,0 +1,48 @@
+import io
+from typing import Dict
+from PyPDF2 import PdfReader
+from fastapi import HTTPException, status
+
+
+class LazyPdfDocument:
+    """
+    PDF whose page text is extracted on demand and cached per page.
+
+    Parsing the page tree is cheap; text extraction is what costs time on long
+    contracts, so callers can pull just the pages they need and only pay for the
+    full text when it has to be stored. Not thread safe: use one thread at a time.
+    """
+
+    def __init__(self, content: bytes):
+        try:
+            self._reader = PdfReader(io.BytesIO(content))
+            self.page_count = len(self._reader.pages)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Failed to extract text from PDF: {str(e)}",
+            )
+        self._pages: Dict[int, str] = {}
+
+    def page_text(self, index: int) -> str:
+        """Text of a single page (0-based), extracted once"""
+        if index not in self._pages:
+            try:
+                self._pages[index] = self._reader.pages[index].extract_text() or ""
+            except Exception as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Failed to extract text from PDF: {str(e)}",
+                )
+        return self._pages[index]
+
+    @property
+    def pages_extracted(self) -> int:
+        """Number of pages whose text has been extracted so far"""
+        return len(self._pages)
+
+    def full_text(self) -> str:
+        """Text of every page, joined once instead of concatenated page by page"""
+        return "\n".join(
+            self.page_text(index) for index in range(self.page_count)
+        ).strip()
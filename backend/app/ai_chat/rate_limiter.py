@@ -0,0 +1,61 @@
+import asyncio
+import time
+from collections import deque
+from typing import Deque, List
+
+
+class TokenRateLimiter:
+    """
+    Admission control for the Groq tokens-per-minute quota.
+
+    Callers reserve an estimated token count before sending a request and settle the
+    reservation with the real usage afterwards. Requests that would push the rolling
+    one-minute window over the limit wait (in arrival order) until older usage expires.
+    The limiter is per worker process, so the quota should be split across workers.
+    """
+
+    def __init__(self, tokens_per_minute: int, window_seconds: float = 60.0):
+        self.capacity = tokens_per_minute
+        self.window_seconds = window_seconds
+        # Each entry is [timestamp, tokens]; tokens are adjusted in place by settle()
+        self._entries: Deque[List[float]] = deque()
+        self._used = 0
+        self._lock = asyncio.Lock()
+
+    def _expire(self, now: float) -> None:
+        """Drop reservations that have left the rolling window"""
+        while self._entries and self._entries[0][0] + self.window_seconds <= now:
+            _, tokens = self._entries.popleft()
+            self._used -= tokens
+
+    @property
+    def tokens_in_window(self) -> int:
+        """Tokens reserved or used within the current window"""
+        self._expire(time.monotonic())
+        return int(self._used)
+
+    async def acquire(self, tokens: int) -> List[float]:
+        """Wait until `tokens` fit in the window and reserve them"""
+        # An oversized request is admitted on its own rather than blocking forever
+        tokens = max(1, min(tokens, self.capacity))
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._expire(now)
+                if self._used + tokens <= self.capacity:
+                    entry = [now, tokens]
+                    self._entries.append(entry)
+                    self._used += tokens
+                    return entry
+
+                wait_seconds = self._entries[0][0] + self.window_seconds - now
+                await asyncio.sleep(max(wait_seconds, 0.05))
+
+    def settle(self, entry: List[float], actual_tokens: int) -> None:
+        """Replace an estimated reservation with the tokens the request really used"""
+        # By identity: two reservations made in the same instant compare equal,
+        # and an expired one must not adjust the usage of a live one
+        if any(e is entry for e in self._entries):
+            self._used += actual_tokens - entry[1]
+            entry[1] = actual_tokens
@@ -8,16 +8,23 @@ from fastapi import (
     Form,
     Query,
 )
-from typing import Optional
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from typing import Optional, List
 from sqlmodel.ext.asyncio.session import AsyncSession
+import asyncio
 import uuid
 
-from app.core.database import get_session
+from app.core.config import settings
+from app.core.database import get_session, async_session_maker
 from app.auth.dependencies import AccessTokenBearer
 from app.ai_chat.services import ContractAnalyzerService
 from app.ai_chat.chat_service import ChatService
 from app.ai_chat.schemas import (
     ContractAnalysisResponse,
+    BatchContractAnalysisItem,
+    BatchContractAnalysisSummary,
+    SavedBatchChat,
     ErrorResponse,
     ChatCreate,
     ChatModel,
@@ -59,6 +66,10 @@ async def analyze_contract(
     save_to_chat: bool = Form(
         False, description="Save this conversation to a new chat"
     ),
+    is_revision: bool = Form(
+        False,
+        description="Treat the uploaded PDF as a revised version of the contract in chat_id and only analyze what changed",
+    ),
     token_details: Dict[str, Any] = Depends(AccessTokenBearer()),
     session: AsyncSession = Depends(get_session),
 ):
@@ -73,11 +84,20 @@ async def analyze_contract(
     Optionally save the conversation to a chat:
     - Set save_to_chat=True to create a new chat
     - Provide chat_id to add messages to an existing chat
+
+    Set is_revision=True together with chat_id and a PDF to diff the upload against
+    the chat's stored contract and only analyze changed or added clauses.
     """
 
+    telemetry = contract_analyzer.new_telemetry()
     contract_text = ""
     extracted_text = None
     additional_context = None
+    previous_contract_text = None
+    excerpt_truncated = False
+    full_text_task: Optional[asyncio.Task] = None
+    previous_clause_findings = None
+    clause_findings = None
 
     # If chat_id is provided and no file, try to get contract text from chat (follow-up question)
     if chat_id and not file:
@@ -104,8 +124,41 @@ async def analyze_contract(
                 detail="Only PDF files are supported",
             )
 
-        extracted_text = contract_analyzer.extract_text_from_pdf(file)
-        contract_text = extracted_text
+        # Opening only parses the page tree; page text is extracted on demand.
+        # PDF parsing is CPU bound; keep it off the event loop
+        content = await file.read()
+        with telemetry.stage("pdf_parse"):
+            document = await run_in_threadpool(contract_analyzer.open_pdf, content)
+
+        # Revised upload for an existing chat: remember the stored version to diff against
+        if is_revision and chat_id:
+            chat = await chat_service.get_chat_by_id(
+                chat_id,
+                uuid.UUID(token_details["user"]["user_uid"]),
+                session,
+            )
+            if chat and chat.contract_text:
+                previous_contract_text = chat.contract_text
+                previous_clause_findings = chat.clause_findings
+
+        if previous_contract_text:
+            # Clause diffing needs the whole revised text
+            with telemetry.stage("pdf_parse"):
+                extracted_text = await run_in_threadpool(document.full_text)
+            contract_text = extracted_text
+        else:
+            # Only the pages that fit the prompt budget are extracted up front
+            with telemetry.stage("pdf_parse"):
+                contract_text, excerpt_truncated = await run_in_threadpool(
+                    contract_analyzer.build_budgeted_context, document, user_text
+                )
+            # Returned as-is unless the full text is extracted for storage below
+            extracted_text = contract_text
+            if save_to_chat or chat_id:
+                # The full text is only needed for storage; extract it while the model runs
+                full_text_task = asyncio.create_task(
+                    run_in_threadpool(document.full_text)
+                )
 
     # Handle user text - if there's PDF text, treat user_text as additional context/questions
     # Otherwise, user_text is the contract text itself
@@ -126,26 +179,43 @@ async def analyze_contract(
             detail="Either a PDF file or text input must be provided, or this chat must have a previously uploaded contract",
         )
 
-    # Analyze the contract (returns formatted analysis with reasoning)
-    formatted_analysis = await contract_analyzer.analyze_contract(
-        contract_text=contract_text,
-        user_text=additional_context,  # Pass additional context separately if provided
-    )
+    try:
+        if previous_contract_text:
+            # Only changed clauses go to the model; unchanged ones reuse cached findings
+            formatted_analysis, clause_findings = (
+                await contract_analyzer.analyze_contract_revision(
+                    previous_text=previous_contract_text,
+                    revised_text=contract_text,
+                    clause_findings=previous_clause_findings,
+                    user_text=additional_context,
+                    telemetry=telemetry,
+                )
+            )
+        else:
+            if save_to_chat or (chat_id and file):
+                # The contract is stored: keep per-clause findings for later revisions
+                clause_findings = {}
+            # Analyze the contract (returns formatted analysis with reasoning)
+            formatted_analysis = await contract_analyzer.analyze_contract(
+                contract_text=contract_text,
+                user_text=additional_context,  # Pass additional context separately if provided
+                already_truncated=excerpt_truncated,
+                telemetry=telemetry,
+                clause_findings=clause_findings,
+            )
+    except BaseException:
+        if full_text_task:
+            full_text_task.cancel()
+        raise
+
+    if full_text_task:
+        extracted_text = await full_text_task
 
     # Extract reasoning and main response from formatted string for saving to database
     # The formatted string has format: "--- Model Reasoning ---\n\n[reasoning]\n\n[divider]\n\n[main]"
-    separator = "--- Model Reasoning ---\n\n"
-    divider = "\n\n" + "=" * 60 + "\n\n"
-
-    main_response = formatted_analysis
-    reasoning_text = None
-
-    if separator in formatted_analysis and divider in formatted_analysis:
-        parts = formatted_analysis.split(divider)
-        if len(parts) == 2:
-            reasoning_part = parts[0].replace(separator, "").strip()
-            main_response = parts[1].strip()
-            reasoning_text = reasoning_part if reasoning_part else None
+    main_response, reasoning_text = contract_analyzer.split_formatted_analysis(
+        formatted_analysis
+    )
 
     # Save to chat if requested
     user_id = uuid.UUID(token_details["user"]["user_uid"])
@@ -174,7 +244,13 @@ async def analyze_contract(
             ],
             contract_text=extracted_text or contract_text,  # Store contract text
         )
-        created_chat = await chat_service.create_chat(user_id, chat_data, session)
+        created_chat = await chat_service.create_chat(
+            user_id,
+            chat_data,
+            session,
+            telemetry=telemetry,
+            clause_findings=clause_findings,
+        )
         result_chat_id = created_chat.id
 
     elif chat_id:
@@ -188,6 +264,8 @@ async def analyze_contract(
             chat = await chat_service.get_chat_by_id(chat_id, user_id, session)
             if chat:
                 chat.contract_text = extracted_text
+                if clause_findings is not None:
+                    chat.clause_findings = clause_findings
                 session.add(chat)
                 await session.commit()
 
@@ -212,6 +290,7 @@ async def analyze_contract(
                 reasoning=reasoning_text if reasoning_text else None,
             ),
             session,
+            telemetry=telemetry,
         )
         result_chat_id = chat_id
 
@@ -222,6 +301,171 @@ async def analyze_contract(
     )
 
 
+@ai_chat_router.post(
+    "/analyze-contracts/batch",
+    status_code=status.HTTP_200_OK,
+    summary="Analyze several contracts",
+    description="Upload several PDF contracts at once. Results are streamed back as newline-delimited JSON, one line per file as soon as it finishes, followed by a summary line.",
+    responses={
+        200: {"content": {"application/x-ndjson": {}}},
+        400: {
+            "model": ErrorResponse,
+            "description": "Bad request - too many files or a non-PDF file",
+        },
+        401: {"model": ErrorResponse, "description": "Unauthorized"},
+    },
+)
+async def analyze_contracts_batch(
+    files: List[UploadFile] = File(..., description="PDF contract files"),
+    user_text: Optional[str] = Form(
+        None, description="Additional text or questions applied to every contract"
+    ),
+    save_to_chats: bool = Form(
+        False, description="Save each analyzed contract to its own new chat"
+    ),
+    token_details: Dict[str, Any] = Depends(AccessTokenBearer()),
+):
+    """
+    Analyze many contracts concurrently.
+
+    Every file is parsed in the worker thread pool (only the pages the prompt needs,
+    plus the full text when saving) and analyzed concurrently; the
+    shared TPM rate limiter decides when each request may go to Groq. Each stream
+    line is a BatchContractAnalysisItem, the last one a BatchContractAnalysisSummary.
+    With save_to_chats=True all successful analyses are stored in one bulk insert.
+    """
+    if len(files) > settings.BATCH_ANALYSIS_MAX_FILES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.BATCH_ANALYSIS_MAX_FILES} files can be analyzed per batch",
+        )
+
+    for file in files:
+        if file.content_type != "application/pdf":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Only PDF files are supported ({file.filename})",
+            )
+
+    user_id = uuid.UUID(token_details["user"]["user_uid"])
+
+    # Read uploads now; they are closed once the handler returns
+    uploads = [(file.filename, await file.read()) for file in files]
+
+    async def analyze_one(index: int, filename: Optional[str], content: bytes):
+        telemetry = contract_analyzer.new_telemetry()
+        try:
+            with telemetry.stage("pdf_parse"):
+                document = await run_in_threadpool(contract_analyzer.open_pdf, content)
+                excerpt, excerpt_truncated = await run_in_threadpool(
+                    contract_analyzer.build_budgeted_context, document, user_text
+                )
+            if not excerpt.strip():
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="No text could be extracted from this PDF",
+                )
+            clause_findings = {} if save_to_chats else None
+            formatted_analysis = await contract_analyzer.analyze_contract(
+                contract_text=excerpt,
+                user_text=user_text,
+                already_truncated=excerpt_truncated,
+                telemetry=telemetry,
+                clause_findings=clause_findings,
+            )
+            # Full text is only worth extracting when it is stored
+            contract_text = (
+                await run_in_threadpool(document.full_text) if save_to_chats else None
+            )
+        except HTTPException as e:
+            return (
+                BatchContractAnalysisItem(
+                    index=index, filename=filename, status="failed", error=str(e.detail)
+                ),
+                None,
+                None,
+                None,
+            )
+        return (
+            BatchContractAnalysisItem(
+                index=index,
+                filename=filename,
+                status="completed",
+                analysis=formatted_analysis,
+            ),
+            contract_text,
+            telemetry,
+            clause_findings,
+        )
+
+    async def stream_results():
+        tasks = [
+            asyncio.create_task(analyze_one(index, filename, content))
+            for index, (filename, content) in enumerate(uploads)
+        ]
+        completed = []
+        failed = 0
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                item, contract_text, telemetry, clause_findings = await next_result
+                if item.status == "completed":
+                    completed.append((item, contract_text, telemetry, clause_findings))
+                else:
+                    failed += 1
+                yield item.model_dump_json() + "\n"
+        finally:
+            # Client went away: stop spending quota on the remaining files
+            for task in tasks:
+                task.cancel()
+
+        saved_chats: List[SavedBatchChat] = []
+        if save_to_chats and completed:
+            completed.sort(key=lambda pair: pair[0].index)
+            chats_data = []
+            for item, contract_text, _, _ in completed:
+                main_response, reasoning_text = (
+                    contract_analyzer.split_formatted_analysis(item.analysis)
+                )
+                chats_data.append(
+                    ChatCreate(
+                        title=item.filename or "Contract Analysis",
+                        messages=[
+                            ChatMessageCreate(
+                                role="user",
+                                content=user_text or f"Uploaded: {item.filename}",
+                            ),
+                            ChatMessageCreate(
+                                role="assistant",
+                                content=main_response,
+                                reasoning=reasoning_text,
+                            ),
+                        ],
+                        contract_text=contract_text,
+                    )
+                )
+
+            # The request-scoped session is gone by the time the stream runs
+            async with async_session_maker() as session:
+                chat_ids = await chat_service.create_chats_bulk(
+                    user_id,
+                    chats_data,
+                    session,
+                    telemetries=[telemetry for _, _, telemetry, _ in completed],
+                    clause_findings=[findings for _, _, _, findings in completed],
+                )
+            saved_chats = [
+                SavedBatchChat(index=item.index, filename=item.filename, chat_id=chat_id)
+                for (item, _, _, _), chat_id in zip(completed, chat_ids)
+            ]
+
+        summary = BatchContractAnalysisSummary(
+            completed=len(completed), failed=failed, chats=saved_chats
+        )
+        yield summary.model_dump_json() + "\n"
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
 @ai_chat_router.post(
     "/chats",
     response_model=ChatModel,
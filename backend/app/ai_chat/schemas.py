@@ -17,7 +17,8 @@ class ContractAnalysisResponse(BaseModel):
 
     analysis: str = Field(..., description="The AI-generated contract analysis")
     extracted_text: Optional[str] = Field(
-        None, description="Extracted text from the PDF if provided"
+        None,
+        description="Extracted text from the PDF if provided. Full text when the analysis is saved to a chat, otherwise the excerpt that was analyzed",
     )
     timestamp: datetime = Field(default_factory=datetime.utcnow)
     chat_id: Optional[uuid.UUID] = Field(
@@ -25,6 +26,38 @@ class ContractAnalysisResponse(BaseModel):
     )
 
 
+class BatchContractAnalysisItem(BaseModel):
+    """One line of the batch analysis stream, emitted as soon as a file finishes"""
+
+    type: str = Field(default="result", description="Always 'result'")
+    index: int = Field(..., description="Position of the file in the upload")
+    filename: Optional[str] = Field(None, description="Uploaded file name")
+    status: str = Field(..., description="'completed' or 'failed'")
+    analysis: Optional[str] = Field(
+        None, description="The AI-generated contract analysis"
+    )
+    error: Optional[str] = Field(None, description="Why the file could not be analyzed")
+
+
+class SavedBatchChat(BaseModel):
+    """Chat created for one file of a batch analysis"""
+
+    index: int
+    filename: Optional[str] = None
+    chat_id: uuid.UUID
+
+
+class BatchContractAnalysisSummary(BaseModel):
+    """Final line of the batch analysis stream"""
+
+    type: str = Field(default="summary", description="Always 'summary'")
+    completed: int
+    failed: int
+    chats: List[SavedBatchChat] = Field(
+        default_factory=list, description="Chats created when save_to_chats is set"
+    )
+
+
 class ErrorResponse(BaseModel):
     """Error response model"""
 
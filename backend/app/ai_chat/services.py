@@ -1,21 +1,36 @@
-import io
 import re
-from typing import Optional, List
-from groq import Groq
-from PyPDF2 import PdfReader
+import hashlib
+import difflib
+from typing import Optional, List, Dict
+from groq import AsyncGroq
 from fastapi import UploadFile, HTTPException, status
 from app.core.config import settings
+from app.ai_chat.pdf_document import LazyPdfDocument
+from app.ai_chat.rate_limiter import TokenRateLimiter
+from app.ai_chat.telemetry import AnalysisTelemetry
 
 
 class ContractAnalyzerService:
     """Service for analyzing contracts using Groq AI"""
 
     def __init__(self):
-        self.client = Groq(api_key=settings.GROQ_API_KEY)
+        self.client = AsyncGroq(
+            api_key=settings.GROQ_API_KEY,
+            base_url=settings.GROQ_BASE_URL or None,
+        )
         self.model = settings.GROQ_MODEL  # Qwen3 32B model on Groq (configurable)
+        # Shared by every analysis in this worker so concurrent requests respect the TPM quota
+        self.rate_limiter = TokenRateLimiter(settings.GROQ_TPM_LIMIT)
+        self.MAX_COMPLETION_TOKENS = 3000
+        # Completion tokens reserved up front; settled with real usage after each call
+        self.EXPECTED_COMPLETION_TOKENS = 1000
         # Approximate token limit: 6000 TPM, reserve ~2000 for prompt/examples, ~2000 for response, ~2000 for contract
         # Rough estimate: 1 token ≈ 4 characters, so ~8000 chars for contract text (conservative)
         self.MAX_CONTRACT_CHARS = 8000  # Reduced to account for large prompt overhead
+        # Contract budget for the one retry after a prompt is rejected as too large
+        self.FALLBACK_CONTRACT_CHARS = 5000
+        # Key-term matches per 1000 characters for a middle page to be worth including
+        self.MIN_KEY_TERM_DENSITY = 2.0
 
         # Key terms to search for in contracts (important sections)
         self.KEY_TERMS = [
@@ -58,27 +73,116 @@ class ContractAnalyzerService:
             "governing": {"jurisdiction", "law"},
         }
 
+        # Lines that open a new clause: "1. Payment", "2.3 Fees", "Section 4", "Article IV"
+        self.CLAUSE_HEADING = re.compile(
+            r"^(?:(?:section|article|clause)\s+[0-9ivx]+\b|\d+[.)]\s|\d+(?:\.\d+)+\.?\s)",
+            re.IGNORECASE,
+        )
+        # Heading of the per-clause notes that close a first analysis
+        self.CLAUSE_NOTES_HEADING = re.compile(
+            r"^\s*CLAUSE NOTES\s*:?", re.IGNORECASE | re.MULTILINE
+        )
+
     def extract_text_from_pdf(self, file: UploadFile) -> str:
         """Extract text content from a PDF file"""
-        try:
-            # Read the file content
-            content = file.file.read()
-            pdf_file = io.BytesIO(content)
+        # Read the file content
+        return self.extract_text_from_pdf_bytes(file.file.read())
 
-            # Create PDF reader
-            pdf_reader = PdfReader(pdf_file)
+    def extract_text_from_pdf_bytes(self, content: bytes) -> str:
+        """Extract text content from raw PDF bytes (CPU bound, run in a worker thread)"""
+        return self.open_pdf(content).full_text()
 
-            # Extract text from all pages
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
+    def open_pdf(self, content: bytes) -> LazyPdfDocument:
+        """Open a PDF for page-level extraction without extracting any text yet"""
+        return LazyPdfDocument(content)
 
-            return text.strip()
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Failed to extract text from PDF: {str(e)}",
+    def build_budgeted_context(
+        self, document: LazyPdfDocument, user_text: Optional[str] = None
+    ) -> tuple[str, bool]:
+        """
+        Build the contract context for the prompt straight from PDF pages.
+        Extracts the first and last pages, then scans middle pages for key-term
+        density and stops as soon as the character budget is filled, so long
+        documents never have every page extracted before the model is called.
+        Returns (context_text, was_truncated)
+        """
+        page_count = document.page_count
+        if page_count == 0:
+            return "", False
+
+        first_page = document.page_text(0)
+        last_page = document.page_text(page_count - 1) if page_count > 1 else ""
+
+        # Short documents: full extraction is cheap and keeps the regular behaviour
+        estimated_chars = (len(first_page) + len(last_page)) / 2 * page_count
+        if page_count <= 2 or estimated_chars <= self.MAX_CONTRACT_CHARS:
+            return self.smart_extract_contract_sections(document.full_text())
+
+        # 1. Beginning (up to 30% of the budget) - definitions and main terms
+        beginning_chars = int(self.MAX_CONTRACT_CHARS * 0.3)
+        head_pages = [first_page]
+        next_page = 1
+        while sum(len(page) for page in head_pages) < beginning_chars and next_page < page_count - 1:
+            head_pages.append(document.page_text(next_page))
+            next_page += 1
+        beginning = "\n".join(head_pages)[:beginning_chars]
+        last_period = beginning.rfind(".")
+        if last_period > beginning_chars * 0.7:
+            beginning = beginning[: last_period + 1]
+
+        # 2. Ending (up to 30% of the budget) - signatures are short, so walk back a page if needed
+        ending_chars = int(self.MAX_CONTRACT_CHARS * 0.3)
+        tail_pages = [last_page]
+        previous_page = page_count - 2
+        while sum(len(page) for page in tail_pages) < ending_chars and previous_page >= next_page:
+            tail_pages.insert(0, document.page_text(previous_page))
+            previous_page -= 1
+        ending = "\n".join(tail_pages)[-ending_chars:]
+        first_period = ending.find(".")
+        if 0 < first_period < ending_chars * 0.3:
+            ending = ending[first_period + 1 :]
+
+        # 3. Middle pages, in order, until the remaining budget is full of relevant text
+        question_keywords = self._question_keywords(user_text)
+        remaining_chars = self.MAX_CONTRACT_CHARS - len(beginning) - len(ending) - 200
+        key_sections: List[str] = []
+        for index in range(next_page, previous_page + 1):
+            if remaining_chars < 200:
+                break
+            page = document.page_text(index)
+            if not page.strip():
+                continue
+
+            hits = sum(
+                len(re.findall(pattern, page, re.IGNORECASE))
+                for pattern in self.KEY_TERMS
             )
+            lower_page = page.lower()
+            hits += 2 * sum(1 for kw in question_keywords if kw in lower_page)
+            density = hits * 1000 / len(page)
+            if density < self.MIN_KEY_TERM_DENSITY:
+                continue
+
+            section = self._extract_key_term_sections(
+                page, remaining_chars, skip_first=False
+            )
+            if section:
+                key_sections.append(f"(page {index + 1}) {section}")
+                remaining_chars -= len(section) + 12
+
+        extracted_parts = [f"[BEGINNING OF CONTRACT]\n{beginning}"]
+        if key_sections:
+            extracted_parts.append(
+                "\n\n[KEY SECTIONS - Payment, IP, Termination, etc.]\n"
+                + "\n".join(key_sections)
+            )
+        extracted_parts.append(f"\n\n[END OF CONTRACT]\n{ending}")
+
+        combined = "\n".join(extracted_parts)
+        if len(combined) > self.MAX_CONTRACT_CHARS:
+            combined = combined[: self.MAX_CONTRACT_CHARS]
+
+        return combined, True
 
     def smart_extract_contract_sections(self, full_text: str) -> tuple[str, bool]:
         """
@@ -136,7 +240,9 @@ class ContractAnalyzerService:
 
         return combined, was_truncated
 
-    def _extract_key_term_sections(self, text: str, max_chars: int) -> str:
+    def _extract_key_term_sections(
+        self, text: str, max_chars: int, skip_first: bool = True
+    ) -> str:
         """Extract sections of text that contain important contract terms"""
         if max_chars <= 0:
             return ""
@@ -172,8 +278,8 @@ class ContractAnalyzerService:
             context_end = min(len(sentences), idx + 2)
 
             for j in range(context_start, context_end):
-                if (
-                    j not in extracted_indices and j != 0
+                if j not in extracted_indices and (
+                    j != 0 or not skip_first
                 ):  # Skip first sentence (already in beginning)
                     extracted_indices.add(j)
                     relevant_sentences.append((j, sentences[j]))
@@ -187,16 +293,10 @@ class ContractAnalyzerService:
         relevant_sentences.sort(key=lambda x: x[0])
         return " ".join(sent for _, sent in relevant_sentences)
 
-    def _extract_relevant_sections(
-        self, text: str, user_text: Optional[str], max_chars: Optional[int] = None
-    ) -> tuple[Optional[str], bool]:
-        """Extract contract sections that relate to the user's specific question."""
-
+    def _question_keywords(self, user_text: Optional[str]) -> set:
+        """Keywords, phrases, numbers and synonyms taken from the user's question"""
         if not user_text:
-            return None, False
-
-        if max_chars is None:
-            max_chars = self.MAX_CONTRACT_CHARS
+            return set()
 
         # Build keyword set from user text (words >= 3 characters)
         raw_words = re.findall(r"[A-Za-z0-9]{3,}", user_text)
@@ -232,7 +332,20 @@ class ContractAnalyzerService:
             if kw in self.KEYWORD_SYNONYMS:
                 expanded_keywords.update(self.KEYWORD_SYNONYMS[kw])
 
-        keywords = expanded_keywords
+        return expanded_keywords
+
+    def _extract_relevant_sections(
+        self, text: str, user_text: Optional[str], max_chars: Optional[int] = None
+    ) -> tuple[Optional[str], bool]:
+        """Extract contract sections that relate to the user's specific question."""
+
+        if not user_text:
+            return None, False
+
+        if max_chars is None:
+            max_chars = self.MAX_CONTRACT_CHARS
+
+        keywords = self._question_keywords(user_text)
 
         if not keywords:
             return None, False
@@ -358,13 +471,36 @@ class ContractAnalyzerService:
 
         return formatted
 
+    def split_formatted_analysis(
+        self, formatted_analysis: str
+    ) -> tuple[str, Optional[str]]:
+        """
+        Undo format_response_with_reasoning for storage.
+        Returns (main_response, reasoning_text or None)
+        """
+        separator = "--- Model Reasoning ---\n\n"
+        divider = "\n\n" + "=" * 60 + "\n\n"
+
+        main_response = formatted_analysis
+        reasoning_text = None
+
+        if separator in formatted_analysis and divider in formatted_analysis:
+            parts = formatted_analysis.split(divider)
+            if len(parts) == 2:
+                reasoning_part = parts[0].replace(separator, "").strip()
+                main_response = parts[1].strip()
+                reasoning_text = reasoning_part if reasoning_part else None
+
+        return main_response, reasoning_text
+
     def build_few_shot_prompt(
         self,
         contract_text: str,
         user_text: Optional[str] = None,
         was_truncated: bool = False,
+        clause_notes: bool = False,
     ) -> str:
-        """Build a few-shot prompt for contract analysis"""
+        """Build a few-shot prompt for contract analysis; clause_notes expects [CLAUSE n] labels"""
 
         # System Prompt
         system_prompt = """You are a contract analysis assistant specializing in creative industry agreements. Your role is to help creative professionals understand their contracts by highlighting important terms, explaining legal language in plain English, and pointing out areas that typically require careful attention.
@@ -419,6 +555,11 @@ Key Guidelines:
         if was_truncated:
             truncation_note = "\n\nNOTE: Due to length limitations, this analysis includes the beginning of the contract, key sections containing important terms (payment, IP rights, termination, etc.), and the ending. Some middle sections may have been omitted. For a complete analysis of all clauses, consider reviewing the full contract with legal counsel."
 
+        # Placed before the contract text so it survives truncation of the prompt
+        clause_notes_note = ""
+        if clause_notes:
+            clause_notes_note = "\n\nThe contract text is split into labelled clauses ([CLAUSE 1], [CLAUSE 2], ...). Do not use these labels in your analysis. After everything else, including the reminder about legal counsel, add a final section that starts with the line CLAUSE NOTES: and lists each clause you were given as its label followed by a one-sentence, plain-language note on what it means for the creative professional, one clause per line."
+
         # Build the prompt
         prompt = f"""{system_prompt}
 
@@ -426,7 +567,7 @@ Key Guidelines:
 
 {guidelines}
 
-Now analyze the following contract:{truncation_note}
+Now analyze the following contract:{truncation_note}{clause_notes_note}
 
 CONTRACT TEXT:
 {contract_text}
@@ -444,79 +585,24 @@ USER'S ADDITIONAL QUESTIONS/CONTEXT:
 
         return prompt
 
-    async def analyze_contract(
-        self, contract_text: str, user_text: Optional[str] = None
-    ) -> str:
-        """Analyze a contract using Groq AI"""
-
-        if not settings.GROQ_API_KEY:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Groq API key is not configured",
-            )
-
-        try:
-            # Smart extract contract sections if needed
-            extracted_text, was_truncated = self.smart_extract_contract_sections(
-                contract_text
-            )
-
-            # If we have a user-specific question, try to pull the most relevant sections
-            relevant_sections, used_relevant = self._extract_relevant_sections(
-                contract_text, user_text
-            )
+    def new_telemetry(self) -> AnalysisTelemetry:
+        """Telemetry for one analysis request; start it before the PDF is parsed"""
+        return AnalysisTelemetry(model=self.model)
 
-            contract_context = extracted_text
+    async def _complete(
+        self, prompt: str, telemetry: Optional[AnalysisTelemetry] = None
+    ) -> str:
+        """Send a prompt to Groq under TPM admission control and return the raw completion text"""
+        telemetry = telemetry or self.new_telemetry()
 
-            if relevant_sections:
-                contract_context = (
-                    "[TARGETED EXTRACT BASED ON QUESTION]\n" + relevant_sections
-                )
-                if len(contract_context) < self.MAX_CONTRACT_CHARS * 0.8:
-                    remaining_chars = self.MAX_CONTRACT_CHARS - len(contract_context)
-                    supplemental = extracted_text[:remaining_chars]
-                    if supplemental:
-                        contract_context += "\n\n[ADDITIONAL CONTEXT]\n" + supplemental
-                was_truncated = was_truncated or used_relevant
-
-            # Build the prompt
-            prompt = self.build_few_shot_prompt(
-                contract_context, user_text, was_truncated
+        # Rough estimate: 1 token ≈ 4 characters
+        with telemetry.stage("rate_limit_wait"):
+            reservation = await self.rate_limiter.acquire(
+                int(len(prompt) / 4) + self.EXPECTED_COMPLETION_TOKENS
             )
 
-            # Estimate token count (rough: 1 token ≈ 4 characters)
-            # Check if prompt is still too large
-            estimated_tokens = len(prompt) / 4
-            if estimated_tokens > 5500:  # Leave some buffer under 6000 limit
-                # Further truncate contract text if needed
-                contract_part_start = prompt.find("CONTRACT TEXT:")
-                if contract_part_start > 0:
-                    # Get the base prompt (everything before contract text)
-                    base_prompt = prompt[:contract_part_start]
-                    base_tokens = len(base_prompt) / 4
-                    remaining_tokens = 5500 - base_tokens
-                    max_contract_chars = int(
-                        remaining_tokens * 4 * 0.9
-                    )  # 90% to be safe
-
-                    # Extract contract text from prompt
-                    contract_start = prompt.find("\n", contract_part_start) + 1
-                    contract_text_in_prompt = prompt[contract_start:]
-
-                    if len(contract_text_in_prompt) > max_contract_chars:
-                        # Further truncate
-                        truncated_contract = contract_text_in_prompt[
-                            :max_contract_chars
-                        ]
-                        last_period = truncated_contract.rfind(".")
-                        if last_period > max_contract_chars * 0.9:
-                            truncated_contract = truncated_contract[: last_period + 1]
-
-                        prompt = base_prompt + "\n" + truncated_contract
-                        was_truncated = True
-
-            # Call Groq API
-            chat_completion = self.client.chat.completions.create(
+        with telemetry.stage("upstream"):
+            chat_completion = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
                     {
@@ -526,83 +612,542 @@ USER'S ADDITIONAL QUESTIONS/CONTEXT:
                     {"role": "user", "content": prompt},
                 ],
                 temperature=0.3,  # Lower temperature for more consistent, factual analysis
-                max_tokens=3000,  # Increased for comprehensive analysis
+                max_tokens=self.MAX_COMPLETION_TOKENS,  # Increased for comprehensive analysis
             )
 
-            analysis = chat_completion.choices[0].message.content
-
-            # Extract reasoning and clean the main response
-            main_response, reasoning_text = self.extract_reasoning_and_clean_response(
-                analysis
+        if chat_completion.usage:
+            self.rate_limiter.settle(reservation, chat_completion.usage.total_tokens)
+            telemetry.add_usage(
+                chat_completion.usage.prompt_tokens,
+                chat_completion.usage.completion_tokens,
             )
 
-            # Format response with reasoning if it exists
-            analysis = self.format_response_with_reasoning(
-                main_response, reasoning_text
+        return chat_completion.choices[0].message.content
+
+    async def analyze_contract(
+        self,
+        contract_text: str,
+        user_text: Optional[str] = None,
+        already_truncated: bool = False,
+        telemetry: Optional[AnalysisTelemetry] = None,
+        clause_findings: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """
+        Analyze a contract using Groq AI.
+        Set already_truncated when contract_text is an excerpt (see build_budgeted_context).
+        Stage timings and token usage are collected in `telemetry` and exported when done.
+        If `clause_findings` is given and the prompt holds the whole contract, it is
+        filled with a finding per clause (keyed by clause_key) for
+        analyze_contract_revision to reuse; an excerpt's clauses would not match
+        the stored text, so no notes are asked for then.
+        """
+        telemetry = telemetry or self.new_telemetry()
+
+        if not settings.GROQ_API_KEY:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Groq API key is not configured",
             )
 
-            # Add warning if truncated
-            if was_truncated:
-                warning = (
-                    "Important Note: This analysis is based on a strategic extraction of the contract that includes:\n"
-                    "- The beginning (definitions, main terms)\n"
-                    "- Key sections (payment, IP rights, termination, liability, etc.)\n"
-                    "- The ending (important clauses, dispute resolution, etc.)\n\n"
-                    "Some middle sections may have been omitted. For a complete analysis, please review the full contract with legal counsel.\n\n"
+        try:
+            with telemetry.stage("extraction"):
+                # Smart extract contract sections if needed
+                extracted_text, was_truncated = self.smart_extract_contract_sections(
+                    contract_text
                 )
-                analysis = warning + analysis
+                was_truncated = was_truncated or already_truncated
 
-            return analysis
+                # If we have a user-specific question, try to pull the most relevant sections
+                relevant_sections, used_relevant = self._extract_relevant_sections(
+                    contract_text, user_text
+                )
 
-        except Exception as e:
-            error_message = str(e)
-            if (
-                "rate_limit_exceeded" in error_message
-                or "Request too large" in error_message
-            ):
-                # Try one more time with even more aggressive truncation
-                try:
-                    # Reduce to 5000 chars max
-                    very_short_text = contract_text[:5000]
-                    last_period = very_short_text.rfind(".")
-                    if last_period > 4000:
-                        very_short_text = very_short_text[: last_period + 1]
-
-                    prompt = self.build_few_shot_prompt(
-                        very_short_text, user_text, True
-                    )
+                contract_context = extracted_text
 
-                    chat_completion = self.client.chat.completions.create(
-                        model=self.model,
-                        messages=[
-                            {
-                                "role": "system",
-                                "content": "You are a contract analysis assistant specializing in creative industry agreements. Present factual observations about contract terms without making judgments. Explain technical legal language in plain terms. Always defer to legal professionals for specific advice.",
-                            },
-                            {"role": "user", "content": prompt},
-                        ],
-                        temperature=0.3,
-                        max_tokens=3000,
+                if relevant_sections:
+                    contract_context = (
+                        "[TARGETED EXTRACT BASED ON QUESTION]\n" + relevant_sections
                     )
-
-                    analysis = chat_completion.choices[0].message.content
-                    # Extract reasoning and clean
-                    main_response, reasoning_text = (
-                        self.extract_reasoning_and_clean_response(analysis)
+                    if len(contract_context) < self.MAX_CONTRACT_CHARS * 0.8:
+                        remaining_chars = self.MAX_CONTRACT_CHARS - len(contract_context)
+                        supplemental = extracted_text[:remaining_chars]
+                        if supplemental:
+                            contract_context += "\n\n[ADDITIONAL CONTEXT]\n" + supplemental
+                    was_truncated = was_truncated or used_relevant
+
+                clauses: List[str] = []
+                clause_notes = (
+                    clause_findings is not None
+                    and not was_truncated
+                    and not relevant_sections
+                )
+                if clause_notes:
+                    # Label the clauses so the model can note each one separately
+                    clauses = self.split_into_clauses(contract_context)
+                    contract_context = "\n\n".join(
+                        f"[CLAUSE {number}] {clause}"
+                        for number, clause in enumerate(clauses, start=1)
                     )
-                    analysis = self.format_response_with_reasoning(
-                        main_response, reasoning_text
+
+            with telemetry.stage("prompt_build"):
+                # Build the prompt
+                prompt = self.build_few_shot_prompt(
+                    contract_context, user_text, was_truncated, clause_notes
+                )
+
+                # Estimate token count (rough: 1 token ≈ 4 characters)
+                # Check if prompt is still too large
+                estimated_tokens = len(prompt) / 4
+                if estimated_tokens > 5500:  # Leave some buffer under 6000 limit
+                    # Further truncate contract text if needed
+                    contract_part_start = prompt.find("CONTRACT TEXT:")
+                    if contract_part_start > 0:
+                        # Get the base prompt (everything before contract text)
+                        base_prompt = prompt[:contract_part_start]
+                        base_tokens = len(base_prompt) / 4
+                        remaining_tokens = 5500 - base_tokens
+                        max_contract_chars = int(
+                            remaining_tokens * 4 * 0.9
+                        )  # 90% to be safe
+
+                        # Extract contract text from prompt
+                        contract_start = prompt.find("\n", contract_part_start) + 1
+                        contract_text_in_prompt = prompt[contract_start:]
+
+                        if len(contract_text_in_prompt) > max_contract_chars:
+                            # Further truncate
+                            truncated_contract = contract_text_in_prompt[
+                                :max_contract_chars
+                            ]
+                            last_period = truncated_contract.rfind(".")
+                            if last_period > max_contract_chars * 0.9:
+                                truncated_contract = truncated_contract[: last_period + 1]
+
+                            prompt = base_prompt + "\n" + truncated_contract
+                            was_truncated = True
+                            # The last labelled clause may be cut short; only
+                            # whole clauses get notes
+                            clauses = clauses[
+                                : max(truncated_contract.count("[CLAUSE ") - 1, 0)
+                            ]
+
+            telemetry.truncated = was_truncated
+
+            # Call Groq API
+            analysis = await self._complete(prompt, telemetry)
+
+            with telemetry.stage("postprocess"):
+                # Extract reasoning and clean the main response
+                main_response, reasoning_text = (
+                    self.extract_reasoning_and_clean_response(analysis)
+                )
+                if clause_notes:
+                    main_response = self._collect_clause_notes(
+                        main_response, clauses, clause_findings
                     )
 
-                    warning = "Note: Due to contract length, only the first portion was analyzed. Please review the full contract with legal counsel.\n\n"
+                # Format response with reasoning if it exists
+                analysis = self.format_response_with_reasoning(
+                    main_response, reasoning_text
+                )
+
+                # Add warning if truncated
+                if was_truncated:
+                    warning = (
+                        "Important Note: This analysis is based on a strategic extraction of the contract that includes:\n"
+                        "- The beginning (definitions, main terms)\n"
+                        "- Key sections (payment, IP rights, termination, liability, etc.)\n"
+                        "- The ending (important clauses, dispute resolution, etc.)\n\n"
+                        "Some middle sections may have been omitted. For a complete analysis, please review the full contract with legal counsel.\n\n"
+                    )
                     analysis = warning + analysis
+
+            telemetry.record()
+            return analysis
+
+        except Exception as e:
+            error_message = str(e)
+            if self._prompt_too_large(e):
+                # Try one more time with even more aggressive truncation
+                telemetry.fallback = True
+                telemetry.truncated = True
+                try:
+                    with telemetry.stage("prompt_build"):
+                        very_short_text = contract_text[: self.FALLBACK_CONTRACT_CHARS]
+                        last_period = very_short_text.rfind(".")
+                        if last_period > self.FALLBACK_CONTRACT_CHARS * 0.8:
+                            very_short_text = very_short_text[: last_period + 1]
+
+                        prompt = self.build_few_shot_prompt(
+                            very_short_text, user_text, True
+                        )
+
+                    analysis = await self._complete(prompt, telemetry)
+                    with telemetry.stage("postprocess"):
+                        # Extract reasoning and clean
+                        main_response, reasoning_text = (
+                            self.extract_reasoning_and_clean_response(analysis)
+                        )
+                        analysis = self.format_response_with_reasoning(
+                            main_response, reasoning_text
+                        )
+
+                        warning = "Note: Due to contract length, only the first portion was analyzed. Please review the full contract with legal counsel.\n\n"
+                        analysis = warning + analysis
+                    telemetry.record()
                     return analysis
                 except:
+                    telemetry.record("error")
                     raise HTTPException(
                         status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
                         detail="Contract is too large to analyze even after truncation. Please try a shorter contract or split it into sections.",
                     )
+            telemetry.record("error")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to analyze contract: {error_message}",
             )
+
+    def _prompt_too_large(self, error: Exception) -> bool:
+        """Whether Groq rejected a prompt for its size (worth retrying with less text)"""
+        error_message = str(error)
+        return (
+            "rate_limit_exceeded" in error_message
+            or "Request too large" in error_message
+        )
+
+    # ==================== REVISION ANALYSIS ====================
+
+    def split_into_clauses(self, text: str) -> List[str]:
+        """Split contract text into clauses on blank lines and numbered headings"""
+        blocks: List[str] = []
+        current: List[str] = []
+        for line in text.splitlines():
+            stripped = line.strip()
+            starts_clause = bool(self.CLAUSE_HEADING.match(stripped))
+            if (not stripped or starts_clause) and current:
+                blocks.append(" ".join(current))
+                current = []
+            if stripped:
+                current.append(stripped)
+        if current:
+            blocks.append(" ".join(current))
+
+        # Merge short fragments (standalone headings, page numbers) into the next clause
+        clauses: List[str] = []
+        pending = ""
+        for block in blocks:
+            if pending:
+                block = f"{pending} {block}"
+            if len(block) < 40:
+                pending = block
+                continue
+            clauses.append(block)
+            pending = ""
+        if pending:
+            if clauses:
+                clauses[-1] = f"{clauses[-1]} {pending}"
+            else:
+                clauses.append(pending)
+
+        return clauses
+
+    def clause_key(self, clause: str) -> str:
+        """Stable key for a clause that ignores case, punctuation and spacing"""
+        normalized = re.sub(r"\W+", " ", clause.lower()).strip()
+        return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+
+    def diff_contract_versions(
+        self, previous_text: str, revised_text: str
+    ) -> Dict[str, list]:
+        """
+        Diff two versions of a contract at clause level.
+        Returns unchanged/added/removed clauses and (previous, revised) pairs for modified ones.
+        """
+        previous_clauses = self.split_into_clauses(previous_text)
+        revised_clauses = self.split_into_clauses(revised_text)
+        previous_keys = [self.clause_key(clause) for clause in previous_clauses]
+        revised_keys = [self.clause_key(clause) for clause in revised_clauses]
+
+        changes: Dict[str, list] = {
+            "unchanged": [],
+            "modified": [],
+            "added": [],
+            "removed": [],
+        }
+        matcher = difflib.SequenceMatcher(
+            None, previous_keys, revised_keys, autojunk=False
+        )
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                changes["unchanged"].extend(revised_clauses[j1:j2])
+            elif tag == "insert":
+                changes["added"].extend(revised_clauses[j1:j2])
+            elif tag == "delete":
+                changes["removed"].extend(previous_clauses[i1:i2])
+            else:
+                # Pair replaced clauses positionally; leftovers are plain adds/removes
+                old_block = previous_clauses[i1:i2]
+                new_block = revised_clauses[j1:j2]
+                paired = min(len(old_block), len(new_block))
+                changes["modified"].extend(zip(old_block[:paired], new_block[:paired]))
+                changes["added"].extend(new_block[paired:])
+                changes["removed"].extend(old_block[paired:])
+
+        return changes
+
+    def build_revision_prompt(
+        self,
+        changed_clauses: List[tuple[str, Optional[str], str]],
+        removed_clauses: List[str],
+        user_text: Optional[str] = None,
+        removed_omitted: int = 0,
+    ) -> str:
+        """
+        Build a prompt that only covers the clauses changed in a revised contract.
+        removed_omitted counts removed clauses left out for length; they are only mentioned.
+        """
+        clause_blocks = []
+        for number, (kind, previous, revised) in enumerate(changed_clauses, start=1):
+            block = f"[CLAUSE {number}] ({kind})\n"
+            if previous:
+                block += f"Previous wording: {previous[:600]}\n"
+            block += f"Revised wording: {revised}"
+            clause_blocks.append(block)
+
+        removed_block = ""
+        if removed_clauses or removed_omitted:
+            removed_block = "\n\nREMOVED CLAUSES:\n" + "\n".join(
+                f"- {clause[:300]}" for clause in removed_clauses
+            )
+            if removed_omitted:
+                removed_block += f"\n- ...and {removed_omitted} more removed clause(s), not shown for length"
+
+        prompt = f"""You are a contract analysis assistant specializing in creative industry agreements. The user uploaded a revised version of a contract they already had reviewed. Only the clauses below changed; every other clause is identical to the previous version and was already covered.
+
+IMPORTANT FORMATTING REQUIREMENTS:
+- Use plain text only - no Markdown formatting (no **, ###, #, __, etc.)
+- Start the discussion of each clause with its label exactly as given, for example [CLAUSE 1]
+- If you include reasoning, wrap it in <reasoning>...</reasoning> tags
+
+For each clause, explain in plain language what the revised wording means for the creative professional and, where previous wording is shown, what the change does. Mention anything important that the removed clauses used to cover. Stay neutral and do not give legal advice.
+
+CHANGED CLAUSES:
+{chr(10).join(clause_blocks)}{removed_block}
+"""
+
+        if user_text:
+            prompt += f"""
+USER'S ADDITIONAL QUESTIONS/CONTEXT:
+{user_text}
+"""
+
+        prompt += "\n\nAfter the clause-by-clause notes, end with a short, naturally phrased reminder to review the revised contract with legal counsel."
+        return prompt
+
+    def _select_revision_clauses(
+        self,
+        changed_clauses: List[tuple[str, Optional[str], str]],
+        removed_clauses: List[str],
+        budget: int,
+    ) -> tuple[List[tuple[str, Optional[str], str]], List[str]]:
+        """Changed clauses, then removed ones, in order while they fit in `budget` characters"""
+        selected: List[tuple[str, Optional[str], str]] = []
+        chars_used = 0
+        for kind, previous, revised in changed_clauses:
+            clause_chars = len(revised) + len((previous or "")[:600])
+            if selected and chars_used + clause_chars > budget:
+                break
+            selected.append((kind, previous, revised))
+            chars_used += clause_chars
+
+        removed: List[str] = []
+        for clause in removed_clauses:
+            clause_chars = len(clause[:300])
+            if chars_used + clause_chars > budget:
+                break
+            removed.append(clause)
+            chars_used += clause_chars
+        return selected, removed
+
+    async def _complete_revision(
+        self,
+        changed_clauses: List[tuple[str, Optional[str], str]],
+        removed_clauses: List[str],
+        user_text: Optional[str],
+        budget: int,
+        telemetry: AnalysisTelemetry,
+    ) -> tuple[List[tuple[str, Optional[str], str]], str]:
+        """Send the clauses that fit in `budget`; returns (changed clauses sent, completion)"""
+        with telemetry.stage("prompt_build"):
+            selected, removed = self._select_revision_clauses(
+                changed_clauses, removed_clauses, budget
+            )
+            prompt = self.build_revision_prompt(
+                selected, removed, user_text, len(removed_clauses) - len(removed)
+            )
+        return selected, await self._complete(prompt, telemetry)
+
+    def _parse_clause_findings(self, response: str, clause_count: int) -> Dict[int, str]:
+        """Split a response into per-clause findings keyed by clause number"""
+        findings: Dict[int, str] = {}
+        parts = re.split(r"\[CLAUSE (\d+)\]", response)
+        # parts = [preamble, number, text, number, text, ...]
+        for i in range(1, len(parts) - 1, 2):
+            number = int(parts[i])
+            finding = parts[i + 1].strip()
+            if 1 <= number <= clause_count and finding:
+                findings[number] = finding
+        return findings
+
+    def _collect_clause_notes(
+        self, response: str, clauses: List[str], clause_findings: Dict[str, str]
+    ) -> str:
+        """Move the CLAUSE NOTES section of a first analysis into clause_findings; returns the rest"""
+        match = self.CLAUSE_NOTES_HEADING.search(response)
+        if match:
+            notes = self._parse_clause_findings(response[match.end() :], len(clauses))
+            for number, finding in notes.items():
+                clause_findings[self.clause_key(clauses[number - 1])] = finding
+            response = response[: match.start()]
+        # Labels the model echoed anyway mean nothing to the user
+        return re.sub(r"\[CLAUSE \d+\]\s*", "", response).strip()
+
+    def _clause_preview(self, clause: str, length: int = 80) -> str:
+        """Short one-line preview of a clause for summaries"""
+        if len(clause) <= length:
+            return clause
+        return clause[:length].rstrip() + "..."
+
+    async def analyze_contract_revision(
+        self,
+        previous_text: str,
+        revised_text: str,
+        clause_findings: Optional[Dict[str, str]] = None,
+        user_text: Optional[str] = None,
+        telemetry: Optional[AnalysisTelemetry] = None,
+    ) -> tuple[str, Dict[str, str]]:
+        """
+        Analyze a revised contract against the previous version of the same chat.
+        Only changed or added clauses are sent to the model; cached findings are reused
+        for unchanged clauses. Returns (formatted_analysis, updated_clause_findings).
+        """
+        telemetry = telemetry or self.new_telemetry()
+        if not settings.GROQ_API_KEY:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Groq API key is not configured",
+            )
+
+        clause_findings = clause_findings or {}
+        with telemetry.stage("extraction"):
+            changes = self.diff_contract_versions(previous_text, revised_text)
+
+        # Keep findings for clauses that survived the revision untouched
+        updated_findings: Dict[str, str] = {}
+        reused_findings: List[tuple[str, str]] = []
+        for clause in changes["unchanged"]:
+            key = self.clause_key(clause)
+            if key in clause_findings:
+                updated_findings[key] = clause_findings[key]
+                reused_findings.append((clause, clause_findings[key]))
+
+        # Summary of what changed (computed locally, no tokens spent)
+        summary_lines = [
+            "What changed in this version:",
+            f"- {len(changes['modified'])} clause(s) modified, {len(changes['added'])} added, "
+            f"{len(changes['removed'])} removed, {len(changes['unchanged'])} unchanged",
+        ]
+        for _, revised in changes["modified"]:
+            summary_lines.append(f"- Modified: {self._clause_preview(revised)}")
+        for clause in changes["added"]:
+            summary_lines.append(f"- Added: {self._clause_preview(clause)}")
+        for clause in changes["removed"]:
+            summary_lines.append(f"- Removed: {self._clause_preview(clause)}")
+        summary = "\n".join(summary_lines)
+
+        changed_clauses: List[tuple[str, Optional[str], str]] = [
+            ("modified", previous, revised) for previous, revised in changes["modified"]
+        ] + [("added", None, clause) for clause in changes["added"]]
+
+        if not changed_clauses and not changes["removed"]:
+            telemetry.cache = "hit"
+            telemetry.record()
+            return (
+                summary
+                + "\n\nNo clause-level changes were found, so the earlier analysis of this contract still applies.",
+                updated_findings,
+            )
+
+        telemetry.cache = "partial" if reused_findings else "miss"
+        try:
+            # Stay within the same contract budget as a full analysis
+            selected, analysis = await self._complete_revision(
+                changed_clauses,
+                changes["removed"],
+                user_text,
+                self.MAX_CONTRACT_CHARS,
+                telemetry,
+            )
+        except Exception as e:
+            if not self._prompt_too_large(e):
+                telemetry.record("error")
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Failed to analyze contract revision: {str(e)}",
+                )
+            # Try one more time with fewer of the changes
+            telemetry.fallback = True
+            try:
+                selected, analysis = await self._complete_revision(
+                    changed_clauses,
+                    changes["removed"],
+                    user_text,
+                    self.FALLBACK_CONTRACT_CHARS,
+                    telemetry,
+                )
+            except Exception:
+                telemetry.record("error")
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail="The contract changes are too large to analyze even after truncation. Please try a shorter contract or split it into sections.",
+                )
+        main_response, reasoning_text = self.extract_reasoning_and_clean_response(
+            analysis
+        )
+        skipped = len(changed_clauses) - len(selected)
+        telemetry.truncated = skipped > 0
+
+        # Cache the new per-clause findings for the next revision
+        for number, finding in self._parse_clause_findings(
+            main_response, len(selected)
+        ).items():
+            updated_findings[self.clause_key(selected[number - 1][2])] = finding
+
+        # Swap the numeric labels for something the user can recognise
+        def _label(match: re.Match) -> str:
+            number = int(match.group(1))
+            if 1 <= number <= len(selected):
+                kind, _, revised = selected[number - 1]
+                return f"{kind.capitalize()} clause - {self._clause_preview(revised, 60)}\n"
+            return match.group(0)
+
+        sections = [summary, re.sub(r"\[CLAUSE (\d+)\]\s*", _label, main_response)]
+        if skipped:
+            sections.append(
+                f"Note: {skipped} further changed clause(s) were not analyzed because of length limits. Please review them with legal counsel."
+            )
+        if reused_findings:
+            sections.append(
+                "Unchanged clauses (findings from the earlier review):\n"
+                + "\n".join(
+                    f"- {self._clause_preview(clause)}: {finding}"
+                    for clause, finding in reused_findings
+                )
+            )
+
+        telemetry.record()
+        return (
+            self.format_response_with_reasoning("\n\n".join(sections), reasoning_text),
+            updated_findings,
+        )
@@ -0,0 +1,120 @@
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional
+
+from app.core.config import settings
+from app.core.metrics import (
+    CONTRACT_ANALYSES,
+    CONTRACT_ANALYSIS_SECONDS,
+    CONTRACT_ANALYSIS_STAGE_SECONDS,
+    LLM_CALLS,
+    LLM_COST_USD,
+    LLM_TOKENS,
+)
+
+
+@dataclass
+class AnalysisTelemetry:
+    """
+    Timings and token usage of one contract analysis request.
+
+    Stages: pdf_parse, extraction, prompt_build, rate_limit_wait, upstream and
+    postprocess. A stage entered more than once (e.g. the fallback retry) accumulates.
+    """
+
+    model: str
+    stages_ms: Dict[str, float] = field(default_factory=dict)
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    llm_calls: int = 0
+    cache: str = "miss"  # "hit", "partial" or "miss" (revision clause findings)
+    truncated: bool = False
+    fallback: bool = False
+    started_at: float = field(default_factory=time.perf_counter)
+    finished_at: Optional[float] = None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the wrapped block as `name`"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.stages_ms[name] = self.stages_ms.get(name, 0.0) + elapsed_ms
+
+    def add_usage(self, prompt_tokens: int, completion_tokens: int) -> None:
+        """Token usage of one LLM call"""
+        self.llm_calls += 1
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+
+    @property
+    def latency_ms(self) -> int:
+        """Time from the start of the request until it was recorded (or now)"""
+        finished_at = self.finished_at or time.perf_counter()
+        return int((finished_at - self.started_at) * 1000)
+
+    @property
+    def cost_usd(self) -> float:
+        """Estimated spend from the configured per-million-token prices"""
+        return (
+            self.prompt_tokens * settings.GROQ_PROMPT_COST_PER_MILLION
+            + self.completion_tokens * settings.GROQ_COMPLETION_COST_PER_MILLION
+        ) / 1_000_000
+
+    def record(self, outcome: str = "success") -> None:
+        """Export to Prometheus; only the first call per request counts"""
+        if self.finished_at is not None:
+            return
+        self.finished_at = time.perf_counter()
+
+        labels = {
+            "model": self.model,
+            "cache": self.cache,
+            "truncated": str(self.truncated).lower(),
+            "fallback": str(self.fallback).lower(),
+        }
+        CONTRACT_ANALYSES.labels(**labels, outcome=outcome).inc()
+        CONTRACT_ANALYSIS_SECONDS.labels(**labels).observe(self.latency_ms / 1000)
+        for stage, elapsed_ms in self.stages_ms.items():
+            CONTRACT_ANALYSIS_STAGE_SECONDS.labels(
+                model=self.model, stage=stage
+            ).observe(elapsed_ms / 1000)
+        if self.llm_calls:
+            LLM_CALLS.labels(model=self.model).inc(self.llm_calls)
+            LLM_TOKENS.labels(model=self.model, kind="prompt").inc(self.prompt_tokens)
+            LLM_TOKENS.labels(model=self.model, kind="completion").inc(
+                self.completion_tokens
+            )
+            LLM_COST_USD.labels(model=self.model).inc(self.cost_usd)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Breakdown stored on the assistant message"""
+        return {
+            "stages_ms": {
+                stage: round(elapsed_ms, 1)
+                for stage, elapsed_ms in self.stages_ms.items()
+            },
+            "llm_calls": self.llm_calls,
+            "cache": self.cache,
+            "truncated": self.truncated,
+            "fallback": self.fallback,
+            "cost_usd": round(self.cost_usd, 6),
+        }
+
+    def message_columns(self) -> Dict[str, Any]:
+        """ChatMessage column values for the assistant message of this analysis"""
+        return {
+            "model": self.model,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "latency_ms": self.latency_ms,
+            "telemetry": self.as_dict(),
+        }
+
+
+def message_columns(telemetry: Optional[AnalysisTelemetry]) -> Dict[str, Any]:
+    """Telemetry columns for a ChatMessage, empty when nothing was measured"""
+    return telemetry.message_columns() if telemetry else {}
@@ -20,6 +20,9 @@ class TokenBearer(HTTPBearer):
 
     async def __call__(self, request: Request) -> HTTPAuthorizationCredentials | None:
         creds = await super().__call__(request)
+        if creds is None:
+            # auto_error=False: anonymous request
+            return None
 
         token = creds.credentials
 
@@ -63,6 +66,19 @@ class AccessTokenBearer(TokenBearer):
             )
 
 
+class OptionalAccessTokenBearer(AccessTokenBearer):
+    """Access token details for public routes: None when absent or not valid"""
+
+    def __init__(self):
+        super().__init__(auto_error=False)
+
+    async def __call__(self, request: Request) -> dict | None:
+        try:
+            return await super().__call__(request)
+        except HTTPException:
+            return None
+
+
 class RefreshTokenBearer(TokenBearer):
 
     def verify_token_data(self, token_data: dict) -> None:
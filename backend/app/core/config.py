@@ -29,6 +29,37 @@ class Settings(BaseSettings):
     # Groq API
     GROQ_API_KEY: str = ""
     GROQ_MODEL: str = "qwen/qwen3-32b"  # Qwen3 32B model on Groq
+    GROQ_BASE_URL: str = ""  # Override the Groq endpoint, e.g. the loadtest mock server
+    GROQ_TPM_LIMIT: int = 6000  # Tokens per minute admitted by each worker
+    # USD per million tokens, used for the cost estimates in telemetry
+    GROQ_PROMPT_COST_PER_MILLION: float = 0.29
+    GROQ_COMPLETION_COST_PER_MILLION: float = 0.59
+    BATCH_ANALYSIS_MAX_FILES: int = 10
+
+    # Course autocomplete: rebuild each worker's title index after this many seconds
+    AUTOCOMPLETE_REFRESH_SECONDS: int = 300
+    # Course detail and catalog page cache in Redis
+    COURSE_CACHE_TTL_SECONDS: int = 600
+
+    # In-process cache of rarely changing lists (taxonomy, recent courses)
+    LOCAL_CACHE_TTL_SECONDS: int = 300
+
+    # Course recommendations: model written by build_recommendations.py, refreshed
+    # incrementally by each worker; niche weight blends in the user's niches
+    RECOMMENDER_MODEL_PATH: str = "recommender/co_completion.npz"
+    RECOMMENDER_REFRESH_SECONDS: int = 300
+    RECOMMENDER_NICHE_WEIGHT: float = 0.3
+
+    # Video playback heartbeats are buffered in Redis and written in batches every
+    # PLAYBACK_FLUSH_SECONDS; watching past the threshold marks the course completed
+    PLAYBACK_FLUSH_SECONDS: int = 10
+    PLAYBACK_COMPLETION_THRESHOLD: float = 0.9
+
+    # Partition maintenance (maintain_partitions.py): monthly chat_messages partitions
+    # are created this many months ahead, and detached once older than the retention
+    # (0 keeps every month)
+    PARTITION_MONTHS_AHEAD: int = 3
+    CHAT_MESSAGE_RETENTION_MONTHS: int = 12
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
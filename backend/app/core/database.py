@@ -2,14 +2,19 @@ from sqlmodel import create_engine, text, SQLModel
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from app.core.config import settings as Config
 from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker
 
 
+# Kept small for the hosted pooler; reported by /health/pool
+POOL_SIZE = 2
+MAX_OVERFLOW = 2
+
 async_engine = create_async_engine(
     url=Config.DATABASE_URL,
     echo=True,
-    pool_size=2,
-    max_overflow=2,
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
     pool_pre_ping=True,
     pool_recycle=3600,
     pool_timeout=30,
@@ -28,17 +33,31 @@ async def init_db():
         await conn.run_sync(SQLModel.metadata.create_all)
 
 
-async def get_session() -> AsyncSession:  # type: ignore
+async_session_maker = sessionmaker(
+    bind=async_engine, class_=AsyncSession, expire_on_commit=False
+)
 
-    Session = sessionmaker(
-        bind=async_engine, class_=AsyncSession, expire_on_commit=False
-    )
 
-    # async with Session() as session:
-    #     yield session
+async def get_session() -> AsyncSession:  # type: ignore
 
-    async with Session() as session:
+    async with async_session_maker() as session:
         try:
             yield session
         finally:
             await session.close()
+
+
+def is_foreign_key_violation(error: IntegrityError, column: str) -> bool:
+    """Whether an IntegrityError is a foreign key violation on `column`"""
+    if getattr(error.orig, "sqlstate", None) != "23503":
+        return False
+    # asyncpg reports the constraint, e.g. user_course_progress_course_id_fkey
+    constraint = getattr(error.orig.__cause__, "constraint_name", None) or ""
+    return column in constraint
+
+
+def is_unique_violation(error: IntegrityError, constraint: str) -> bool:
+    """Whether an IntegrityError is a violation of the unique `constraint`"""
+    if getattr(error.orig, "sqlstate", None) != "23505":
+        return False
+    return getattr(error.orig.__cause__, "constraint_name", None) == constraint
@@ -0,0 +1,147 @@
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Tuple
+
+from fastapi import Request, Response, status
+from redis.exceptions import RedisError
+
+from app.core.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Set once; a Redis reset starts a new epoch so old ETags can never match again
+EPOCH_KEY = "versions:epoch"
+
+# Industries and niches change together rarely enough to share one counter
+TAXONOMY_SCOPE = "taxonomy"
+# Which users chose which industry and niches (the user counts of the taxonomy tree)
+TAXONOMY_MEMBERS_SCOPE = "taxonomy:members"
+
+
+def version_key(scope: str) -> str:
+    return f"versions:{scope}"
+
+
+@dataclass(frozen=True)
+class ResourceVersion:
+    """Version counters of the scopes a response is built from"""
+
+    epoch: str
+    scopes: Tuple[str, ...]
+    counters: Tuple[int, ...]
+    changed_at: float
+
+    @property
+    def tag(self) -> str:
+        raw = f"{self.epoch}|{','.join(self.scopes)}|{','.join(map(str, self.counters))}"
+        return hashlib.sha1(raw.encode()).hexdigest()[:20]
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.tag}"'
+
+    @property
+    def last_modified(self) -> datetime:
+        return datetime.fromtimestamp(int(self.changed_at), tz=timezone.utc)
+
+    def scope_version(self, scope: str) -> "ResourceVersion":
+        """Version of one of the scopes, with the same tag read_version(scope) gives"""
+        counter = self.counters[self.scopes.index(scope)]
+        return ResourceVersion(self.epoch, (scope,), (counter,), self.changed_at)
+
+    def headers(self) -> dict:
+        return {
+            "ETag": self.etag,
+            "Last-Modified": format_datetime(self.last_modified, usegmt=True),
+            # Clients may store the response but must revalidate before reuse
+            "Cache-Control": "no-cache",
+        }
+
+
+async def read_version(*scopes: str) -> Optional[ResourceVersion]:
+    """Current version of the given scopes in one round trip, None if Redis is down"""
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.set(EPOCH_KEY, str(time.time()), nx=True)
+            pipe.get(EPOCH_KEY)
+            for scope in scopes:
+                pipe.hmget(version_key(scope), "version", "changed_at")
+            _, epoch, *values = await pipe.execute()
+    except RedisError as exc:
+        logger.warning("Version store unavailable: %s", exc)
+        return None
+
+    epoch = epoch.decode()
+    counters = tuple(int(version or 0) for version, _ in values)
+    changed_at = max(
+        [float(epoch)] + [float(at) for _, at in values if at is not None]
+    )
+    return ResourceVersion(epoch, scopes, counters, changed_at)
+
+
+async def bump_versions(*scopes: str) -> None:
+    """Mark the given scopes as changed"""
+    now = str(time.time())
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for scope in scopes:
+                pipe.hincrby(version_key(scope), "version", 1)
+                pipe.hset(version_key(scope), "changed_at", now)
+            await pipe.execute()
+    except RedisError as exc:
+        logger.warning("Version bump failed: %s", exc)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # If-None-Match uses the weak comparison: W/ prefixes are ignored
+    if header.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in header.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def not_modified(
+    request: Request, version: Optional[ResourceVersion]
+) -> Optional[Response]:
+    """A 304 response when the client's copy is current, otherwise None"""
+    if version is None:
+        return None
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        fresh = _etag_matches(if_none_match, version.etag)
+    else:
+        # If-Modified-Since is only consulted without If-None-Match
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since is None:
+            return None
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return None
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        fresh = version.last_modified <= since
+
+    if not fresh:
+        return None
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=version.headers())
+
+
+def json_response(payload: bytes, version: Optional[ResourceVersion]) -> Response:
+    """Serialized JSON body with validators when the version is known"""
+    return Response(
+        content=payload,
+        media_type="application/json",
+        headers=version.headers() if version else None,
+    )
+
+
+def set_validators(response: Response, version: Optional[ResourceVersion]) -> None:
+    """Add validators to the response FastAPI builds from the route's return value"""
+    if version is not None:
+        response.headers.update(version.headers())
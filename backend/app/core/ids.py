@@ -0,0 +1,43 @@
+import secrets
+import threading
+import time
+import uuid
+
+_lock = threading.Lock()
+_last_ms = 0
+_sequence = 0
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Time-ordered UUID (RFC 9562 version 7), used for every primary key.
+
+    The first 48 bits are the Unix time in milliseconds, so rows inserted one
+    after another land on the same btree pages instead of random ones. Within a
+    millisecond a 12-bit counter keeps this process's ids increasing, even if the
+    clock steps back; the remaining 62 bits are random. Existing version 4 keys
+    stay valid, they just sort before or among these.
+    """
+    global _last_ms, _sequence
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            # Start low enough to leave room for counting up
+            _sequence = secrets.randbits(11)
+        else:
+            _sequence += 1
+            if _sequence > 0xFFF:
+                # Counter exhausted: borrow the next millisecond
+                _last_ms += 1
+                _sequence = 0
+        timestamp, sequence = _last_ms, _sequence
+
+    value = (
+        (timestamp & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76  # version
+        | sequence << 64
+        | 0b10 << 62  # variant
+        | secrets.randbits(62)
+    )
+    return uuid.UUID(int=value)
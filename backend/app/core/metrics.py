@@ -0,0 +1,54 @@
+from fastapi import Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+
+# Labels shared by the per-analysis metrics
+ANALYSIS_LABELS = ["model", "cache", "truncated", "fallback"]
+
+CONTRACT_ANALYSIS_SECONDS = Histogram(
+    "contract_analysis_seconds",
+    "End-to-end contract analysis latency",
+    ANALYSIS_LABELS,
+    buckets=(0.5, 1, 2, 3, 5, 8, 13, 21, 34, 60, 120),
+)
+CONTRACT_ANALYSIS_STAGE_SECONDS = Histogram(
+    "contract_analysis_stage_seconds",
+    "Time spent in each contract analysis stage",
+    ["model", "stage"],
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60),
+)
+CONTRACT_ANALYSES = Counter(
+    "contract_analyses_total",
+    "Contract analyses by outcome",
+    ANALYSIS_LABELS + ["outcome"],
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Tokens reported by the LLM provider",
+    ["model", "kind"],
+)
+LLM_CALLS = Counter(
+    "llm_calls_total",
+    "Requests sent to the LLM provider",
+    ["model"],
+)
+LLM_COST_USD = Counter(
+    "llm_cost_usd_total",
+    "Estimated LLM spend in US dollars",
+    ["model"],
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Application cache lookups by result",
+    ["cache", "result"],
+)
+
+
+def metrics_response() -> Response:
+    """Prometheus text exposition of this worker's metrics"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
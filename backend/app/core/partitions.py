@@ -0,0 +1,150 @@
+import logging
+import re
+from datetime import date
+from typing import List, Tuple
+
+from sqlalchemy import text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Partition DDL locks the parent table; give up rather than queue its writes
+LOCK_TIMEOUT = "5s"
+
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month `months` after the month of `month`"""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+class MonthlyPartitions:
+    """
+    Maintenance of a table range-partitioned by month on a timestamp column.
+
+    Partitions are named <table>_pYYYYMM and cover [first of month, first of next
+    month); <table>_default catches rows outside them. Creating partitions ahead of
+    time keeps the default empty, and rows that reached it anyway are moved into
+    the new partition. Expired partitions are detached rather than deleted, which
+    is instant and leaves them as plain tables to archive or drop.
+    """
+
+    def __init__(self, table: str, column: str):
+        self.table = table
+        self.column = column
+        self.default = f"{table}_default"
+        self._name_pattern = re.compile(rf"^{re.escape(table)}_p(\d{{4}})(\d{{2}})$")
+
+    def partition_name(self, month: date) -> str:
+        return f"{self.table}_p{month:%Y%m}"
+
+    async def months(self, session: AsyncSession) -> List[date]:
+        """Months that have an attached partition, oldest first"""
+        result = await session.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits"
+                " JOIN pg_class child ON child.oid = pg_inherits.inhrelid"
+                " WHERE pg_inherits.inhparent = CAST(:table AS regclass)"
+            ),
+            {"table": self.table},
+        )
+        months = []
+        for name in result.scalars():
+            match = self._name_pattern.match(name)
+            if match:
+                months.append(date(int(match[1]), int(match[2]), 1))
+        return sorted(months)
+
+    async def _create(self, session: AsyncSession, month: date) -> None:
+        name = self.partition_name(month)
+        bounds = f"FROM ('{month}') TO ('{add_months(month, 1)}')"
+        in_range = f"{self.column} >= :start AND {self.column} < :end"
+        params = {"start": month, "end": add_months(month, 1)}
+
+        stray = await session.execute(
+            text(f"SELECT EXISTS (SELECT 1 FROM {self.default} WHERE {in_range})"),
+            params,
+        )
+        if not stray.scalar():
+            await session.execute(
+                text(f"CREATE TABLE {name} PARTITION OF {self.table} FOR VALUES {bounds}")
+            )
+            return
+
+        # The default partition holds rows of this month: move them into the new
+        # table before attaching it, as attaching checks the default is clear
+        logger.warning("Moving %s rows of %s out of %s", self.table, month, self.default)
+        await session.execute(
+            text(
+                f"CREATE TABLE {name}"
+                f" (LIKE {self.table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            )
+        )
+        await session.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {self.default} WHERE {in_range} RETURNING *)"
+                f" INSERT INTO {name} SELECT * FROM moved"
+            ),
+            params,
+        )
+        await session.execute(
+            text(f"ALTER TABLE {self.table} ATTACH PARTITION {name} FOR VALUES {bounds}")
+        )
+
+    async def maintain(
+        self,
+        session: AsyncSession,
+        months_ahead: int,
+        retention_months: int,
+        drop: bool = False,
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Create partitions through `months_ahead` months from now and detach (or
+        drop) those entirely older than `retention_months`; 0 keeps everything.
+        Returns the created and detached partition names.
+        """
+        await session.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+        this_month = date.today().replace(day=1)
+        existing = set(await self.months(session))
+
+        created = []
+        for offset in range(months_ahead + 1):
+            month = add_months(this_month, offset)
+            if month not in existing:
+                await self._create(session, month)
+                created.append(self.partition_name(month))
+
+        detached = []
+        if retention_months > 0:
+            cutoff = add_months(this_month, -retention_months)
+            for month in sorted(existing):
+                if add_months(month, 1) > cutoff:
+                    break
+                name = self.partition_name(month)
+                await session.execute(
+                    text(f"ALTER TABLE {self.table} DETACH PARTITION {name}")
+                )
+                if drop:
+                    await session.execute(text(f"DROP TABLE {name}"))
+                detached.append(name)
+
+        await session.commit()
+        return created, detached
+
+
+chat_message_partitions = MonthlyPartitions("chat_messages", "created_at")
+
+
+async def maintain_partitions(
+    session: AsyncSession, drop: bool = False
+) -> Tuple[List[str], List[str]]:
+    """Run the configured maintenance of every partitioned table"""
+    # user_course_progress is hash-partitioned: a fixed set, nothing to maintain
+    return await chat_message_partitions.maintain(
+        session,
+        months_ahead=settings.PARTITION_MONTHS_AHEAD,
+        retention_months=settings.CHAT_MESSAGE_RETENTION_MONTHS,
+        drop=drop,
+    )
@@ -11,7 +11,10 @@ redis_kwargs = {"host": Config.REDIS_HOST, "port": Config.REDIS_PORT, "db": 0}
 if Config.REDIS_PASSWORD:
     redis_kwargs["password"] = Config.REDIS_PASSWORD
 
-token_blocklist = redis.StrictRedis(**redis_kwargs)
+redis_client = redis.StrictRedis(**redis_kwargs)
+
+# The blocklist shares the connection pool with the application caches
+token_blocklist = redis_client
 
 
 async def add_jti_to_blocklist(jti: str) -> None:
@@ -0,0 +1,103 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.core.metrics import CACHE_REQUESTS
+
+# Every cache of this worker, by name, for the stats endpoint
+ttl_caches: Dict[str, "TTLCache"] = {}
+
+
+class TTLCache:
+    """
+    Small in-process cache of async loader results, one per worker.
+
+    Entries expire after `ttl_seconds` and are dropped wholesale by invalidate(),
+    which the write paths call after committing. Concurrent misses for the same
+    key share one load (single-flight), so an expired entry under load costs one
+    query rather than one per request. Callers that know the Redis version of
+    the data put its tag in the key, so writes made on other workers are seen
+    immediately too.
+
+    Loaders get a session of their own: a shared load outlives any one request,
+    so it must not run on the session of the request that happened to start it.
+    """
+
+    def __init__(self, name: str, ttl_seconds: float, max_entries: int = 256):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._loading: Dict[Hashable, asyncio.Task] = {}
+        # Bumped by invalidate() so loads started before it are not stored
+        self._generation = 0
+        ttl_caches[name] = self
+
+    def _count(self, result: str) -> None:
+        if result == "hit":
+            self.hits += 1
+        else:
+            self.misses += 1
+        CACHE_REQUESTS.labels(cache=self.name, result=result).inc()
+
+    async def _load(
+        self, key: Hashable, load: Callable[[AsyncSession], Awaitable[Any]]
+    ) -> Any:
+        generation = self._generation
+        try:
+            async with async_session_maker() as session:
+                value = await load(session)
+        finally:
+            if self._loading.get(key) is asyncio.current_task():
+                del self._loading[key]
+        if generation == self._generation:
+            if len(self._entries) >= self.max_entries:
+                # Evict the oldest entry
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        return value
+
+    async def get_or_load(
+        self, key: Hashable, load: Callable[[AsyncSession], Awaitable[Any]]
+    ) -> Any:
+        """Cached value of `key`, calling `load` with a new session on a miss"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._count("hit")
+            return entry[1]
+
+        task = self._loading.get(key)
+        if task is None:
+            self._count("miss")
+            task = asyncio.create_task(self._load(key, load))
+            self._loading[key] = task
+        else:
+            # Another request is already loading it
+            self._count("hit")
+        # A cancelled waiter must not cancel the load the others are waiting on
+        return await asyncio.shield(task)
+
+    def invalidate(self) -> None:
+        """Drop every entry; loads in flight finish but are not stored or shared"""
+        self._entries.clear()
+        self._loading.clear()
+        self._generation += 1
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "entries": len(self._entries),
+        }
+
+
+# Industries and niches, invalidated together like TAXONOMY_SCOPE
+taxonomy_cache = TTLCache("taxonomy", settings.LOCAL_CACHE_TTL_SECONDS)
@@ -0,0 +1,186 @@
+import asyncio
+import bisect
+import difflib
+import logging
+import re
+import time
+import uuid
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.models.course import Course
+
+logger = logging.getLogger(__name__)
+
+WORD = re.compile(r"\w+")
+
+
+class CourseTitleIndex:
+    """
+    In-memory prefix index of course titles, one per worker process.
+
+    Every word of a title is a key (the title from that word onwards), so "real"
+    finds "Mastering Realism" and "mastering r" finds it too. Lookups are a bisect
+    into a sorted list and never touch the database. CourseService keeps the index
+    up to date for writes made by this worker; writes made by other workers are
+    picked up by a background rebuild once the index is older than
+    AUTOCOMPLETE_REFRESH_SECONDS. Changes made while a rebuild reads the titles
+    are replayed on top of its snapshot.
+    """
+
+    def __init__(self):
+        self._keys: List[Tuple[str, uuid.UUID]] = []
+        self._titles: Dict[uuid.UUID, str] = {}
+        self._words_by_letter: Dict[str, Set[str]] = {}
+        self._built_at: Optional[float] = None
+        self._rebuild_task: Optional[asyncio.Task] = None
+        # (course_id, title or None if removed) while a rebuild is reading titles
+        self._changes_during_rebuild: Optional[
+            List[Tuple[uuid.UUID, Optional[str]]]
+        ] = None
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return " ".join(WORD.findall(text.lower()))
+
+    def _title_keys(self, course_id: uuid.UUID, title: str) -> List[Tuple[str, uuid.UUID]]:
+        normalized = self._normalize(title)
+        return [
+            (normalized[match.start() :], course_id)
+            for match in WORD.finditer(normalized)
+        ]
+
+    def _index_words(self, title: str) -> None:
+        for word in WORD.findall(title.lower()):
+            if len(word) > 2:
+                self._words_by_letter.setdefault(word[0], set()).add(word)
+
+    def load(self, courses: List[Tuple[uuid.UUID, str]]) -> None:
+        """Replace the whole index"""
+        self._titles = dict(courses)
+        self._words_by_letter = {}
+        keys = []
+        for course_id, title in courses:
+            keys.extend(self._title_keys(course_id, title))
+            self._index_words(title)
+        keys.sort()
+        self._keys = keys
+        self._built_at = time.monotonic()
+
+    def add(self, course_id: uuid.UUID, title: str) -> None:
+        """Index a new course or a renamed one"""
+        if self._changes_during_rebuild is not None:
+            self._changes_during_rebuild.append((course_id, title))
+        if self._built_at is None:
+            return  # Built from the database on first use
+        self._unindex(course_id)
+        self._titles[course_id] = title
+        for key in self._title_keys(course_id, title):
+            bisect.insort(self._keys, key)
+        self._index_words(title)
+
+    def remove(self, course_id: uuid.UUID) -> None:
+        """Drop a deleted course (words stay in the typo vocabulary until the next rebuild)"""
+        if self._changes_during_rebuild is not None:
+            self._changes_during_rebuild.append((course_id, None))
+        self._unindex(course_id)
+
+    def _unindex(self, course_id: uuid.UUID) -> None:
+        title = self._titles.pop(course_id, None)
+        if title is None:
+            return
+        for key in self._title_keys(course_id, title):
+            position = bisect.bisect_left(self._keys, key)
+            if position < len(self._keys) and self._keys[position] == key:
+                del self._keys[position]
+
+    def _prefix_matches(self, prefix: str, limit: int) -> List[uuid.UUID]:
+        matches: List[uuid.UUID] = []
+        # Keys are (text, id); the empty UUID sorts before any id with the same text
+        position = bisect.bisect_left(self._keys, (prefix, uuid.UUID(int=0)))
+        while position < len(self._keys) and len(matches) < limit:
+            key, course_id = self._keys[position]
+            if not key.startswith(prefix):
+                break
+            if course_id not in matches and course_id in self._titles:
+                matches.append(course_id)
+            position += 1
+        return matches
+
+    def suggest(self, query: str, limit: int = 10) -> List[Tuple[uuid.UUID, str]]:
+        """Titles containing a word that starts with `query`, titles starting with it first"""
+        prefix = self._normalize(query)
+        if not prefix:
+            return []
+
+        # Over-fetch a little so whole-title matches can be moved to the front
+        matches = self._prefix_matches(prefix, limit * 3)
+
+        if not matches and len(prefix) >= 4:
+            # Probably a typo: retry with the closest known words for the last word
+            *head, last = prefix.split(" ")
+            candidates = difflib.get_close_matches(
+                last, self._words_by_letter.get(last[0], ()), n=3, cutoff=0.75
+            )
+            for candidate in candidates:
+                for course_id in self._prefix_matches(
+                    " ".join(head + [candidate]), limit
+                ):
+                    if course_id not in matches:
+                        matches.append(course_id)
+
+        matches.sort(
+            key=lambda course_id: (
+                not self._normalize(self._titles[course_id]).startswith(prefix),
+                self._titles[course_id].lower(),
+            )
+        )
+        return [(course_id, self._titles[course_id]) for course_id in matches[:limit]]
+
+    async def rebuild(self) -> None:
+        """Reload every course title from the database"""
+        self._changes_during_rebuild = []
+        try:
+            async with async_session_maker() as session:
+                result = await session.exec(select(Course.id, Course.title))
+                courses = list(result.all())
+        finally:
+            changes, self._changes_during_rebuild = self._changes_during_rebuild, None
+        self.load(courses)
+        # The snapshot may predate these; add() and remove() are safe to repeat
+        for course_id, title in changes:
+            if title is None:
+                self.remove(course_id)
+            else:
+                self.add(course_id, title)
+
+    def _start_rebuild(self) -> None:
+        self._rebuild_task = asyncio.create_task(self.rebuild())
+        self._rebuild_task.add_done_callback(self._rebuild_done)
+
+    @staticmethod
+    def _rebuild_done(task: asyncio.Task) -> None:
+        # Nobody awaits a background rebuild; report its failure here (the next
+        # request retries, as the index is still stale)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Course title index rebuild failed", exc_info=task.exception())
+
+    async def ensure_fresh(self) -> None:
+        """Build on first use; afterwards refresh in the background when stale"""
+        if self._built_at is None:
+            # Concurrent first requests share one load
+            if self._rebuild_task is None or self._rebuild_task.done():
+                self._start_rebuild()
+            await asyncio.shield(self._rebuild_task)
+            return
+        stale = (
+            time.monotonic() - self._built_at > settings.AUTOCOMPLETE_REFRESH_SECONDS
+        )
+        if stale and (self._rebuild_task is None or self._rebuild_task.done()):
+            self._start_rebuild()
+
+
+course_title_index = CourseTitleIndex()
@@ -0,0 +1,197 @@
+import hashlib
+import json
+import logging
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from pydantic import BaseModel
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.http_cache import ResourceVersion, bump_versions, read_version
+from app.core.metrics import CACHE_REQUESTS
+from app.core.redis import redis_client
+from app.core.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+CATALOG_SCOPE = "courses:catalog"
+STATS_KEY = "courses:cache:stats"
+
+# Landing page list of the newest courses, kept in each worker
+recent_courses_cache = TTLCache("recent_courses", settings.LOCAL_CACHE_TTL_SECONDS)
+
+
+def course_scope(course_id: uuid.UUID) -> str:
+    return f"courses:{course_id}"
+
+
+class CourseCache:
+    """
+    Versioned read-through cache of course detail and catalog pages in Redis.
+
+    Entries are stored as the serialized JSON response under a key that embeds a
+    version counter: one per course for detail pages and one for the whole catalog
+    for list pages. Writes bump the counters instead of deleting keys, so stale
+    entries are never read again and simply expire after COURSE_CACHE_TTL_SECONDS.
+    The same counters back the ETags of these responses. If Redis is unavailable
+    the cache is bypassed.
+    """
+
+    async def detail_version(self, course_id: uuid.UUID) -> Optional[ResourceVersion]:
+        return await read_version(course_scope(course_id))
+
+    async def batch_version(
+        self, course_ids: Iterable[uuid.UUID]
+    ) -> Optional[ResourceVersion]:
+        """Combined version of several courses, read in one round trip"""
+        return await read_version(*(course_scope(course_id) for course_id in course_ids))
+
+    async def catalog_version(self) -> Optional[ResourceVersion]:
+        return await read_version(CATALOG_SCOPE)
+
+    async def _read_through(
+        self,
+        kind: str,
+        version: Optional[ResourceVersion],
+        key_suffix: str,
+        load: Callable[[], Awaitable[BaseModel]],
+    ) -> bytes:
+        if version is None:
+            return (await load()).model_dump_json().encode()
+
+        key = f"courses:{kind}:{version.tag}:{key_suffix}"
+        try:
+            cached = await redis_client.get(key)
+        except RedisError as exc:
+            logger.warning("Course cache unavailable: %s", exc)
+            return (await load()).model_dump_json().encode()
+
+        result = "hit" if cached is not None else "miss"
+        CACHE_REQUESTS.labels(cache=f"course_{kind}", result=result).inc()
+        if cached is not None:
+            await self._count(kind, result)
+            return cached
+
+        payload = (await load()).model_dump_json().encode()
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.set(key, payload, ex=settings.COURSE_CACHE_TTL_SECONDS)
+                pipe.hincrby(STATS_KEY, f"{kind}:{result}", 1)
+                await pipe.execute()
+        except RedisError as exc:
+            logger.warning("Course cache unavailable: %s", exc)
+        return payload
+
+    async def _count(self, kind: str, result: str, amount: int = 1) -> None:
+        try:
+            await redis_client.hincrby(STATS_KEY, f"{kind}:{result}", amount)
+        except RedisError:
+            pass
+
+    async def detail(
+        self,
+        course_id: uuid.UUID,
+        version: Optional[ResourceVersion],
+        load: Callable[[], Awaitable[BaseModel]],
+    ) -> bytes:
+        """Course detail JSON at `version`, loaded with `load` on a miss"""
+        return await self._read_through("detail", version, str(course_id), load)
+
+    async def details(
+        self,
+        course_ids: List[uuid.UUID],
+        version: Optional[ResourceVersion],
+        load: Callable[[List[uuid.UUID]], Awaitable[Dict[uuid.UUID, BaseModel]]],
+    ) -> Dict[uuid.UUID, bytes]:
+        """
+        Course detail JSON of several courses at `version` (from batch_version).
+
+        Shares entries with detail(): hits come from one MGET and all misses are
+        loaded together with one call to `load`. Unknown courses are left out.
+        """
+        if version is None:
+            loaded = await load(course_ids)
+            return {
+                course_id: course.model_dump_json().encode()
+                for course_id, course in loaded.items()
+            }
+
+        keys = {}
+        for course_id in course_ids:
+            tag = version.scope_version(course_scope(course_id)).tag
+            keys[course_id] = f"courses:detail:{tag}:{course_id}"
+        try:
+            cached = await redis_client.mget(list(keys.values()))
+        except RedisError as exc:
+            logger.warning("Course cache unavailable: %s", exc)
+            cached = [None] * len(course_ids)
+
+        payloads = {
+            course_id: payload
+            for course_id, payload in zip(keys, cached)
+            if payload is not None
+        }
+        missing = [course_id for course_id in course_ids if course_id not in payloads]
+        if payloads:
+            CACHE_REQUESTS.labels(cache="course_detail", result="hit").inc(len(payloads))
+            await self._count("detail", "hit", len(payloads))
+        if not missing:
+            return payloads
+
+        CACHE_REQUESTS.labels(cache="course_detail", result="miss").inc(len(missing))
+        loaded = await load(missing)
+        fresh = {
+            course_id: course.model_dump_json().encode()
+            for course_id, course in loaded.items()
+        }
+        payloads.update(fresh)
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for course_id, payload in fresh.items():
+                    pipe.set(
+                        keys[course_id], payload, ex=settings.COURSE_CACHE_TTL_SECONDS
+                    )
+                pipe.hincrby(STATS_KEY, "detail:miss", len(missing))
+                await pipe.execute()
+        except RedisError as exc:
+            logger.warning("Course cache unavailable: %s", exc)
+        return payloads
+
+    async def catalog_page(
+        self,
+        params: Dict[str, Any],
+        version: Optional[ResourceVersion],
+        load: Callable[[], Awaitable[BaseModel]],
+    ) -> bytes:
+        """Course list JSON for the given query parameters at `version`"""
+        digest = hashlib.sha1(
+            json.dumps(params, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return await self._read_through("list", version, digest, load)
+
+    async def invalidate(self, course_ids: Iterable[uuid.UUID] = ()) -> None:
+        """Retire cached entries of the given courses and every catalog page"""
+        recent_courses_cache.invalidate()
+        await bump_versions(
+            *(course_scope(course_id) for course_id in course_ids), CATALOG_SCOPE
+        )
+
+    async def stats(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Hits, misses and hit ratio per entry kind, across all workers"""
+        raw = await redis_client.hgetall(STATS_KEY)
+        counts = {key.decode(): int(value) for key, value in raw.items()}
+        report = {}
+        for kind in ("detail", "list"):
+            hits = counts.get(f"{kind}:hit", 0)
+            misses = counts.get(f"{kind}:miss", 0)
+            lookups = hits + misses
+            report[kind] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": round(hits / lookups, 4) if lookups else None,
+            }
+        return report
+
+
+course_cache = CourseCache()
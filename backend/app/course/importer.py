@@ -0,0 +1,215 @@
+import json
+import uuid
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+from pydantic import TypeAdapter
+from sqlalchemy import delete, insert, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.http_cache import TAXONOMY_SCOPE, bump_versions
+from app.core.ids import uuid7
+from app.core.ttl_cache import taxonomy_cache
+from app.course.autocomplete import course_title_index
+from app.course.cache import course_cache
+from app.course.schemas import CourseImportItem, CourseImportResponse
+from app.models.course import Course, CourseAdditionalResource, CourseKeyTakeaway
+from app.models.industry import Industry
+from app.models.niche import Niche
+
+IMPORT_CHUNK_SIZE = 500
+# Rows per multi-row INSERT; keeps well under the 32767 bind parameter limit
+CHILD_BATCH_SIZE = 2000
+
+import_items_adapter = TypeAdapter(List[CourseImportItem])
+
+
+def parse_import_payload(payload: bytes, ndjson: bool = False) -> List[CourseImportItem]:
+    """
+    Courses from a JSON array or from NDJSON (one object per line).
+
+    Raises ValueError for malformed JSON and pydantic.ValidationError for invalid
+    courses.
+    """
+    if ndjson:
+        data = [json.loads(line) for line in payload.splitlines() if line.strip()]
+    else:
+        data = json.loads(payload)
+    return import_items_adapter.validate_python(data)
+
+
+class CourseImportService:
+    """
+    Bulk course import with upsert semantics on (title, industry_id).
+
+    Each chunk is one transaction: industries and niches are resolved with one
+    select per chunk (missing ones are created), courses are upserted with a single
+    multi-row INSERT ... ON CONFLICT, and takeaways and resources are replaced with
+    one DELETE and one batched INSERT each.
+    """
+
+    async def _resolve_industries(
+        self, names: Iterable[str], session: AsyncSession
+    ) -> Tuple[Dict[str, uuid.UUID], int]:
+        names = set(names)
+        created = await session.execute(
+            pg_insert(Industry)
+            .values([{"id": uuid7(), "name": name} for name in names])
+            .on_conflict_do_nothing(index_elements=["name"])
+            .returning(Industry.id)
+        )
+        created_count = len(created.all())
+        result = await session.exec(
+            select(Industry.name, Industry.id).where(Industry.name.in_(names))
+        )
+        return dict(result.all()), created_count
+
+    async def _resolve_niches(
+        self, keys: Iterable[Tuple[str, uuid.UUID]], session: AsyncSession
+    ) -> Tuple[Dict[Tuple[str, uuid.UUID], uuid.UUID], int]:
+        keys = set(keys)
+        industry_ids = {industry_id for _, industry_id in keys}
+        result = await session.exec(
+            select(Niche.name, Niche.industry_id, Niche.id).where(
+                Niche.industry_id.in_(industry_ids),
+                Niche.name.in_({name for name, _ in keys}),
+            )
+        )
+        niches = {(name, industry_id): niche_id for name, industry_id, niche_id in result.all()}
+
+        missing = [
+            {"id": uuid7(), "name": name, "industry_id": industry_id}
+            for name, industry_id in keys
+            if (name, industry_id) not in niches
+        ]
+        if missing:
+            await session.execute(insert(Niche), missing)
+            for row in missing:
+                niches[(row["name"], row["industry_id"])] = row["id"]
+        return niches, len(missing)
+
+    async def _import_chunk(
+        self, items: List[CourseImportItem], session: AsyncSession
+    ) -> CourseImportResponse:
+        industries, industries_created = await self._resolve_industries(
+            (item.industry for item in items), session
+        )
+        niches, niches_created = await self._resolve_niches(
+            ((item.niche, industries[item.industry]) for item in items), session
+        )
+
+        # ON CONFLICT DO UPDATE may touch a row only once per statement: last one wins
+        by_key: Dict[Tuple[str, uuid.UUID], CourseImportItem] = {}
+        for item in items:
+            by_key[(item.title, industries[item.industry])] = item
+
+        now = datetime.now()
+        rows = [
+            {
+                "id": uuid7(),
+                "title": title,
+                "industry_id": industry_id,
+                "niche_id": niches[(item.niche, industry_id)],
+                "video_link": item.video_link,
+                "summary": item.summary,
+                "source": item.source,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for (title, industry_id), item in by_key.items()
+        ]
+        statement = pg_insert(Course).values(rows)
+        statement = statement.on_conflict_do_update(
+            constraint="unique_course_title_industry",
+            set_={
+                "niche_id": statement.excluded.niche_id,
+                "video_link": statement.excluded.video_link,
+                "summary": statement.excluded.summary,
+                "source": statement.excluded.source,
+                "updated_at": statement.excluded.updated_at,
+            },
+        ).returning(
+            Course.id,
+            Course.title,
+            Course.industry_id,
+            # xmax is 0 only for rows this statement inserted
+            (literal_column("xmax") == 0).label("inserted"),
+        )
+        result = await session.execute(statement)
+        upserted = result.all()
+        course_ids = {(title, industry_id): course_id for course_id, title, industry_id, _ in upserted}
+        updated_ids = [course_id for course_id, _, _, inserted in upserted if not inserted]
+
+        if updated_ids:
+            await session.execute(
+                delete(CourseKeyTakeaway).where(CourseKeyTakeaway.course_id.in_(updated_ids))
+            )
+            await session.execute(
+                delete(CourseAdditionalResource).where(
+                    CourseAdditionalResource.course_id.in_(updated_ids)
+                )
+            )
+
+        takeaways = []
+        resources = []
+        for key, item in by_key.items():
+            course_id = course_ids[key]
+            takeaways.extend(
+                {"id": uuid7(), "course_id": course_id, "content": content, "order": idx}
+                for idx, content in enumerate(item.key_takeaways)
+            )
+            resources.extend(
+                {
+                    "id": uuid7(),
+                    "course_id": course_id,
+                    "title": resource.title,
+                    "link": resource.link,
+                    "order": idx,
+                }
+                for idx, resource in enumerate(item.additional_resources)
+            )
+        # Multi-row VALUES rather than executemany, so the statement-level search
+        # vector trigger runs once per batch instead of once per takeaway
+        for model, child_rows in (
+            (CourseKeyTakeaway, takeaways),
+            (CourseAdditionalResource, resources),
+        ):
+            for start in range(0, len(child_rows), CHILD_BATCH_SIZE):
+                await session.execute(
+                    insert(model).values(child_rows[start : start + CHILD_BATCH_SIZE])
+                )
+
+        await session.commit()
+
+        for (title, _), course_id in course_ids.items():
+            course_title_index.add(course_id, title)
+        await course_cache.invalidate(course_ids.values())
+        if industries_created or niches_created:
+            await bump_versions(TAXONOMY_SCOPE)
+            taxonomy_cache.invalidate()
+
+        return CourseImportResponse(
+            received=len(items),
+            created=len(upserted) - len(updated_ids),
+            updated=len(updated_ids),
+            industries_created=industries_created,
+            niches_created=niches_created,
+        )
+
+    async def import_courses(
+        self,
+        items: List[CourseImportItem],
+        session: AsyncSession,
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+    ) -> CourseImportResponse:
+        """Upsert courses in chunks; earlier chunks stay committed if a later one fails"""
+        totals = CourseImportResponse(
+            received=0, created=0, updated=0, industries_created=0, niches_created=0
+        )
+        for start in range(0, len(items), chunk_size):
+            chunk = await self._import_chunk(items[start : start + chunk_size], session)
+            for field in CourseImportResponse.model_fields:
+                setattr(totals, field, getattr(totals, field) + getattr(chunk, field))
+        return totals
@@ -0,0 +1,280 @@
+import asyncio
+import json
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from redis.exceptions import RedisError, ResponseError
+from sqlalchemy import and_, case, column, literal, or_, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.core.redis import redis_client
+from app.models.course import Course, UserCourseProgress
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+BUFFER_KEY = "progress:playback"
+FLUSHING_KEY = "progress:playback:flushing"
+LOCK_KEY = "progress:playback:lock"
+# Rows per upsert; 5 bind parameters each stays well under the 32767 limit
+FLUSH_BATCH_SIZE = 2000
+
+# Delete the lock only if this flusher still holds it
+RELEASE_LOCK = redis_client.register_script(
+    "if redis.call('get', KEYS[1]) == ARGV[1] then"
+    " return redis.call('del', KEYS[1]) end return 0"
+)
+
+
+@dataclass(frozen=True)
+class PlaybackPosition:
+    """Latest reported playback position of one user in one course video"""
+
+    position_seconds: int
+    duration_seconds: int
+    watched_at: datetime
+
+    def dumps(self) -> str:
+        return json.dumps(
+            [self.position_seconds, self.duration_seconds, self.watched_at.isoformat()]
+        )
+
+    @classmethod
+    def loads(cls, raw: bytes) -> "PlaybackPosition":
+        position, duration, watched_at = json.loads(raw)
+        return cls(position, duration, datetime.fromisoformat(watched_at))
+
+
+class PlaybackBuffer:
+    """
+    Write-behind buffer of video playback heartbeats in Redis.
+
+    A heartbeat overwrites the (user, course) field of one hash, so any number
+    of heartbeats between flushes costs a single row write. Every worker runs a
+    flusher; a Redis lock lets one at a time RENAME the hash aside and upsert it
+    in batches. The renamed hash is deleted only after the commit, so a worker
+    that dies mid-flush leaves it for the next flusher to retry, and restarts
+    lose nothing that reached Redis.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _field(user_id: uuid.UUID, course_id: uuid.UUID) -> str:
+        return f"{user_id}:{course_id}"
+
+    async def record(
+        self,
+        user_id: uuid.UUID,
+        course_id: uuid.UUID,
+        position_seconds: float,
+        duration_seconds: float,
+    ) -> None:
+        """Buffer a heartbeat; raises RedisError when Redis is unavailable"""
+        duration = max(1, round(duration_seconds))
+        playback = PlaybackPosition(
+            min(round(position_seconds), duration), duration, datetime.now()
+        )
+        await redis_client.hset(
+            BUFFER_KEY, self._field(user_id, course_id), playback.dumps()
+        )
+
+    async def pending(
+        self, user_id: uuid.UUID, course_ids: Iterable[uuid.UUID]
+    ) -> Dict[uuid.UUID, PlaybackPosition]:
+        """Buffered positions of the user not yet written to the database"""
+        course_ids = list(course_ids)
+        fields = [self._field(user_id, course_id) for course_id in course_ids]
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.hmget(FLUSHING_KEY, fields)
+                pipe.hmget(BUFFER_KEY, fields)
+                flushing, buffered = await pipe.execute()
+        except RedisError as exc:
+            logger.warning("Playback buffer unavailable: %s", exc)
+            return {}
+        return {
+            course_id: PlaybackPosition.loads(newer or older)
+            for course_id, older, newer in zip(course_ids, flushing, buffered)
+            if newer or older
+        }
+
+    async def write(
+        self,
+        positions: Dict[Tuple[uuid.UUID, uuid.UUID], PlaybackPosition],
+        session: AsyncSession,
+    ) -> int:
+        """
+        Upsert positions keyed by (user_id, course_id); returns the rows written.
+
+        Watching past PLAYBACK_COMPLETION_THRESHOLD of the video marks the course
+        completed (never the reverse). Older positions don't overwrite newer ones,
+        so retrying a flush is harmless, and unknown users or courses are skipped.
+        """
+        table = UserCourseProgress.__table__
+        threshold = settings.PLAYBACK_COMPLETION_THRESHOLD
+        items = list(positions.items())
+        written = 0
+        for start in range(0, len(items), FLUSH_BATCH_SIZE):
+            batch = items[start : start + FLUSH_BATCH_SIZE]
+            heartbeats = values(
+                column("user_id", table.c.user_id.type),
+                column("course_id", table.c.course_id.type),
+                column("position_seconds", table.c.position_seconds.type),
+                column("duration_seconds", table.c.duration_seconds.type),
+                column("last_watched_at", table.c.last_watched_at.type),
+                name="heartbeats",
+            ).data(
+                [
+                    (
+                        user_id,
+                        course_id,
+                        playback.position_seconds,
+                        playback.duration_seconds,
+                        playback.watched_at,
+                    )
+                    for (user_id, course_id), playback in batch
+                ]
+            )
+            watched_enough = heartbeats.c.position_seconds >= (
+                heartbeats.c.duration_seconds * threshold
+            )
+            now = datetime.now()
+            rows = (
+                select(
+                    func.uuid_generate_v7(),
+                    heartbeats.c.user_id,
+                    heartbeats.c.course_id,
+                    heartbeats.c.position_seconds,
+                    heartbeats.c.duration_seconds,
+                    heartbeats.c.last_watched_at,
+                    watched_enough,
+                    case((watched_enough, heartbeats.c.last_watched_at)),
+                    case((watched_enough, literal(now))),
+                    literal(now),
+                    literal(now),
+                )
+                .select_from(heartbeats)
+                .join(Course, Course.id == heartbeats.c.course_id)
+                .join(User, User.id == heartbeats.c.user_id)
+            )
+            statement = pg_insert(UserCourseProgress).from_select(
+                [
+                    "id",
+                    "user_id",
+                    "course_id",
+                    "position_seconds",
+                    "duration_seconds",
+                    "last_watched_at",
+                    "is_completed",
+                    "completed_at",
+                    "completion_changed_at",
+                    "created_at",
+                    "updated_at",
+                ],
+                rows,
+            )
+            excluded = statement.excluded
+            statement = statement.on_conflict_do_update(
+                constraint="unique_user_course",
+                set_={
+                    "position_seconds": excluded.position_seconds,
+                    "duration_seconds": excluded.duration_seconds,
+                    "last_watched_at": excluded.last_watched_at,
+                    "is_completed": or_(
+                        UserCourseProgress.is_completed, excluded.is_completed
+                    ),
+                    "completed_at": case(
+                        (
+                            UserCourseProgress.is_completed,
+                            UserCourseProgress.completed_at,
+                        ),
+                        else_=excluded.completed_at,
+                    ),
+                    # Only a first completion changes it; heartbeats never un-complete
+                    "completion_changed_at": case(
+                        (
+                            and_(
+                                ~UserCourseProgress.is_completed, excluded.is_completed
+                            ),
+                            excluded.completion_changed_at,
+                        ),
+                        else_=UserCourseProgress.completion_changed_at,
+                    ),
+                    "updated_at": excluded.updated_at,
+                },
+                where=or_(
+                    UserCourseProgress.last_watched_at.is_(None),
+                    UserCourseProgress.last_watched_at <= excluded.last_watched_at,
+                ),
+            )
+            result = await session.execute(statement)
+            written += result.rowcount
+        await session.commit()
+        return written
+
+    async def flush(self) -> int:
+        """Write buffered heartbeats if no other worker is flushing; returns rows written"""
+        token = uuid.uuid4().hex
+        lock_seconds = max(30, settings.PLAYBACK_FLUSH_SECONDS * 3)
+        if not await redis_client.set(LOCK_KEY, token, nx=True, ex=lock_seconds):
+            return 0
+        try:
+            # A hash left over from an interrupted flush is retried first
+            if not await redis_client.exists(FLUSHING_KEY):
+                try:
+                    await redis_client.rename(BUFFER_KEY, FLUSHING_KEY)
+                except ResponseError:
+                    return 0  # Nothing buffered
+            raw = await redis_client.hgetall(FLUSHING_KEY)
+
+            positions: Dict[Tuple[uuid.UUID, uuid.UUID], PlaybackPosition] = {}
+            for field, value in raw.items():
+                user_id, course_id = field.decode().split(":")
+                positions[(uuid.UUID(user_id), uuid.UUID(course_id))] = (
+                    PlaybackPosition.loads(value)
+                )
+            async with async_session_maker() as session:
+                written = await self.write(positions, session)
+            await redis_client.delete(FLUSHING_KEY)
+            return written
+        finally:
+            await RELEASE_LOCK(keys=[LOCK_KEY], args=[token])
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.PLAYBACK_FLUSH_SECONDS)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Playback flush failed; will retry")
+
+    def start(self) -> None:
+        """Start this worker's periodic flusher"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flusher, writing out what is buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Final playback flush failed; left for the next worker")
+
+
+playback_buffer = PlaybackBuffer()
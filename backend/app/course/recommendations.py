@@ -0,0 +1,349 @@
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from scipy import sparse
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.models.course import Course, UserCourseProgress
+from app.models.niche import Niche
+
+
+class CoCompletionModel:
+    """
+    Item-item co-completion counts for course recommendations.
+
+    `completions` is the binary users x courses matrix of completed courses and
+    `co_completions` = completions.T @ completions, so entry (i, j) is the number
+    of users who completed both i and j and the diagonal is each course's
+    completion count. Both are scipy CSR matrices; a refresh replaces the rows of
+    users whose completions changed and applies the difference to `co_completions`
+    instead of recomputing the product. The matrix work runs in a thread, on a copy
+    when refreshing, so requests keep being served from the current model.
+    """
+
+    def __init__(self):
+        self.course_ids: List[uuid.UUID] = []
+        self.course_index: Dict[uuid.UUID, int] = {}
+        self.course_niches: List[uuid.UUID] = []
+        self.active = np.zeros(0, dtype=bool)
+        self.niche_industries: Dict[uuid.UUID, uuid.UUID] = {}
+        self.user_index: Dict[uuid.UUID, int] = {}
+        self.completions = sparse.csr_matrix((0, 0), dtype=np.int32)
+        self.co_completions = sparse.csr_matrix((0, 0), dtype=np.int32)
+        self.watermark: Optional[datetime] = None
+
+    async def _fetch_catalog(self, session: AsyncSession):
+        courses = await session.exec(select(Course.id, Course.niche_id))
+        niches = await session.exec(select(Niche.id, Niche.industry_id))
+        return dict(courses.all()), dict(niches.all())
+
+    def _apply_catalog(
+        self,
+        courses: Dict[uuid.UUID, uuid.UUID],
+        niche_industries: Dict[uuid.UUID, uuid.UUID],
+    ) -> None:
+        """Add new courses and flag deleted ones inactive"""
+        for course_id, niche_id in courses.items():
+            if course_id not in self.course_index:
+                self.course_index[course_id] = len(self.course_ids)
+                self.course_ids.append(course_id)
+                self.course_niches.append(niche_id)
+            else:
+                self.course_niches[self.course_index[course_id]] = niche_id
+        self.active = np.array(
+            [course_id in courses for course_id in self.course_ids], dtype=bool
+        )
+        self.niche_industries = niche_industries
+
+        size = len(self.course_ids)
+        self.completions.resize((self.completions.shape[0], size))
+        self.co_completions.resize((size, size))
+
+    def _user_rows(
+        self, completed: Dict[uuid.UUID, Set[uuid.UUID]], users: List[uuid.UUID]
+    ) -> sparse.csr_matrix:
+        rows, cols = [], []
+        for row, user_id in enumerate(users):
+            for course_id in completed.get(user_id, ()):
+                if course_id in self.course_index:
+                    rows.append(row)
+                    cols.append(self.course_index[course_id])
+        return sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+            shape=(len(users), len(self.course_ids)),
+        )
+
+    async def _completed_by(
+        self, session: AsyncSession, users: Optional[Iterable[uuid.UUID]] = None
+    ) -> Dict[uuid.UUID, Set[uuid.UUID]]:
+        statement = select(UserCourseProgress.user_id, UserCourseProgress.course_id).where(
+            UserCourseProgress.is_completed == True
+        )
+        if users is not None:
+            statement = statement.where(UserCourseProgress.user_id.in_(list(users)))
+        result = await session.exec(statement)
+        completed: Dict[uuid.UUID, Set[uuid.UUID]] = {}
+        for user_id, course_id in result.all():
+            completed.setdefault(user_id, set()).add(course_id)
+        return completed
+
+    def _build(self, catalog, completed: Dict[uuid.UUID, Set[uuid.UUID]]) -> None:
+        self.__init__()
+        self._apply_catalog(*catalog)
+        users = list(completed)
+        self.user_index = {user_id: row for row, user_id in enumerate(users)}
+        self.completions = self._user_rows(completed, users)
+        self.co_completions = (self.completions.T @ self.completions).tocsr()
+
+    async def build(self, session: AsyncSession) -> None:
+        """Full build from the database; not for a model that is serving requests"""
+        started = datetime.now()
+        catalog = await self._fetch_catalog(session)
+        completed = await self._completed_by(session)
+        await asyncio.to_thread(self._build, catalog, completed)
+        self.watermark = started
+
+    def _copy(self) -> "CoCompletionModel":
+        model = CoCompletionModel()
+        model.course_ids = list(self.course_ids)
+        model.course_index = dict(self.course_index)
+        model.course_niches = list(self.course_niches)
+        model.active = self.active
+        model.niche_industries = self.niche_industries
+        model.user_index = dict(self.user_index)
+        # Copied because resizing works in place
+        model.completions = self.completions.copy()
+        model.co_completions = self.co_completions.copy()
+        return model
+
+    def _with_changes(
+        self,
+        catalog,
+        users: List[uuid.UUID],
+        completed: Dict[uuid.UUID, Set[uuid.UUID]],
+    ) -> "CoCompletionModel":
+        """Copy of the model with the catalog and the given users' completions applied"""
+        model = self._copy()
+        model._apply_catalog(*catalog)
+        if users:
+            for user_id in users:
+                if user_id not in model.user_index:
+                    model.user_index[user_id] = len(model.user_index)
+            model.completions.resize((len(model.user_index), len(model.course_ids)))
+
+            rows = [model.user_index[user_id] for user_id in users]
+            old = model.completions[rows]
+            new = model._user_rows(completed, users)
+            model.co_completions = (
+                model.co_completions + new.T @ new - old.T @ old
+            ).tocsr()
+            model.co_completions.eliminate_zeros()
+
+            completions = model.completions.tolil()
+            completions[rows] = new.tolil()
+            model.completions = completions.tocsr()
+        return model
+
+    async def refreshed(
+        self, session: AsyncSession
+    ) -> Tuple["CoCompletionModel", int]:
+        """
+        Fold in completions changed since the last build or refresh.
+
+        Rows are recomputed per changed user, so overlapping windows are harmless;
+        the window starts one refresh interval early to cover late commits. The
+        result is a new model, so this one keeps serving requests meanwhile.
+        Returns the refreshed model and the number of users updated.
+        """
+        if self.watermark is None:
+            model = CoCompletionModel()
+            await model.build(session)
+            return model, len(model.user_index)
+
+        started = datetime.now()
+        catalog = await self._fetch_catalog(session)
+        since = self.watermark - timedelta(seconds=settings.RECOMMENDER_REFRESH_SECONDS)
+        result = await session.exec(
+            select(UserCourseProgress.user_id)
+            .where(UserCourseProgress.completion_changed_at > since)
+            .distinct()
+        )
+        users = list(result.all())
+        completed = await self._completed_by(session, users) if users else {}
+
+        model = await asyncio.to_thread(self._with_changes, catalog, users, completed)
+        model.watermark = started
+        return model, len(users)
+
+    def recommend(
+        self,
+        completed: Iterable[uuid.UUID],
+        niche_ids: Iterable[uuid.UUID],
+        limit: int,
+    ) -> List[uuid.UUID]:
+        """
+        Rank courses the user has not completed.
+
+        score = (1 - w) * co-completion similarity + w * niche affinity, plus a small
+        popularity prior so users without history still get a sensible order.
+        Similarity is the cosine of completion vectors, summed over the user's
+        completed courses and scaled to [0, 1].
+        """
+        size = len(self.course_ids)
+        if not size:
+            return []
+
+        counts = self.co_completions.diagonal().astype(np.float64)
+        with np.errstate(divide="ignore"):
+            inverse_norm = np.where(counts > 0, 1 / np.sqrt(counts), 0.0)
+
+        seen = [self.course_index[c] for c in completed if c in self.course_index]
+        similarity = np.zeros(size)
+        if seen:
+            weights = sparse.csr_matrix(
+                (inverse_norm[seen], (np.zeros(len(seen), dtype=int), seen)),
+                shape=(1, size),
+            )
+            similarity = (weights @ self.co_completions).toarray().ravel() * inverse_norm
+            if similarity.max() > 0:
+                similarity /= similarity.max()
+
+        niche_ids = set(niche_ids)
+        industries = {self.niche_industries.get(niche_id) for niche_id in niche_ids}
+        affinity = np.array(
+            [
+                1.0
+                if niche_id in niche_ids
+                else 0.3 if self.niche_industries.get(niche_id) in industries else 0.0
+                for niche_id in self.course_niches
+            ]
+        )
+
+        popularity = counts / counts.max() if counts.max() > 0 else np.zeros(size)
+        niche_weight = settings.RECOMMENDER_NICHE_WEIGHT
+        scores = (
+            (1 - niche_weight) * similarity + niche_weight * affinity + 0.05 * popularity
+        )
+        scores[~self.active] = -np.inf
+        scores[seen] = -np.inf
+
+        candidates = np.flatnonzero(np.isfinite(scores))
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit)[:limit]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [self.course_ids[i] for i in candidates]
+
+    def save(self, path: Path) -> None:
+        """Write the model as one compressed .npz file"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        completions = self.completions.tocsr()
+        co_completions = self.co_completions.tocsr()
+        users = sorted(self.user_index, key=self.user_index.get)
+        np.savez_compressed(
+            path,
+            course_ids=np.array([str(c) for c in self.course_ids]),
+            course_niches=np.array([str(n) for n in self.course_niches]),
+            active=self.active,
+            niche_ids=np.array([str(n) for n in self.niche_industries]),
+            niche_industries=np.array([str(i) for i in self.niche_industries.values()]),
+            user_ids=np.array([str(u) for u in users]),
+            completions_data=completions.data,
+            completions_indices=completions.indices,
+            completions_indptr=completions.indptr,
+            completions_shape=np.array(completions.shape),
+            co_completions_data=co_completions.data,
+            co_completions_indices=co_completions.indices,
+            co_completions_indptr=co_completions.indptr,
+            co_completions_shape=np.array(co_completions.shape),
+            watermark=np.array(self.watermark.isoformat() if self.watermark else ""),
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "CoCompletionModel":
+        model = cls()
+        with np.load(path) as data:
+            model.course_ids = [uuid.UUID(c) for c in data["course_ids"]]
+            model.course_index = {c: i for i, c in enumerate(model.course_ids)}
+            model.course_niches = [uuid.UUID(n) for n in data["course_niches"]]
+            model.active = data["active"]
+            model.niche_industries = {
+                uuid.UUID(n): uuid.UUID(i)
+                for n, i in zip(data["niche_ids"], data["niche_industries"])
+            }
+            model.user_index = {uuid.UUID(u): i for i, u in enumerate(data["user_ids"])}
+            model.completions = sparse.csr_matrix(
+                (
+                    data["completions_data"],
+                    data["completions_indices"],
+                    data["completions_indptr"],
+                ),
+                shape=tuple(data["completions_shape"]),
+            )
+            model.co_completions = sparse.csr_matrix(
+                (
+                    data["co_completions_data"],
+                    data["co_completions_indices"],
+                    data["co_completions_indptr"],
+                ),
+                shape=tuple(data["co_completions_shape"]),
+            )
+            watermark = str(data["watermark"])
+            model.watermark = datetime.fromisoformat(watermark) if watermark else None
+        return model
+
+
+class CourseRecommender:
+    """
+    Per-worker holder of the co-completion model.
+
+    On first use it loads the file written by build_recommendations.py (or builds
+    from the database when there is none); afterwards it refreshes incrementally
+    in the background once the model is older than RECOMMENDER_REFRESH_SECONDS.
+    """
+
+    def __init__(self):
+        self.model: Optional[CoCompletionModel] = None
+        self._refreshed_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def _load(self) -> None:
+        path = Path(settings.RECOMMENDER_MODEL_PATH)
+        model = (
+            await asyncio.to_thread(CoCompletionModel.load, path)
+            if path.exists()
+            else CoCompletionModel()
+        )
+        async with async_session_maker() as session:
+            self.model, _ = await model.refreshed(session)
+        self._refreshed_at = time.monotonic()
+
+    async def _refresh(self) -> None:
+        async with async_session_maker() as session:
+            # Swapped in whole once ready; requests never see a half-applied refresh
+            self.model, _ = await self.model.refreshed(session)
+        self._refreshed_at = time.monotonic()
+
+    async def ensure_fresh(self) -> CoCompletionModel:
+        if self.model is None:
+            # Concurrent first requests share one load
+            if self._task is None or self._task.done():
+                self._task = asyncio.create_task(self._load())
+            await asyncio.shield(self._task)
+            return self.model
+        stale = (
+            time.monotonic() - self._refreshed_at > settings.RECOMMENDER_REFRESH_SECONDS
+        )
+        if stale and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._refresh())
+        return self.model
+
+
+course_recommender = CourseRecommender()
@@ -1,23 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
 from sqlmodel.ext.asyncio.session import AsyncSession
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Literal, Optional
 import uuid
+from pydantic import ValidationError
 
 from app.core.database import get_session
-from app.auth.dependencies import AccessTokenBearer, RoleChecker
+from app.core.http_cache import json_response, not_modified, set_validators
+from app.auth.dependencies import (
+    AccessTokenBearer,
+    OptionalAccessTokenBearer,
+    RoleChecker,
+)
+from app.course.cache import course_cache
+from app.course.importer import CourseImportService, parse_import_payload
 from app.course.services import CourseService
 from app.course.schemas import (
     CourseCreateModel,
     CourseUpdateModel,
     CourseDetailResponse,
+    CourseImportResponse,
     PaginatedCourseResponse,
     CourseListResponse,
+    PopularCourseResponse,
+    CourseSuggestion,
     MessageResponseModel,
+    ContinueWatchingResponse,
+    CourseProgressState,
+    PlaybackHeartbeat,
+    ProgressEventBatch,
+    ProgressSyncResponse,
 )
 
 # Initialize router and service
 course_router = APIRouter(prefix="/courses", tags=["Courses"])
 course_service = CourseService()
+course_import_service = CourseImportService()
 admin_check = RoleChecker(allowed_roles=["admin"])
 
 
@@ -38,6 +55,44 @@ async def create_course(
     return await course_service.create_course(course_data, session)
 
 
+@course_router.post(
+    "/import",
+    response_model=CourseImportResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(admin_check)],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": {"type": "array", "items": {"type": "object"}}},
+                "application/x-ndjson": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def import_courses(
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+):
+    """Create or update courses in bulk from a JSON array or NDJSON (Admin only)"""
+    ndjson = request.headers.get("content-type", "").startswith(
+        ("application/x-ndjson", "application/ndjson")
+    )
+    try:
+        items = parse_import_payload(await request.body(), ndjson=ndjson)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.errors(include_url=False, include_context=False),
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid JSON: {e}",
+        )
+    return await course_import_service.import_courses(items, session)
+
+
 @course_router.put(
     "/{course_id}",
     response_model=CourseDetailResponse,
@@ -76,11 +131,81 @@ async def delete_course(
     status_code=status.HTTP_200_OK,
 )
 async def get_recent_courses(
+    request: Request,
+    response: Response,
     limit: int = Query(3, ge=1, le=10, description="Number of recent courses to fetch"),
-    session: AsyncSession = Depends(get_session),
 ):
     """Get most recent courses (Public)"""
-    return await course_service.get_recent_courses(session, limit)
+    version = await course_cache.catalog_version()
+    if unchanged := not_modified(request, version):
+        return unchanged
+    set_validators(response, version)
+    return await course_service.get_recent_courses(limit, version)
+
+
+@course_router.get(
+    "/popular",
+    response_model=List[PopularCourseResponse],
+    status_code=status.HTTP_200_OK,
+)
+async def get_popular_courses(
+    by: Literal["completions", "favourites"] = Query(
+        "completions", description="Rank by completions or favourites"
+    ),
+    limit: int = Query(10, ge=1, le=50, description="Number of courses to fetch"),
+    session: AsyncSession = Depends(get_session),
+):
+    """Get the most popular courses (Public)"""
+    return await course_service.get_popular_courses(session, by, limit)
+
+
+@course_router.get(
+    "/recommended",
+    response_model=List[CourseListResponse],
+    status_code=status.HTTP_200_OK,
+)
+async def get_recommended_courses(
+    limit: int = Query(10, ge=1, le=50, description="Number of courses to recommend"),
+    token_details: Dict[str, Any] = Depends(AccessTokenBearer()),
+    session: AsyncSession = Depends(get_session),
+):
+    """Get courses recommended for the current user (Authenticated users only)"""
+    user_id = uuid.UUID(token_details["user"]["user_uid"])
+    return await course_service.get_recommended_courses(user_id, session, limit)
+
+
+@course_router.get(
+    "/autocomplete",
+    response_model=List[CourseSuggestion],
+    status_code=status.HTTP_200_OK,
+)
+async def autocomplete_courses(
+    q: str = Query(..., min_length=1, max_length=100, description="What the user has typed so far"),
+    limit: int = Query(10, ge=1, le=20, description="Maximum number of suggestions"),
+):
+    """Suggest course titles while typing, tolerating small typos (Public)"""
+    return await course_service.autocomplete_titles(q, limit)
+
+
+@course_router.get(
+    "/batch",
+    response_model=List[CourseDetailResponse],
+    status_code=status.HTTP_200_OK,
+)
+async def get_courses_batch(
+    request: Request,
+    ids: List[uuid.UUID] = Query(
+        ..., min_length=1, max_length=50, description="Courses to fetch, in order"
+    ),
+    session: AsyncSession = Depends(get_session),
+):
+    """Get several courses by ID in one request; unknown IDs are left out (Public)"""
+    course_ids = list(dict.fromkeys(ids))
+    version = await course_cache.batch_version(course_ids)
+    if unchanged := not_modified(request, version):
+        return unchanged
+    payload = await course_service.get_course_batch_json(course_ids, version, session)
+    return json_response(payload, version)
 
 
 @course_router.get(
@@ -90,10 +215,15 @@ async def get_recent_courses(
 )
 async def get_course(
     course_id: uuid.UUID,
+    request: Request,
     session: AsyncSession = Depends(get_session),
 ):
     """Get a single course by ID (Public)"""
-    return await course_service.get_course_by_id(course_id, session)
+    version = await course_cache.detail_version(course_id)
+    if unchanged := not_modified(request, version):
+        return unchanged
+    payload = await course_service.get_course_detail_json(course_id, version, session)
+    return json_response(payload, version)
 
 
 @course_router.get(
@@ -102,22 +232,70 @@ async def get_course(
     status_code=status.HTTP_200_OK,
 )
 async def get_courses(
+    request: Request,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Page size"),
-    search: Optional[str] = Query(None, description="Search by title"),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor of the previous page (keyset pagination)"
+    ),
+    count: Optional[Literal["exact", "estimate", "none"]] = Query(
+        None,
+        description="How to compute total: exact (default without cursor), estimate or none (default with cursor)",
+    ),
+    search: Optional[str] = Query(
+        None,
+        description='Search title, summary and key takeaways (web search syntax: "exact phrase", -exclude, or)',
+    ),
     industry_id: Optional[uuid.UUID] = Query(None, description="Filter by industry"),
     niche_id: Optional[uuid.UUID] = Query(None, description="Filter by niche"),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated fields to return (id is always included): id, title, industry_id, niche_id, video_link, summary, created_at",
+    ),
+    view: Literal["full", "compact"] = Query(
+        "full",
+        description="compact leaves out video_link and summary; ignored when fields is set",
+    ),
+    include_progress: bool = Query(
+        False,
+        description="Add the caller's is_favourite/is_completed to each item (requires a token)",
+    ),
+    token_details: Optional[Dict[str, Any]] = Depends(OptionalAccessTokenBearer()),
     session: AsyncSession = Depends(get_session),
 ):
-    """Get paginated list of courses with filters (Public)"""
-    return await course_service.get_courses(
+    """Get paginated list of courses with filters (Public; progress badges for authenticated users)"""
+    list_fields = course_service.list_fields(fields, view)
+    if include_progress and token_details:
+        # Per-user rows: neither shared-cached nor conditional
+        return await course_service.get_courses(
+            session=session,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            count=count,
+            search=search,
+            industry_id=industry_id,
+            niche_id=niche_id,
+            progress_user_id=uuid.UUID(token_details["user"]["user_uid"]),
+            fields=list_fields,
+        )
+
+    version = await course_cache.catalog_version()
+    if unchanged := not_modified(request, version):
+        return unchanged
+    payload = await course_service.get_catalog_page_json(
         session=session,
+        version=version,
         page=page,
         page_size=page_size,
+        cursor=cursor,
+        count=count,
         search=search,
         industry_id=industry_id,
         niche_id=niche_id,
+        fields=list_fields,
     )
+    return json_response(payload, version)
 
 
 # ==================== USER ROUTES ====================
@@ -153,6 +331,21 @@ async def mark_completed(
     return await course_service.mark_completed(course_id, user_id, session)
 
 
+@course_router.post(
+    "/my/progress/events",
+    response_model=ProgressSyncResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def sync_progress_events(
+    batch: ProgressEventBatch,
+    token_details: Dict[str, Any] = Depends(AccessTokenBearer()),
+    session: AsyncSession = Depends(get_session),
+):
+    """Apply favourite/completion events recorded by the client, e.g. offline (Authenticated users only)"""
+    user_id = uuid.UUID(token_details["user"]["user_uid"])
+    return await course_service.apply_progress_events(batch.events, user_id, session)
+
+
 @course_router.get(
     "/my/favourites",
     response_model=PaginatedCourseResponse,
@@ -162,6 +355,21 @@ async def get_my_favourites(
     token_details: Dict[str, Any] = Depends(AccessTokenBearer()),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor of the previous page (keyset pagination)"
+    ),
+    count: Optional[Literal["exact", "estimate", "none"]] = Query(
+        None,
+        description="How to compute total: exact (default without cursor), estimate or none (default with cursor)",
+    ),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated fields to return (id is always included): id, title, industry_id, niche_id, video_link, summary, created_at",
+    ),
+    view: Literal["full", "compact"] = Query(
+        "full",
+        description="compact leaves out video_link and summary; ignored when fields is set",
+    ),
     session: AsyncSession = Depends(get_session),
 ):
     """Get current user's favourite courses (Authenticated users only)"""
@@ -170,8 +378,12 @@ async def get_my_favourites(
         session=session,
         page=page,
         page_size=page_size,
+        cursor=cursor,
+        count=count,
         user_id=user_id,
         filter_type="favourites",
+        progress_user_id=user_id,
+        fields=course_service.list_fields(fields, view),
     )
 
 
@@ -184,6 +396,21 @@ async def get_my_completed(
     token_details: Dict[str, Any] = Depends(AccessTokenBearer()),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor of the previous page (keyset pagination)"
+    ),
+    count: Optional[Literal["exact", "estimate", "none"]] = Query(
+        None,
+        description="How to compute total: exact (default without cursor), estimate or none (default with cursor)",
+    ),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated fields to return (id is always included): id, title, industry_id, niche_id, video_link, summary, created_at",
+    ),
+    view: Literal["full", "compact"] = Query(
+        "full",
+        description="compact leaves out video_link and summary; ignored when fields is set",
+    ),
     session: AsyncSession = Depends(get_session),
 ):
     """Get current user's completed courses (Authenticated users only)"""
@@ -192,11 +419,62 @@ async def get_my_completed(
         session=session,
         page=page,
         page_size=page_size,
+        cursor=cursor,
+        count=count,
         user_id=user_id,
         filter_type="completed",
+        progress_user_id=user_id,
+        fields=course_service.list_fields(fields, view),
     )
 
 
+@course_router.post(
+    "/{course_id}/heartbeat",
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def record_playback(
+    course_id: uuid.UUID,
+    heartbeat: PlaybackHeartbeat,
+    token_details: Dict[str, Any] = Depends(AccessTokenBearer()),
+):
+    """Report the playback position of a course video, e.g. every few seconds (Authenticated users only)"""
+    user_id = uuid.UUID(token_details["user"]["user_uid"])
+    await course_service.record_playback(course_id, user_id, heartbeat)
+    return Response(status_code=status.HTTP_202_ACCEPTED)
+
+
+@course_router.get(
+    "/my/continue-watching",
+    response_model=List[ContinueWatchingResponse],
+    status_code=status.HTTP_200_OK,
+)
+async def get_continue_watching(
+    limit: int = Query(10, ge=1, le=50, description="Number of courses to fetch"),
+    token_details: Dict[str, Any] = Depends(AccessTokenBearer()),
+    session: AsyncSession = Depends(get_session),
+):
+    """Get current user's started, unfinished courses (Authenticated users only)"""
+    user_id = uuid.UUID(token_details["user"]["user_uid"])
+    return await course_service.get_continue_watching(user_id, session, limit)
+
+
+@course_router.get(
+    "/my/progress",
+    response_model=List[CourseProgressState],
+    status_code=status.HTTP_200_OK,
+)
+async def get_my_progress(
+    course_ids: List[uuid.UUID] = Query(
+        ..., min_length=1, max_length=100, description="Courses to report on"
+    ),
+    token_details: Dict[str, Any] = Depends(AccessTokenBearer()),
+    session: AsyncSession = Depends(get_session),
+):
+    """Get current user's progress for several courses at once (Authenticated users only)"""
+    user_id = uuid.UUID(token_details["user"]["user_uid"])
+    return await course_service.get_progress_for_courses(course_ids, user_id, session)
+
+
 @course_router.get(
     "/{course_id}/progress",
     status_code=status.HTTP_200_OK,
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Literal, Optional
+from typing_extensions import TypedDict
 import uuid
 from datetime import datetime
 
@@ -37,6 +38,56 @@ class CourseCreateModel(BaseModel):
     )
 
 
+class CourseImportItem(BaseModel):
+    """Schema for one course of a bulk import; industry and niche are given by name"""
+
+    industry: str = Field(description="Industry name, created if missing")
+    niche: str = Field(description="Niche name within the industry, created if missing")
+    title: str = Field(description="Course title, unique within the industry")
+    video_link: str = Field(description="Video link (e.g., YouTube)")
+    summary: str = Field(description="Course summary")
+    source: Optional[str] = Field(default=None, description="Source information/link")
+    key_takeaways: List[str] = Field(
+        description="Key takeaways in display order", min_length=1
+    )
+    additional_resources: List[AdditionalResourceCreate] = Field(
+        default=[], description="List of additional resources"
+    )
+
+
+class ProgressEvent(BaseModel):
+    """Schema for one progress change recorded by a client, possibly offline"""
+
+    course_id: uuid.UUID
+    type: Literal["favourite", "unfavourite", "complete", "uncomplete"] = Field(
+        description="Sets the state explicitly, so replaying an event is harmless"
+    )
+    occurred_at: Optional[datetime] = Field(
+        default=None, description="When it happened on the client; defaults to now"
+    )
+
+    @field_validator("occurred_at")
+    @classmethod
+    def to_server_time(cls, value: Optional[datetime]) -> Optional[datetime]:
+        # Timestamps are stored naive in server local time, like datetime.now()
+        if value is not None and value.tzinfo is not None:
+            return value.astimezone().replace(tzinfo=None)
+        return value
+
+
+class PlaybackHeartbeat(BaseModel):
+    """Schema for the current playback position of a course video"""
+
+    position_seconds: float = Field(ge=0, description="Current position in the video")
+    duration_seconds: float = Field(gt=0, description="Length of the video")
+
+
+class ProgressEventBatch(BaseModel):
+    """Schema for a batch of progress events"""
+
+    events: List[ProgressEvent] = Field(min_length=1, max_length=500)
+
+
 class CourseUpdateModel(BaseModel):
     """Schema for updating a course (all fields optional)"""
 
@@ -105,11 +156,67 @@ class CourseListResponse(BaseModel):
     video_link: str
     summary: str
     created_at: datetime
+    # The caller's progress; only set when requested by an authenticated user
+    is_favourite: Optional[bool] = None
+    is_completed: Optional[bool] = None
+    completed_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
 
 
+# Columns a course list can be narrowed to with `fields`; id is always included
+COURSE_LIST_FIELDS = (
+    "id",
+    "title",
+    "industry_id",
+    "niche_id",
+    "video_link",
+    "summary",
+    "created_at",
+)
+# `view=compact`: enough for a course card, without the summary
+COMPACT_COURSE_LIST_FIELDS = ("id", "title", "industry_id", "niche_id", "created_at")
+
+
+class CourseListItem(TypedDict, total=False):
+    """Course list entry holding only the requested fields of CourseListResponse"""
+
+    id: uuid.UUID
+    title: str
+    industry_id: uuid.UUID
+    niche_id: uuid.UUID
+    video_link: str
+    summary: str
+    created_at: datetime
+    # The caller's progress; only present when requested by an authenticated user
+    is_favourite: bool
+    is_completed: bool
+    completed_at: Optional[datetime]
+
+
+class PopularCourseResponse(CourseListResponse):
+    """Schema for a course with its engagement counts"""
+
+    favourite_count: int
+    completion_count: int
+
+
+class ContinueWatchingResponse(CourseListResponse):
+    """Schema for a started course with the user's playback position"""
+
+    position_seconds: int
+    duration_seconds: int
+    last_watched_at: datetime
+
+
+class CourseSuggestion(BaseModel):
+    """Schema for a course title autocomplete suggestion"""
+
+    id: uuid.UUID
+    title: str
+
+
 class UserCourseProgressResponse(BaseModel):
     """Schema for user course progress response"""
 
@@ -119,6 +226,9 @@ class UserCourseProgressResponse(BaseModel):
     is_favourite: bool
     is_completed: bool
     completed_at: Optional[datetime]
+    position_seconds: Optional[int] = None
+    duration_seconds: Optional[int] = None
+    last_watched_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
 
@@ -126,14 +236,47 @@ class UserCourseProgressResponse(BaseModel):
         from_attributes = True
 
 
+class CourseProgressState(BaseModel):
+    """Schema for a user's progress on one course"""
+
+    course_id: uuid.UUID
+    is_favourite: bool
+    is_completed: bool
+    completed_at: Optional[datetime]
+    position_seconds: Optional[int] = None
+    duration_seconds: Optional[int] = None
+    last_watched_at: Optional[datetime] = None
+
+
+class ProgressSyncResponse(BaseModel):
+    """Schema for the result of applying a batch of progress events"""
+
+    progress: List[CourseProgressState]
+    unknown_course_ids: List[uuid.UUID]
+
+
 class PaginatedCourseResponse(BaseModel):
     """Schema for paginated course list response"""
 
-    items: List[CourseListResponse]
-    total: int
-    page: int
+    items: List[CourseListItem]
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+    page: Optional[int] = None
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as `cursor` to fetch the next page by keyset"
+    )
+
+
+class CourseImportResponse(BaseModel):
+    """Schema for bulk import results"""
+
+    received: int
+    created: int
+    updated: int
+    industries_created: int
+    niches_created: int
 
 
 class MessageResponseModel(BaseModel):
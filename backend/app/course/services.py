@@ -1,8 +1,15 @@
+import base64
+import json
 import uuid
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select, and_, func
+from sqlmodel import select, and_, or_, func
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import case, column, delete, insert, literal, text, tuple_, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from redis.exceptions import RedisError
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Sequence, Tuple
 from fastapi import HTTPException, status
 from datetime import datetime
 
@@ -14,18 +21,41 @@ from app.models.course import (
 )
 from app.models.industry import Industry
 from app.models.niche import Niche
+from app.models.user_niche import UserNiche
+from app.course.autocomplete import course_title_index
+from app.core.database import is_foreign_key_violation
+from app.core.http_cache import ResourceVersion
+from app.core.ids import uuid7
+from app.course.cache import course_cache, recent_courses_cache
+from app.course.playback import playback_buffer
+from app.course.recommendations import course_recommender
 from app.course.schemas import (
     CourseCreateModel,
     CourseUpdateModel,
     CourseDetailResponse,
     CourseListResponse,
+    CourseListItem,
+    COURSE_LIST_FIELDS,
+    COMPACT_COURSE_LIST_FIELDS,
+    PopularCourseResponse,
+    CourseSuggestion,
     PaginatedCourseResponse,
     MessageResponseModel,
     KeyTakeawayCreate,
     AdditionalResourceCreate,
+    ContinueWatchingResponse,
+    CourseProgressState,
+    PlaybackHeartbeat,
+    ProgressEvent,
+    ProgressSyncResponse,
 )
 
 
+# Built once: validating a whole page in one call is far cheaper than a model per row
+course_list_adapter = TypeAdapter(List[CourseListItem])
+PROGRESS_FIELDS = ("is_favourite", "is_completed", "completed_at")
+
+
 class CourseService:
     """Service class for course operations"""
 
@@ -92,6 +122,27 @@ class CourseService:
 
         return course
 
+    async def validate_title_available(
+        self,
+        title: str,
+        industry_id: uuid.UUID,
+        session: AsyncSession,
+        course_id: Optional[uuid.UUID] = None,
+    ) -> None:
+        """Validate that no other course in the industry has this title"""
+        statement = select(Course.id).where(
+            Course.title == title, Course.industry_id == industry_id
+        )
+        if course_id:
+            statement = statement.where(Course.id != course_id)
+        result = await session.exec(statement)
+
+        if result.first():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Course with this title already exists in this industry",
+            )
+
     async def create_course(
         self, course_data: CourseCreateModel, session: AsyncSession
     ) -> CourseDetailResponse:
@@ -100,6 +151,9 @@ class CourseService:
         await self.validate_industry_and_niche(
             course_data.industry_id, course_data.niche_id, session
         )
+        await self.validate_title_available(
+            course_data.title, course_data.industry_id, session
+        )
 
         # Create course
         course = Course(
@@ -149,8 +203,96 @@ class CourseService:
         result = await session.exec(statement)
         course = result.first()
 
+        course_title_index.add(course.id, course.title)
+        await course_cache.invalidate([course.id])
+
         return CourseDetailResponse.model_validate(course)
 
+    async def sync_children(
+        self,
+        session: AsyncSession,
+        model,
+        course_id: uuid.UUID,
+        existing: List,
+        items: Optional[List[BaseModel]],
+        fields: Tuple[str, ...],
+    ) -> List[Dict]:
+        """
+        Make a course's takeaways or resources match `items`, in order.
+
+        Rows whose values are unchanged keep their id (only `order` is rewritten if
+        they moved); remaining rows are updated in place by position; only the
+        surplus is inserted or deleted. Each of update, insert and delete is a
+        single statement. Returns the resulting rows. `items` None leaves the
+        collection untouched.
+        """
+        current = sorted(existing, key=lambda row: row.order)
+        if items is None:
+            return [
+                {"id": row.id, "order": row.order, **{f: getattr(row, f) for f in fields}}
+                for row in current
+            ]
+
+        wanted = [
+            {"order": idx, **{f: getattr(item, f) for f in fields}}
+            for idx, item in enumerate(items)
+        ]
+
+        # Pair identical rows first so reordering does not rewrite content
+        unmatched: Dict[Tuple, List] = {}
+        for row in current:
+            unmatched.setdefault(tuple(getattr(row, f) for f in fields), []).append(row)
+        updates = []
+        pending = []
+        for item in wanted:
+            candidates = unmatched.get(tuple(item[f] for f in fields))
+            if candidates:
+                row = candidates.pop(0)
+                item["id"] = row.id
+                if row.order != item["order"]:
+                    updates.append(item)
+            else:
+                pending.append(item)
+
+        # Then reuse the remaining rows in order for edited values
+        leftovers = [row for rows in unmatched.values() for row in rows]
+        leftovers.sort(key=lambda row: row.order)
+        for item, row in zip(pending, leftovers):
+            item["id"] = row.id
+            updates.append(item)
+        inserts = pending[len(leftovers) :]
+        deletes = [row.id for row in leftovers[len(pending) :]]
+
+        table = model.__table__
+        if updates:
+            columns = ["id", "order", *fields]
+            changes = values(
+                *(column(name, table.c[name].type) for name in columns),
+                name="changes",
+            ).data([tuple(item[name] for name in columns) for item in updates])
+            await session.execute(
+                update(model)
+                .where(model.id == changes.c.id)
+                .values({name: changes.c[name] for name in columns[1:]})
+                .execution_options(synchronize_session=False)
+            )
+        if inserts:
+            for item in inserts:
+                item["id"] = uuid7()
+            await session.execute(
+                insert(model).values(
+                    [{"course_id": course_id, **item} for item in inserts]
+                )
+            )
+        if deletes:
+            await session.execute(
+                delete(model)
+                .where(model.id.in_(deletes))
+                .execution_options(synchronize_session=False)
+            )
+
+        return wanted
+
     async def update_course(
         self,
         course_id: uuid.UUID,
@@ -158,8 +300,23 @@ class CourseService:
         session: AsyncSession,
     ) -> CourseDetailResponse:
         """Update a course and its related data"""
-        # Get and validate course exists
-        course = await self.validate_course_exists(course_id, session)
+        # Get and validate course exists, with its current children
+        statement = (
+            select(Course)
+            .where(Course.id == course_id)
+            .options(
+                selectinload(Course.key_takeaways),
+                selectinload(Course.additional_resources),
+            )
+        )
+        result = await session.exec(statement)
+        course = result.first()
+
+        if not course:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Course not found",
+            )
 
         # Validate industry and niche if they're being updated
         if course_data.industry_id is not None or course_data.niche_id is not None:
@@ -167,6 +324,15 @@ class CourseService:
             niche_id = course_data.niche_id or course.niche_id
             await self.validate_industry_and_niche(industry_id, niche_id, session)
 
+        # Titles are unique within an industry
+        if course_data.title is not None or course_data.industry_id is not None:
+            await self.validate_title_available(
+                course_data.title or course.title,
+                course_data.industry_id or course.industry_id,
+                session,
+                course_id=course.id,
+            )
+
         # Update course fields
         update_dict = course_data.model_dump(
             exclude_unset=True, exclude={"key_takeaways", "additional_resources"}
@@ -175,63 +341,40 @@ class CourseService:
             if hasattr(course, field) and value is not None:
                 setattr(course, field, value)
 
-        # Update key takeaways if provided
-        if course_data.key_takeaways is not None:
-            # Delete existing key takeaways
-            existing_takeaways = select(CourseKeyTakeaway).where(
-                CourseKeyTakeaway.course_id == course_id
-            )
-            result = await session.exec(existing_takeaways)
-            for takeaway in result.all():
-                await session.delete(takeaway)
-
-            # Create new key takeaways
-            for idx, takeaway_data in enumerate(course_data.key_takeaways):
-                takeaway = CourseKeyTakeaway(
-                    course_id=course.id,
-                    content=takeaway_data.content,
-                    order=idx,
-                )
-                session.add(takeaway)
-
-        # Update additional resources if provided
-        if course_data.additional_resources is not None:
-            # Delete existing additional resources
-            existing_resources = select(CourseAdditionalResource).where(
-                CourseAdditionalResource.course_id == course_id
-            )
-            result = await session.exec(existing_resources)
-            for resource in result.all():
-                await session.delete(resource)
-
-            # Create new additional resources
-            for idx, resource_data in enumerate(course_data.additional_resources):
-                resource = CourseAdditionalResource(
-                    course_id=course.id,
-                    title=resource_data.title,
-                    link=resource_data.link,
-                    order=idx,
-                )
-                session.add(resource)
+        # Update key takeaways and additional resources if provided
+        key_takeaways = await self.sync_children(
+            session,
+            CourseKeyTakeaway,
+            course.id,
+            course.key_takeaways,
+            course_data.key_takeaways,
+            ("content",),
+        )
+        additional_resources = await self.sync_children(
+            session,
+            CourseAdditionalResource,
+            course.id,
+            course.additional_resources,
+            course_data.additional_resources,
+            ("title", "link"),
+        )
 
         # Save changes
         session.add(course)
         await session.commit()
-        await session.refresh(course)
 
-        # Fetch course with relationships
-        statement = (
-            select(Course)
-            .where(Course.id == course.id)
-            .options(
-                selectinload(Course.key_takeaways),
-                selectinload(Course.additional_resources),
-            )
-        )
-        result = await session.exec(statement)
-        course = result.first()
+        if course_data.title is not None:
+            course_title_index.add(course.id, course.title)
+        await course_cache.invalidate([course.id])
 
-        return CourseDetailResponse.model_validate(course)
+        # Built from what was written; no refetch
+        return CourseDetailResponse.model_validate(
+            {
+                **course.model_dump(),
+                "key_takeaways": key_takeaways,
+                "additional_resources": additional_resources,
+            }
+        )
 
     async def delete_course(
         self, course_id: uuid.UUID, session: AsyncSession
@@ -241,15 +384,15 @@ class CourseService:
         await session.delete(course)
         await session.commit()
 
+        course_title_index.remove(course_id)
+        await course_cache.invalidate([course_id])
+
         return MessageResponseModel(message="Course deleted successfully")
 
     async def get_course_by_id(
         self, course_id: uuid.UUID, session: AsyncSession
     ) -> CourseDetailResponse:
         """Get a single course by ID"""
-        course = await self.validate_course_exists(course_id, session)
-
-        # Fetch with relationships
         statement = (
             select(Course)
             .where(Course.id == course_id)
@@ -261,8 +404,114 @@ class CourseService:
         result = await session.exec(statement)
         course = result.first()
 
+        if not course:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Course not found",
+            )
+
         return CourseDetailResponse.model_validate(course)
 
+    async def get_course_detail_json(
+        self,
+        course_id: uuid.UUID,
+        version: Optional[ResourceVersion],
+        session: AsyncSession,
+    ) -> bytes:
+        """Serialized course detail, served from the Redis cache when possible"""
+        return await course_cache.detail(
+            course_id, version, lambda: self.get_course_by_id(course_id, session)
+        )
+
+    async def get_courses_by_ids(
+        self, course_ids: List[uuid.UUID], session: AsyncSession
+    ) -> Dict[uuid.UUID, CourseDetailResponse]:
+        """Several courses with takeaways and resources in three queries; unknown ids are skipped"""
+        statement = (
+            select(Course)
+            .where(Course.id.in_(course_ids))
+            .options(
+                selectinload(Course.key_takeaways),
+                selectinload(Course.additional_resources),
+            )
+        )
+        result = await session.exec(statement)
+        return {
+            course.id: CourseDetailResponse.model_validate(course)
+            for course in result.all()
+        }
+
+    async def get_course_batch_json(
+        self,
+        course_ids: List[uuid.UUID],
+        version: Optional[ResourceVersion],
+        session: AsyncSession,
+    ) -> bytes:
+        """JSON array of course details in the requested order, cached entries first"""
+        payloads = await course_cache.details(
+            course_ids,
+            version,
+            lambda missing: self.get_courses_by_ids(missing, session),
+        )
+        found = [payloads[course_id] for course_id in course_ids if course_id in payloads]
+        return b"[" + b",".join(found) + b"]"
+
+    async def get_catalog_page_json(
+        self, session: AsyncSession, version: Optional[ResourceVersion], **params
+    ) -> bytes:
+        """Serialized public course list page, served from the Redis cache when possible"""
+        return await course_cache.catalog_page(
+            params, version, lambda: self.get_courses(session=session, **params)
+        )
+
+    def list_fields(
+        self, fields: Optional[str] = None, view: str = "full"
+    ) -> Tuple[str, ...]:
+        """Columns for a course list from a comma-separated `fields` or a named view"""
+        if not fields:
+            return COMPACT_COURSE_LIST_FIELDS if view == "compact" else COURSE_LIST_FIELDS
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = requested - set(COURSE_LIST_FIELDS)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}. Available: {', '.join(COURSE_LIST_FIELDS)}",
+            )
+        # Canonical order, so equivalent requests share a cache entry
+        return tuple(
+            name for name in COURSE_LIST_FIELDS if name == "id" or name in requested
+        )
+
+    def encode_cursor(self, course: Course) -> str:
+        """Opaque keyset cursor pointing just after `course` in (created_at, id) order"""
+        raw = f"{course.created_at.isoformat()}|{course.id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, cursor: str) -> tuple[datetime, uuid.UUID]:
+        """Inverse of encode_cursor"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            created_at, course_id = raw.split("|")
+            return datetime.fromisoformat(created_at), uuid.UUID(course_id)
+        except (ValueError, UnicodeDecodeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+
+    async def estimate_rows(self, statement, session: AsyncSession) -> int:
+        """Planner row estimate for a statement; plans the query without scanning"""
+        connection = await session.connection()
+        compiled = statement.compile(dialect=connection.dialect)
+        params = tuple(compiled.params[name] for name in compiled.positiontup or [])
+        result = await connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled.string}", params
+        )
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
     async def get_courses(
         self,
         session: AsyncSession,
@@ -273,15 +522,46 @@ class CourseService:
         niche_id: Optional[uuid.UUID] = None,
         user_id: Optional[uuid.UUID] = None,
         filter_type: Optional[str] = None,  # 'favourites' or 'completed'
+        cursor: Optional[str] = None,
+        count: Optional[str] = None,  # 'exact', 'estimate' or 'none'
+        progress_user_id: Optional[uuid.UUID] = None,
+        fields: Sequence[str] = COURSE_LIST_FIELDS,
     ) -> PaginatedCourseResponse:
-        """Get paginated list of courses with filters"""
-        # Build base query
-        statement = select(Course)
+        """
+        Get paginated list of courses with filters.
+
+        Only the columns in `fields` are selected (see list_fields). With
+        progress_user_id each item carries that user's favourite/completed state,
+        from a LEFT JOIN in the same query.
+
+        Without a cursor this is page-based, and the exact total comes from a
+        count(*) over() window in the same query. With a cursor (next_cursor of the
+        previous response) rows are fetched by keyset on (created_at, id), so deep
+        pages cost the same as the first; totals are then only estimated on request.
+        """
+        if count is None:
+            count = "none" if cursor else "exact"
+        if cursor and count == "exact":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Exact totals are returned with the first page; use count=estimate or count=none with a cursor",
+            )
+        if cursor and search:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Search results are ordered by relevance and use page numbers, not cursors",
+            )
+
+        # Build base query; id and created_at are always needed for the cursor
+        statement = select(
+            *(
+                getattr(Course, name)
+                for name in dict.fromkeys(("id", "created_at", *fields))
+            )
+        )
 
         # Apply filters
         filters = []
-        if search:
-            filters.append(Course.title.ilike(f"%{search}%"))
         if industry_id:
             filters.append(Course.industry_id == industry_id)
         if niche_id:
@@ -312,156 +592,522 @@ class CourseService:
                     )
                 )
 
+        if progress_user_id:
+            if not (user_id and filter_type):
+                statement = statement.outerjoin(
+                    UserCourseProgress,
+                    and_(
+                        UserCourseProgress.course_id == Course.id,
+                        UserCourseProgress.user_id == progress_user_id,
+                    ),
+                )
+            # Courses without a progress row are neither favourite nor completed
+            statement = statement.add_columns(
+                func.coalesce(UserCourseProgress.is_favourite, False).label(
+                    "is_favourite"
+                ),
+                func.coalesce(UserCourseProgress.is_completed, False).label(
+                    "is_completed"
+                ),
+                UserCourseProgress.completed_at,
+            )
+
         if filters:
             statement = statement.where(and_(*filters))
+        base_statement = statement
 
-        # Count total
-        count_statement = select(func.count()).select_from(statement.subquery())
-        total_result = await session.exec(count_statement)
-        total = total_result.first()
+        async def fetch(statement, search_rank=None):
+            """One page of rows, plus the window total when counting exactly"""
+            if count == "exact":
+                statement = statement.add_columns(func.count().over().label("total"))
+            if search_rank is not None:
+                # Best matches first when searching
+                statement = statement.order_by(
+                    search_rank.desc(), Course.created_at.desc(), Course.id.desc()
+                )
+            else:
+                statement = statement.order_by(
+                    Course.created_at.desc(), Course.id.desc()
+                )
+            if cursor:
+                # One extra row tells whether there is a next page
+                statement = statement.limit(page_size + 1)
+            else:
+                statement = statement.offset((page - 1) * page_size).limit(page_size)
+            result = await session.execute(statement)
+            return result.all()
 
-        # Apply pagination
-        statement = statement.order_by(Course.created_at.desc())
-        statement = statement.offset((page - 1) * page_size).limit(page_size)
+        if search:
+            # Full-text match on title, summary and key takeaways (GIN indexed)
+            search_query = func.websearch_to_tsquery("english", search)
+            statement = base_statement.where(
+                Course.search_vector.op("@@")(search_query)
+            )
+            rows = await fetch(statement, func.ts_rank(Course.search_vector, search_query))
 
-        # Execute query
-        result = await session.exec(statement)
-        courses = result.all()
+            # An empty later page may just be past the last full-text match; only
+            # fall back when nothing matches at all, so every page pages one set
+            if not rows and not (
+                page > 1 and await session.scalar(select(statement.exists()))
+            ):
+                # Nothing matched, probably a misspelling: fall back to trigram
+                # word similarity on the title (pg_trgm GIN index)
+                statement = base_statement.where(Course.title.op("%>")(search))
+                rows = await fetch(statement, func.word_similarity(search, Course.title))
+            # The set being paged through, which totals are counted on
+            filtered = statement
+        else:
+            filtered = base_statement
+            if cursor:
+                created_at, course_id = self.decode_cursor(cursor)
+                statement = base_statement.where(
+                    tuple_(Course.created_at, Course.id) < tuple_(created_at, course_id)
+                )
+            rows = await fetch(statement)
+
+        total = None
+        if count == "exact":
+            if rows:
+                total = rows[0].total
+            else:
+                # Past the last page the window has no rows to report on
+                total_result = await session.exec(
+                    select(func.count()).select_from(filtered.subquery())
+                )
+                total = total_result.first()
+        elif count == "estimate":
+            total = await self.estimate_rows(filtered, session)
 
-        # Calculate pagination
-        total_pages = (total + page_size - 1) // page_size
+        next_cursor = None
+        if cursor:
+            if len(rows) > page_size:
+                rows = rows[:page_size]
+                next_cursor = self.encode_cursor(rows[-1])
+        elif (
+            not search
+            and len(rows) == page_size
+            # An estimate may be off either way; only an exact total ends paging early
+            and (count != "exact" or page * page_size < total)
+        ):
+            next_cursor = self.encode_cursor(rows[-1])
 
-        return PaginatedCourseResponse(
-            items=[CourseListResponse.model_validate(course) for course in courses],
+        keys = (*fields, *PROGRESS_FIELDS) if progress_user_id else fields
+        items = course_list_adapter.validate_python(
+            [{key: row._mapping[key] for key in keys} for row in rows]
+        )
+
+        # Items are already validated; don't validate them a second time
+        return PaginatedCourseResponse.model_construct(
+            items=items,
             total=total,
-            page=page,
+            total_is_estimate=count == "estimate",
+            page=None if cursor else page,
             page_size=page_size,
-            total_pages=total_pages,
+            total_pages=(
+                (total + page_size - 1) // page_size if total is not None else None
+            ),
+            next_cursor=next_cursor,
+        )
+
+    async def autocomplete_titles(
+        self, query: str, limit: int = 10
+    ) -> List[CourseSuggestion]:
+        """Course title suggestions from this worker's in-memory prefix index"""
+        await course_title_index.ensure_fresh()
+        return [
+            CourseSuggestion(id=course_id, title=title)
+            for course_id, title in course_title_index.suggest(query, limit)
+        ]
+
+    async def get_recommended_courses(
+        self, user_id: uuid.UUID, session: AsyncSession, limit: int = 10
+    ) -> List[CourseListResponse]:
+        """Courses ranked by co-completion with the user's history and their niches"""
+        model = await course_recommender.ensure_fresh()
+
+        completed_result = await session.exec(
+            select(UserCourseProgress.course_id).where(
+                UserCourseProgress.user_id == user_id,
+                UserCourseProgress.is_completed == True,
+            )
+        )
+        niches_result = await session.exec(
+            select(UserNiche.niche_id).where(UserNiche.user_id == user_id)
+        )
+        # A few extra in case some were deleted since the model was refreshed
+        ranked = model.recommend(
+            completed_result.all(), niches_result.all(), limit + 5
         )
+        if not ranked:
+            return []
+
+        result = await session.exec(select(Course).where(Course.id.in_(ranked)))
+        courses = {course.id: course for course in result.all()}
+        return [
+            CourseListResponse.model_validate(courses[course_id])
+            for course_id in ranked
+            if course_id in courses
+        ][:limit]
 
     async def get_recent_courses(
-        self, session: AsyncSession, limit: int = 3
+        self,
+        limit: int = 3,
+        version: Optional[ResourceVersion] = None,
     ) -> List[CourseListResponse]:
-        """Get most recent courses (by created_at)"""
+        """Get most recent courses (by created_at), from this worker's cache when fresh"""
         # Validate limit
         limit = min(limit, 10)  # Max 10
         limit = max(limit, 1)  # Min 1
 
+        return await recent_courses_cache.get_or_load(
+            ("recent", version.tag if version else None, limit),
+            lambda session: self._fetch_recent_courses(session, limit),
+        )
+
+    async def _fetch_recent_courses(
+        self, session: AsyncSession, limit: int
+    ) -> List[CourseListResponse]:
         statement = select(Course).order_by(Course.created_at.desc()).limit(limit)
         result = await session.exec(statement)
         courses = result.all()
 
         return [CourseListResponse.model_validate(course) for course in courses]
 
-    async def toggle_favourite(
-        self, course_id: uuid.UUID, user_id: uuid.UUID, session: AsyncSession
-    ) -> MessageResponseModel:
-        """Toggle favourite status for a course"""
-        # Validate course exists
-        await self.validate_course_exists(course_id, session)
-
-        # Check if progress record exists
-        statement = select(UserCourseProgress).where(
-            and_(
-                UserCourseProgress.course_id == course_id,
-                UserCourseProgress.user_id == user_id,
-            )
+    async def get_popular_courses(
+        self,
+        session: AsyncSession,
+        by: str = "completions",
+        limit: int = 10,
+    ) -> List[PopularCourseResponse]:
+        """Get the most completed or most favourited courses"""
+        counter = (
+            Course.completion_count if by == "completions" else Course.favourite_count
+        )
+        # Backward scan of the (counter, id) index
+        statement = (
+            select(Course).order_by(counter.desc(), Course.id.desc()).limit(limit)
         )
         result = await session.exec(statement)
-        progress = result.first()
+        return [PopularCourseResponse.model_validate(course) for course in result.all()]
 
-        if progress:
-            # Toggle favourite
-            progress.is_favourite = not progress.is_favourite
-            session.add(progress)
-            await session.commit()
+    async def reconcile_engagement_counters(self, session: AsyncSession) -> int:
+        """
+        Recount favourites and completions of every course and fix drifted counters.
 
-            action = "added to" if progress.is_favourite else "removed from"
-        else:
-            # Create new progress record
-            progress = UserCourseProgress(
-                user_id=user_id,
-                course_id=course_id,
-                is_favourite=True,
+        The triggers keep the counters exact; this repairs rows changed while the
+        triggers were disabled (e.g. restores or manual fixes). Progress writes are
+        blocked for the duration so a concurrent toggle can't be overwritten with
+        a stale count. Returns the number of courses corrected.
+        """
+        await session.execute(text("LOCK TABLE user_course_progress IN SHARE MODE"))
+        counts = (
+            select(
+                Course.id.label("course_id"),
+                func.count(UserCourseProgress.id)
+                .filter(UserCourseProgress.is_favourite == True)
+                .label("favourites"),
+                func.count(UserCourseProgress.id)
+                .filter(UserCourseProgress.is_completed == True)
+                .label("completions"),
+            )
+            .select_from(Course)
+            .outerjoin(UserCourseProgress, UserCourseProgress.course_id == Course.id)
+            .group_by(Course.id)
+            .subquery()
+        )
+        result = await session.execute(
+            update(Course)
+            .where(
+                Course.id == counts.c.course_id,
+                or_(
+                    Course.favourite_count != counts.c.favourites,
+                    Course.completion_count != counts.c.completions,
+                ),
             )
-            session.add(progress)
+            .values(
+                favourite_count=counts.c.favourites,
+                completion_count=counts.c.completions,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+        return result.rowcount
+
+    async def upsert_progress(
+        self,
+        course_id: uuid.UUID,
+        user_id: uuid.UUID,
+        insert_values: Dict,
+        update_values: Dict,
+        session: AsyncSession,
+    ):
+        """
+        Create or update the user's progress row in one statement.
+
+        The course foreign key doubles as the existence check; the unique
+        (user_id, course_id) constraint makes concurrent requests safe.
+        """
+        now = datetime.now()
+        statement = pg_insert(UserCourseProgress).values(
+            id=uuid7(),
+            user_id=user_id,
+            course_id=course_id,
+            created_at=now,
+            updated_at=now,
+            **insert_values,
+        )
+        statement = statement.on_conflict_do_update(
+            constraint="unique_user_course",
+            set_={**update_values, "updated_at": statement.excluded.updated_at},
+        ).returning(UserCourseProgress.is_favourite, UserCourseProgress.is_completed)
+        try:
+            result = await session.execute(statement)
+            progress = result.one()
             await session.commit()
-            action = "added to"
+        except IntegrityError as e:
+            await session.rollback()
+            if is_foreign_key_violation(e, "course_id"):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Course not found",
+                )
+            raise
+        return progress
 
+    async def toggle_favourite(
+        self, course_id: uuid.UUID, user_id: uuid.UUID, session: AsyncSession
+    ) -> MessageResponseModel:
+        """Toggle favourite status for a course"""
+        progress = await self.upsert_progress(
+            course_id,
+            user_id,
+            {"is_favourite": True},
+            {"is_favourite": ~UserCourseProgress.is_favourite},
+            session,
+        )
+
+        action = "added to" if progress.is_favourite else "removed from"
         return MessageResponseModel(message=f"Course {action} favourites successfully")
 
     async def mark_completed(
         self, course_id: uuid.UUID, user_id: uuid.UUID, session: AsyncSession
     ) -> MessageResponseModel:
         """Toggle completion status for a course"""
-        # Validate course exists
-        await self.validate_course_exists(course_id, session)
+        now = datetime.now()
+        progress = await self.upsert_progress(
+            course_id,
+            user_id,
+            {"is_completed": True, "completed_at": now, "completion_changed_at": now},
+            {
+                # Column references in the SET clause see the row's old values
+                "is_completed": ~UserCourseProgress.is_completed,
+                "completed_at": case(
+                    (UserCourseProgress.is_completed, None), else_=now
+                ),
+                "completion_changed_at": now,
+            },
+            session,
+        )
 
-        # Check if progress record exists
-        statement = select(UserCourseProgress).where(
-            and_(
-                UserCourseProgress.course_id == course_id,
-                UserCourseProgress.user_id == user_id,
-            )
+        action = (
+            "marked as completed" if progress.is_completed else "marked as incomplete"
         )
-        result = await session.exec(statement)
-        progress = result.first()
+        return MessageResponseModel(message=f"Course {action} successfully")
+
+    async def apply_progress_events(
+        self, events: List[ProgressEvent], user_id: uuid.UUID, session: AsyncSession
+    ) -> ProgressSyncResponse:
+        """
+        Apply a batch of progress events, e.g. activity recorded while offline.
 
-        if progress:
-            # Toggle completion status
-            progress.is_completed = not progress.is_completed
-            if progress.is_completed:
-                progress.completed_at = datetime.now()
+        Events are replayed in occurred_at order and collapsed to the final state
+        per course, then written with at most one upsert per combination of changed
+        fields. Events for courses that no longer exist are skipped and reported.
+        """
+        now = datetime.now()
+        final: Dict[uuid.UUID, Dict] = {}
+        for event in sorted(events, key=lambda event: event.occurred_at or now):
+            state = final.setdefault(event.course_id, {})
+            if event.type in ("favourite", "unfavourite"):
+                state["is_favourite"] = event.type == "favourite"
             else:
-                progress.completed_at = None
-            session.add(progress)
-            await session.commit()
+                state["is_completed"] = event.type == "complete"
+                state["completed_at"] = (
+                    event.occurred_at or now if event.type == "complete" else None
+                )
+                state["completion_changed_at"] = now
 
-            action = (
-                "marked as completed"
-                if progress.is_completed
-                else "marked as incomplete"
+        # Group courses by which fields changed so each group is one statement
+        groups: Dict[Tuple[str, ...], List[uuid.UUID]] = {}
+        for course_id, state in final.items():
+            groups.setdefault(tuple(sorted(state)), []).append(course_id)
+
+        progress: List[CourseProgressState] = []
+        for fields, course_ids in groups.items():
+            columns = ["course_id", *fields]
+            changes = values(
+                *(
+                    column(name, UserCourseProgress.__table__.c[name].type)
+                    for name in columns
+                ),
+                name="changes",
+            ).data(
+                [
+                    (course_id, *(final[course_id][field] for field in fields))
+                    for course_id in course_ids
+                ]
             )
-        else:
-            # Create new progress record
-            progress = UserCourseProgress(
-                user_id=user_id,
-                course_id=course_id,
-                is_completed=True,
-                completed_at=datetime.now(),
-            )
-            session.add(progress)
-            await session.commit()
-            action = "marked as completed"
+            # Joining courses skips deleted courses instead of failing the batch
+            rows = (
+                select(
+                    func.uuid_generate_v7(),
+                    literal(user_id, UserCourseProgress.__table__.c.user_id.type),
+                    changes.c.course_id,
+                    *(changes.c[field] for field in fields),
+                    literal(now),
+                    literal(now),
+                )
+                .select_from(changes)
+                .join(Course, Course.id == changes.c.course_id)
+            )
+            statement = pg_insert(UserCourseProgress).from_select(
+                ["id", "user_id", "course_id", *fields, "created_at", "updated_at"],
+                rows,
+            )
+            statement = statement.on_conflict_do_update(
+                constraint="unique_user_course",
+                set_={
+                    **{field: statement.excluded[field] for field in fields},
+                    "updated_at": statement.excluded.updated_at,
+                },
+            ).returning(
+                UserCourseProgress.course_id,
+                UserCourseProgress.is_favourite,
+                UserCourseProgress.is_completed,
+                UserCourseProgress.completed_at,
+                UserCourseProgress.position_seconds,
+                UserCourseProgress.duration_seconds,
+                UserCourseProgress.last_watched_at,
+            )
+            result = await session.execute(statement)
+            progress.extend(
+                CourseProgressState.model_validate(row._mapping) for row in result.all()
+            )
+        await session.commit()
 
-        return MessageResponseModel(message=f"Course {action} successfully")
+        applied = {state.course_id for state in progress}
+        return ProgressSyncResponse(
+            progress=progress,
+            unknown_course_ids=[
+                course_id for course_id in final if course_id not in applied
+            ],
+        )
+
+    async def get_progress_for_courses(
+        self, course_ids: List[uuid.UUID], user_id: uuid.UUID, session: AsyncSession
+    ) -> List[CourseProgressState]:
+        """
+        User's progress on each existing course in `course_ids`, in one query.
+
+        Playback positions still in the heartbeat buffer take precedence over the
+        stored ones, so a resumed video starts where it was left.
+        """
+        statement = (
+            select(
+                Course.id,
+                func.coalesce(UserCourseProgress.is_favourite, False),
+                func.coalesce(UserCourseProgress.is_completed, False),
+                UserCourseProgress.completed_at,
+                UserCourseProgress.position_seconds,
+                UserCourseProgress.duration_seconds,
+                UserCourseProgress.last_watched_at,
+            )
+            .outerjoin(
+                UserCourseProgress,
+                and_(
+                    UserCourseProgress.course_id == Course.id,
+                    UserCourseProgress.user_id == user_id,
+                ),
+            )
+            .where(Course.id.in_(course_ids))
+        )
+        result = await session.execute(statement)
+        states = {
+            row[0]: CourseProgressState.model_validate(
+                dict(zip(CourseProgressState.model_fields, row))
+            )
+            for row in result.all()
+        }
+        pending = await playback_buffer.pending(user_id, states)
+        for course_id, playback in pending.items():
+            states[course_id].position_seconds = playback.position_seconds
+            states[course_id].duration_seconds = playback.duration_seconds
+            states[course_id].last_watched_at = playback.watched_at
+        # Keep the requested order; unknown courses are left out
+        return [states[course_id] for course_id in dict.fromkeys(course_ids) if course_id in states]
+
+    async def record_playback(
+        self, course_id: uuid.UUID, user_id: uuid.UUID, heartbeat: PlaybackHeartbeat
+    ) -> None:
+        """Buffer a playback heartbeat; written to the database in batches"""
+        try:
+            await playback_buffer.record(
+                user_id, course_id, heartbeat.position_seconds, heartbeat.duration_seconds
+            )
+        except RedisError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Playback tracking is temporarily unavailable",
+            )
+
+    async def get_continue_watching(
+        self, user_id: uuid.UUID, session: AsyncSession, limit: int = 10
+    ) -> List[ContinueWatchingResponse]:
+        """
+        Started but unfinished courses, most recently watched first.
+
+        Reads stored positions only, which trail the heartbeats by at most one
+        flush interval.
+        """
+        statement = (
+            select(
+                Course,
+                UserCourseProgress.position_seconds,
+                UserCourseProgress.duration_seconds,
+                UserCourseProgress.last_watched_at,
+            )
+            .join(UserCourseProgress, UserCourseProgress.course_id == Course.id)
+            .where(
+                UserCourseProgress.user_id == user_id,
+                UserCourseProgress.last_watched_at.is_not(None),
+                UserCourseProgress.is_completed == False,
+            )
+            .order_by(UserCourseProgress.last_watched_at.desc())
+            .limit(limit)
+        )
+        result = await session.execute(statement)
+        return [
+            ContinueWatchingResponse.model_validate(
+                {
+                    **CourseListResponse.model_validate(course).model_dump(),
+                    "position_seconds": position_seconds,
+                    "duration_seconds": duration_seconds,
+                    "last_watched_at": last_watched_at,
+                }
+            )
+            for course, position_seconds, duration_seconds, last_watched_at in result.all()
+        ]
 
     async def get_user_course_progress(
         self, course_id: uuid.UUID, user_id: uuid.UUID, session: AsyncSession
     ) -> Dict:
         """Get user's progress for a specific course"""
-        # Validate course exists
-        await self.validate_course_exists(course_id, session)
+        progress = await self.get_progress_for_courses([course_id], user_id, session)
 
-        # Check if progress record exists
-        statement = select(UserCourseProgress).where(
-            and_(
-                UserCourseProgress.course_id == course_id,
-                UserCourseProgress.user_id == user_id,
+        if not progress:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Course not found",
             )
-        )
-        result = await session.exec(statement)
-        progress = result.first()
 
-        if progress:
-            return {
-                "is_favourite": progress.is_favourite,
-                "is_completed": progress.is_completed,
-                "completed_at": progress.completed_at,
-            }
-        else:
-            return {
-                "is_favourite": False,
-                "is_completed": False,
-                "completed_at": None,
-            }
+        return progress[0].model_dump(exclude={"course_id"})
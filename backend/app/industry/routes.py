@@ -1,9 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
 from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import Optional
 import uuid
 
 from app.core.database import get_session
+from app.core.http_cache import (
+    TAXONOMY_MEMBERS_SCOPE,
+    TAXONOMY_SCOPE,
+    json_response,
+    not_modified,
+    read_version,
+    set_validators,
+)
+from app.course.cache import CATALOG_SCOPE
 from app.auth.dependencies import RoleChecker
 from app.industry.services import IndustryService
 from app.industry.schemas import (
@@ -11,6 +20,9 @@ from app.industry.schemas import (
     IndustryUpdateModel,
     IndustryModel,
     IndustryListResponseModel,
+    IndustryReassignModel,
+    IndustryReassignResponseModel,
+    TaxonomyTreeResponse,
     MessageResponseModel,
 )
 
@@ -30,18 +42,40 @@ admin_only = RoleChecker(["admin"])
     description="Get a list of all industries (public endpoint)",
 )
 async def get_all_industries(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of industries to skip"),
     limit: int = Query(
         100, ge=1, le=1000, description="Number of industries to return"
     ),
-    session: AsyncSession = Depends(get_session),
 ):
     """Get all industries with pagination (public endpoint)"""
+    version = await read_version(TAXONOMY_SCOPE)
+    if unchanged := not_modified(request, version):
+        return unchanged
+    set_validators(response, version)
     return await industry_service.get_all_industries(
-        session=session, skip=skip, limit=limit
+        skip=skip, limit=limit, version=version
     )
 
 
+@industry_router.get(
+    "/tree",
+    response_model=TaxonomyTreeResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get the industry and niche tree",
+    description="Get every industry with its niches, course counts and user counts in one response (public endpoint)",
+)
+async def get_taxonomy_tree(request: Request):
+    """Get the industry -> niche tree with course and user counts (public endpoint)"""
+    # Changes with the taxonomy, with any course and with users' choices
+    version = await read_version(TAXONOMY_SCOPE, TAXONOMY_MEMBERS_SCOPE, CATALOG_SCOPE)
+    if unchanged := not_modified(request, version):
+        return unchanged
+    payload = await industry_service.get_taxonomy_tree_json(version)
+    return json_response(payload, version)
+
+
 @industry_router.get(
     "/{industry_id}",
     response_model=IndustryModel,
@@ -51,9 +85,15 @@ async def get_all_industries(
 )
 async def get_industry_by_id(
     industry_id: uuid.UUID,
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_session),
 ):
     """Get industry by ID (public endpoint)"""
+    version = await read_version(TAXONOMY_SCOPE)
+    if unchanged := not_modified(request, version):
+        return unchanged
+    set_validators(response, version)
     industry = await industry_service.get_industry_by_id(industry_id, session)
     if not industry:
         raise HTTPException(
@@ -110,3 +150,22 @@ async def delete_industry(
 ):
     """Delete an industry (admin only)"""
     return await industry_service.delete_industry(industry_id, session)
+
+
+@industry_router.post(
+    "/{industry_id}/reassign-and-delete",
+    response_model=IndustryReassignResponseModel,
+    status_code=status.HTTP_200_OK,
+    summary="Reassign and delete industry",
+    description="Move an industry's niches, courses and users to another industry, then delete it (admin only)",
+)
+async def reassign_and_delete_industry(
+    industry_id: uuid.UUID,
+    reassign_data: IndustryReassignModel,
+    _: bool = Depends(admin_only),
+    session: AsyncSession = Depends(get_session),
+):
+    """Reassign an industry's niches, courses and users, then delete it (admin only)"""
+    return await industry_service.reassign_and_delete_industry(
+        industry_id, reassign_data, session
+    )
@@ -21,6 +21,14 @@ class IndustryUpdateModel(BaseModel):
     )
 
 
+class IndustryReassignModel(BaseModel):
+    """Schema for moving an industry's niches, courses and users before deleting it"""
+
+    target_industry_id: uuid.UUID = Field(
+        description="Industry that receives the niches, courses and users"
+    )
+
+
 # ==================== RESPONSE SCHEMAS ====================
 
 
@@ -43,6 +51,40 @@ class IndustryListResponseModel(BaseModel):
     total: int
 
 
+class NicheTreeNode(BaseModel):
+    """Schema for a niche in the taxonomy tree"""
+
+    id: uuid.UUID
+    name: str
+    course_count: int
+    user_count: int
+
+
+class IndustryTreeNode(BaseModel):
+    """Schema for an industry and its niches in the taxonomy tree"""
+
+    id: uuid.UUID
+    name: str
+    course_count: int
+    user_count: int
+    niches: List[NicheTreeNode]
+
+
+class TaxonomyTreeResponse(BaseModel):
+    """Schema for the whole industry -> niche tree"""
+
+    industries: List[IndustryTreeNode]
+
+
+class IndustryReassignResponseModel(BaseModel):
+    """Schema for the result of reassigning and deleting an industry"""
+
+    message: str
+    niches_moved: int
+    courses_moved: int
+    users_moved: int
+
+
 class MessageResponseModel(BaseModel):
     """Schema for simple message responses"""
 
@@ -1,15 +1,36 @@
 import uuid
+from datetime import datetime
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select
+from sqlalchemy import delete, exists, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import func, select
 from typing import List, Optional
 from fastapi import HTTPException, status
 
+from app.core.database import is_unique_violation
+from app.core.http_cache import (
+    TAXONOMY_MEMBERS_SCOPE,
+    TAXONOMY_SCOPE,
+    ResourceVersion,
+    bump_versions,
+)
+from app.core.ttl_cache import taxonomy_cache
+from app.course.cache import course_cache
+from app.models.course import Course
 from app.models.industry import Industry
+from app.models.niche import Niche
+from app.models.user import User
+from app.models.user_niche import UserNiche
 from app.industry.schemas import (
     IndustryCreateModel,
     IndustryUpdateModel,
     IndustryModel,
     IndustryListResponseModel,
+    IndustryReassignModel,
+    IndustryReassignResponseModel,
+    IndustryTreeNode,
+    NicheTreeNode,
+    TaxonomyTreeResponse,
     MessageResponseModel,
 )
 
@@ -27,11 +48,19 @@ class IndustryService:
 
     async def get_all_industries(
         self,
-        session: AsyncSession,
         skip: int = 0,
         limit: int = 100,
+        version: Optional[ResourceVersion] = None,
+    ) -> IndustryListResponseModel:
+        """Get all industries with pagination, from this worker's cache when fresh"""
+        return await taxonomy_cache.get_or_load(
+            ("industries", version.tag if version else None, skip, limit),
+            lambda session: self._fetch_industries(session, skip, limit),
+        )
+
+    async def _fetch_industries(
+        self, session: AsyncSession, skip: int, limit: int
     ) -> IndustryListResponseModel:
-        """Get all industries with pagination"""
 
         # Build query
         statement = select(Industry)
@@ -44,9 +73,9 @@ class IndustryService:
         industries = result.all()
 
         # Get total count
-        count_statement = select(Industry)
+        count_statement = select(func.count(Industry.id))
         count_result = await session.exec(count_statement)
-        total = len(count_result.all())
+        total = count_result.one()
 
         # Convert to response models
         industry_models = [
@@ -55,6 +84,93 @@ class IndustryService:
 
         return IndustryListResponseModel(industries=industry_models, total=total)
 
+    async def get_taxonomy_tree_json(
+        self, version: Optional[ResourceVersion] = None
+    ) -> bytes:
+        """Serialized taxonomy tree, from this worker's cache when fresh"""
+        return await taxonomy_cache.get_or_load(
+            ("tree", version.tag if version else None),
+            self._fetch_taxonomy_tree_json,
+        )
+
+    async def _fetch_taxonomy_tree_json(self, session: AsyncSession) -> bytes:
+        """
+        Every industry with its niches, course counts and user counts.
+
+        One statement: each count is a grouped derived table joined to the
+        industry -> niche rows, so no table is scanned more than once.
+        """
+        industry_courses = (
+            select(Course.industry_id, func.count().label("count"))
+            .group_by(Course.industry_id)
+            .subquery()
+        )
+        niche_courses = (
+            select(Course.niche_id, func.count().label("count"))
+            .group_by(Course.niche_id)
+            .subquery()
+        )
+        industry_users = (
+            select(User.industry_id, func.count().label("count"))
+            .where(User.industry_id.is_not(None))
+            .group_by(User.industry_id)
+            .subquery()
+        )
+        niche_users = (
+            select(
+                UserNiche.niche_id,
+                func.count(func.distinct(UserNiche.user_id)).label("count"),
+            )
+            .group_by(UserNiche.niche_id)
+            .subquery()
+        )
+        statement = (
+            select(
+                Industry.id,
+                Industry.name,
+                func.coalesce(industry_courses.c.count, 0),
+                func.coalesce(industry_users.c.count, 0),
+                Niche.id,
+                Niche.name,
+                func.coalesce(niche_courses.c.count, 0),
+                func.coalesce(niche_users.c.count, 0),
+            )
+            .select_from(Industry)
+            .outerjoin(Niche, Niche.industry_id == Industry.id)
+            .outerjoin(industry_courses, industry_courses.c.industry_id == Industry.id)
+            .outerjoin(industry_users, industry_users.c.industry_id == Industry.id)
+            .outerjoin(niche_courses, niche_courses.c.niche_id == Niche.id)
+            .outerjoin(niche_users, niche_users.c.niche_id == Niche.id)
+            .order_by(Industry.name, Niche.name)
+        )
+        result = await session.execute(statement)
+
+        industries = {}
+        for row in result.all():
+            industry_id, name, course_count, user_count, niche_id = row[:5]
+            industry = industries.get(industry_id)
+            if industry is None:
+                industry = industries[industry_id] = IndustryTreeNode(
+                    id=industry_id,
+                    name=name,
+                    course_count=course_count,
+                    user_count=user_count,
+                    niches=[],
+                )
+            if niche_id is not None:
+                niche_name, niche_course_count, niche_user_count = row[5:]
+                industry.niches.append(
+                    NicheTreeNode(
+                        id=niche_id,
+                        name=niche_name,
+                        course_count=niche_course_count,
+                        user_count=niche_user_count,
+                    )
+                )
+
+        tree = TaxonomyTreeResponse(industries=list(industries.values()))
+        return tree.model_dump_json().encode()
+
     async def create_industry(
         self, industry_data: IndustryCreateModel, session: AsyncSession
     ) -> IndustryModel:
@@ -79,6 +195,8 @@ class IndustryService:
         session.add(new_industry)
         await session.commit()
         await session.refresh(new_industry)
+        await bump_versions(TAXONOMY_SCOPE)
+        taxonomy_cache.invalidate()
 
         return IndustryModel.model_validate(new_industry)
 
@@ -122,6 +240,8 @@ class IndustryService:
         session.add(industry)
         await session.commit()
         await session.refresh(industry)
+        await bump_versions(TAXONOMY_SCOPE)
+        taxonomy_cache.invalidate()
 
         return IndustryModel.model_validate(industry)
 
@@ -130,41 +250,116 @@ class IndustryService:
     ) -> MessageResponseModel:
         """Delete an industry (hard delete)"""
 
-        # Get industry
-        industry = await self.get_industry_by_id(industry_id, session)
-        if not industry:
+        # Check the industry and its dependents in one round trip; the row lock
+        # keeps niches and users from being attached until the delete commits
+        statement = (
+            select(
+                Industry.id,
+                exists().where(Niche.industry_id == Industry.id),
+                exists().where(User.industry_id == Industry.id),
+            )
+            .where(Industry.id == industry_id)
+            .with_for_update(of=Industry)
+        )
+        result = await session.execute(statement)
+        row = result.first()
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Industry not found"
             )
 
-        # Check if industry has associated niches
-        from app.models.niche import Niche
-
-        niches_statement = select(Niche).where(Niche.industry_id == industry_id)
-        niches_result = await session.exec(niches_statement)
-        niches = niches_result.all()
-
-        if niches:
+        _, has_niches, has_users = row
+        if has_niches:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Cannot delete industry that has associated niches. Please delete or reassign niches first.",
             )
 
-        # Check if industry has associated users
-        from app.models.user import User
-
-        users_statement = select(User).where(User.industry_id == industry_id)
-        users_result = await session.exec(users_statement)
-        users = users_result.all()
-
-        if users:
+        if has_users:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Cannot delete industry that has associated users. Please reassign users first.",
             )
 
         # Hard delete the industry
-        await session.delete(industry)
+        await session.execute(delete(Industry).where(Industry.id == industry_id))
         await session.commit()
+        await bump_versions(TAXONOMY_SCOPE)
+        taxonomy_cache.invalidate()
 
         return MessageResponseModel(message="Industry deleted successfully")
+
+    async def reassign_and_delete_industry(
+        self,
+        industry_id: uuid.UUID,
+        reassign_data: IndustryReassignModel,
+        session: AsyncSession,
+    ) -> IndustryReassignResponseModel:
+        """Move an industry's niches, courses and users to another industry, then delete it"""
+        target_id = reassign_data.target_industry_id
+        if target_id == industry_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Target industry must be different from the industry being deleted",
+            )
+
+        # Lock both industries (in id order) so nothing is attached to the one
+        # being deleted, or the target deleted, while the rows move
+        statement = (
+            select(Industry.id)
+            .where(Industry.id.in_([industry_id, target_id]))
+            .order_by(Industry.id)
+            .with_for_update()
+        )
+        result = await session.execute(statement)
+        found = set(result.scalars().all())
+        if industry_id not in found:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Industry not found"
+            )
+        if target_id not in found:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Target industry not found"
+            )
+
+        now = datetime.now()
+        try:
+            niches_result = await session.execute(
+                update(Niche)
+                .where(Niche.industry_id == industry_id)
+                .values(industry_id=target_id, updated_at=now)
+            )
+            courses_result = await session.execute(
+                update(Course)
+                .where(Course.industry_id == industry_id)
+                .values(industry_id=target_id, updated_at=now)
+                .returning(Course.id)
+            )
+            course_ids = courses_result.scalars().all()
+            users_result = await session.execute(
+                update(User)
+                .where(User.industry_id == industry_id)
+                .values(industry_id=target_id, updated_at=now)
+            )
+            await session.execute(delete(Industry).where(Industry.id == industry_id))
+            await session.commit()
+        except IntegrityError as e:
+            await session.rollback()
+            if is_unique_violation(e, "unique_course_title_industry"):
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="The target industry already has a course with the same title as one being moved",
+                )
+            raise
+
+        await bump_versions(TAXONOMY_SCOPE, TAXONOMY_MEMBERS_SCOPE)
+        taxonomy_cache.invalidate()
+        if course_ids:
+            await course_cache.invalidate(course_ids)
+
+        return IndustryReassignResponseModel(
+            message="Industry reassigned and deleted successfully",
+            niches_moved=niches_result.rowcount,
+            courses_moved=len(course_ids),
+            users_moved=users_result.rowcount,
+        )
@@ -2,21 +2,25 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.metrics import metrics_response
+from app.core.database import async_engine, POOL_SIZE, MAX_OVERFLOW
 from app.auth.routes import auth_router
 from app.user_profile.routes import user_profile_router
 from app.industry.routes import industry_router
 from app.niche.routes import niche_router
 from app.course.routes import course_router
-from app.ai_chat.routes import ai_chat_router
+from app.course.playback import playback_buffer
+from app.ai_chat.routes import ai_chat_router, contract_analyzer
 from app.admin.routes import admin_router
 
 
 @asynccontextmanager
 async def life_span(app: FastAPI):
     print(f"Server is starting ...")
-    await init_db()
+    # The schema is managed by Alembic (triggers included), not create_all
+    playback_buffer.start()
     yield
+    await playback_buffer.stop()
     print(f"Server has been stopped ...")
 
 
@@ -25,6 +29,7 @@ app = FastAPI(
     title=settings.APP_NAME,
     version=settings.VERSION,
     debug=settings.DEBUG,
+    lifespan=life_span,
 )
 
 # Add CORS middleware
@@ -54,3 +59,28 @@ def read_root():
         "version": settings.VERSION,
         "docs": "/docs",
     }
+
+
+@app.get("/health/pool")
+def pool_health():
+    """Database pool and Groq rate limiter usage of this worker (sampled by loadtest.run)"""
+    pool = async_engine.pool
+    return {
+        "database_pool": {
+            "size": POOL_SIZE,
+            "max_overflow": MAX_OVERFLOW,
+            "capacity": POOL_SIZE + MAX_OVERFLOW,
+            "checked_out": pool.checkedout(),
+            "overflow": max(0, pool.overflow()),
+        },
+        "groq_rate_limiter": {
+            "tokens_per_minute": contract_analyzer.rate_limiter.capacity,
+            "tokens_in_window": contract_analyzer.rate_limiter.tokens_in_window,
+        },
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus metrics of this worker"""
+    return metrics_response()
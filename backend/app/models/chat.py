@@ -1,12 +1,14 @@
 import uuid
 from sqlmodel import Column, SQLModel, Field
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 import sqlalchemy.dialects.postgresql as pg
 from sqlmodel import Relationship
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, text
 from typing import TYPE_CHECKING
 
+from app.core.ids import uuid7
+
 if TYPE_CHECKING:
     from app.models.user import User
 
@@ -21,7 +23,8 @@ class Chat(SQLModel, table=True):
             pg.UUID,
             nullable=False,
             primary_key=True,
-            default=uuid.uuid4,
+            default=uuid7,
+            server_default=text("uuid_generate_v7()"),
         )
     )
     user_id: uuid.UUID = Field(
@@ -41,6 +44,9 @@ class Chat(SQLModel, table=True):
     contract_excerpt: Optional[str] = Field(
         default=None, sa_column=Column(pg.TEXT, nullable=True)
     )
+    clause_findings: Optional[Dict[str, str]] = Field(
+        default=None, sa_column=Column(pg.JSONB, nullable=True)
+    )  # Per-clause findings keyed by clause hash, reused when a revised contract is uploaded
     created_at: datetime = Field(
         sa_column=Column(pg.TIMESTAMP, nullable=False, default=datetime.utcnow)
     )
@@ -74,7 +80,8 @@ class ChatMessage(SQLModel, table=True):
             pg.UUID,
             nullable=False,
             primary_key=True,
-            default=uuid.uuid4,
+            default=uuid7,
+            server_default=text("uuid_generate_v7()"),
         )
     )
     chat_id: uuid.UUID = Field(
@@ -92,6 +99,21 @@ class ChatMessage(SQLModel, table=True):
     reasoning: Optional[str] = Field(
         default=None, sa_column=Column(pg.TEXT, nullable=True)
     )  # Optional reasoning for assistant messages
+    model: Optional[str] = Field(
+        default=None, sa_column=Column(pg.VARCHAR, nullable=True)
+    )  # LLM that produced an assistant message
+    prompt_tokens: Optional[int] = Field(
+        default=None, sa_column=Column(pg.INTEGER, nullable=True)
+    )
+    completion_tokens: Optional[int] = Field(
+        default=None, sa_column=Column(pg.INTEGER, nullable=True)
+    )
+    latency_ms: Optional[int] = Field(
+        default=None, sa_column=Column(pg.INTEGER, nullable=True)
+    )
+    telemetry: Optional[Dict[str, Any]] = Field(
+        default=None, sa_column=Column(pg.JSONB, nullable=True)
+    )  # Per-stage timings, cache/truncation/fallback flags and cost estimate
     created_at: datetime = Field(
         sa_column=Column(pg.TIMESTAMP, nullable=False, default=datetime.utcnow)
     )
@@ -4,9 +4,11 @@ from typing import List, Optional
 from datetime import datetime
 import sqlalchemy.dialects.postgresql as pg
 from sqlmodel import Relationship
-from sqlalchemy import ForeignKey, UniqueConstraint
+from sqlalchemy import ForeignKey, Index, UniqueConstraint, text
 from typing import TYPE_CHECKING
 
+from app.core.ids import uuid7
+
 if TYPE_CHECKING:
     from app.models.industry import Industry
     from app.models.niche import Niche
@@ -18,12 +20,32 @@ class Course(SQLModel, table=True):
 
     __tablename__ = "courses"
 
+    __table_args__ = (
+        Index("ix_courses_search_vector", "search_vector", postgresql_using="gin"),
+        # Typo-tolerant title search (requires the pg_trgm extension)
+        Index(
+            "ix_courses_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        # Keyset pagination of the newest-first listings
+        Index("ix_courses_created_at_id", "created_at", "id"),
+        Index("ix_courses_industry_id_created_at_id", "industry_id", "created_at", "id"),
+        Index("ix_courses_niche_id_created_at_id", "niche_id", "created_at", "id"),
+        # Most popular courses, read in reverse
+        Index("ix_courses_completion_count_id", "completion_count", "id"),
+        Index("ix_courses_favourite_count_id", "favourite_count", "id"),
+        # Upsert key of the bulk import
+        UniqueConstraint("title", "industry_id", name="unique_course_title_industry"),
+    )
+
     id: uuid.UUID = Field(
         sa_column=Column(
             pg.UUID,
             nullable=False,
             primary_key=True,
-            default=uuid.uuid4,
+            default=uuid7,
         )
     )
     title: str = Field(sa_column=Column(pg.VARCHAR, nullable=False, index=True))
@@ -42,6 +64,17 @@ class Course(SQLModel, table=True):
     source: Optional[str] = Field(
         default=None, sa_column=Column(pg.VARCHAR, nullable=True)
     )
+    search_vector: Optional[str] = Field(
+        default=None, sa_column=Column(pg.TSVECTOR, nullable=True)
+    )  # Title, summary and key takeaways; maintained by database triggers
+    favourite_count: int = Field(
+        default=0,
+        sa_column=Column(pg.INTEGER, nullable=False, server_default="0"),
+    )  # Users who favourited the course; maintained by database triggers
+    completion_count: int = Field(
+        default=0,
+        sa_column=Column(pg.INTEGER, nullable=False, server_default="0"),
+    )  # Users who completed the course; maintained by database triggers
     created_at: datetime = Field(
         sa_column=Column(pg.TIMESTAMP, nullable=False, default=datetime.now)
     )
@@ -84,7 +117,7 @@ class CourseKeyTakeaway(SQLModel, table=True):
             pg.UUID,
             nullable=False,
             primary_key=True,
-            default=uuid.uuid4,
+            default=uuid7,
         )
     )
     course_id: uuid.UUID = Field(
@@ -112,7 +145,7 @@ class CourseAdditionalResource(SQLModel, table=True):
             pg.UUID,
             nullable=False,
             primary_key=True,
-            default=uuid.uuid4,
+            default=uuid7,
         )
     )
     course_id: uuid.UUID = Field(
@@ -138,6 +171,12 @@ class UserCourseProgress(SQLModel, table=True):
 
     __table_args__ = (
         UniqueConstraint("user_id", "course_id", name="unique_user_course"),
+        # "Continue watching": the user's most recently watched courses
+        Index(
+            "ix_user_course_progress_user_id_last_watched_at",
+            "user_id",
+            "last_watched_at",
+        ),
     )
 
     id: uuid.UUID = Field(
@@ -145,7 +184,8 @@ class UserCourseProgress(SQLModel, table=True):
             pg.UUID,
             nullable=False,
             primary_key=True,
-            default=uuid.uuid4,
+            default=uuid7,
+            server_default=text("uuid_generate_v7()"),
         )
     )
     user_id: uuid.UUID = Field(
@@ -173,6 +213,21 @@ class UserCourseProgress(SQLModel, table=True):
     completed_at: Optional[datetime] = Field(
         default=None, sa_column=Column(pg.TIMESTAMP, nullable=True)
     )
+    # When is_completed last changed; the recommender refreshes users changed since
+    # its last run (updated_at also moves with every playback heartbeat)
+    completion_changed_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(pg.TIMESTAMP, nullable=True, index=True)
+    )
+    # Video playback, written in batches from the heartbeat buffer
+    position_seconds: Optional[int] = Field(
+        default=None, sa_column=Column(pg.INTEGER, nullable=True)
+    )
+    duration_seconds: Optional[int] = Field(
+        default=None, sa_column=Column(pg.INTEGER, nullable=True)
+    )
+    last_watched_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(pg.TIMESTAMP, nullable=True)
+    )
     created_at: datetime = Field(
         sa_column=Column(pg.TIMESTAMP, nullable=False, default=datetime.now)
     )
@@ -7,6 +7,8 @@ from sqlmodel import Relationship
 from sqlalchemy import ForeignKey
 from typing import TYPE_CHECKING
 
+from app.core.ids import uuid7
+
 if TYPE_CHECKING:
     from app.models.niche import Niche
     from app.models.user import User
@@ -21,7 +23,7 @@ class Industry(SQLModel, table=True):
             pg.UUID,
             nullable=False,
             primary_key=True,
-            default=uuid.uuid4,
+            default=uuid7,
         )
     )
     name: str = Field(
@@ -7,6 +7,8 @@ from sqlmodel import Relationship
 from sqlalchemy import ForeignKey
 from typing import TYPE_CHECKING
 
+from app.core.ids import uuid7
+
 if TYPE_CHECKING:
     from app.models.industry import Industry
     from app.models.user_niche import UserNiche
@@ -24,7 +26,7 @@ class User(SQLModel, table=True):
             pg.UUID,
             nullable=False,
             primary_key=True,
-            default=uuid.uuid4,
+            default=uuid7,
         )
     )
     email: str = Field(
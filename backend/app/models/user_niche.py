@@ -4,9 +4,11 @@ from typing import Optional
 from datetime import datetime
 import sqlalchemy.dialects.postgresql as pg
 from sqlmodel import Relationship
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, UniqueConstraint
 from typing import TYPE_CHECKING
 
+from app.core.ids import uuid7
+
 if TYPE_CHECKING:
     from app.models.user import User
     from app.models.niche import Niche
@@ -15,12 +17,14 @@ if TYPE_CHECKING:
 class UserNiche(SQLModel, table=True):
     __tablename__ = "user_niches"
 
+    __table_args__ = (UniqueConstraint("user_id", "niche_id", name="unique_user_niche"),)
+
     id: uuid.UUID = Field(
         sa_column=Column(
             pg.UUID,
             nullable=False,
             primary_key=True,
-            default=uuid.uuid4,
+            default=uuid7,
         )
     )
     user_id: uuid.UUID = Field(
@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
 from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import Optional
 import uuid
 
 from app.core.database import get_session
+from app.core.http_cache import (
+    TAXONOMY_SCOPE,
+    not_modified,
+    read_version,
+    set_validators,
+)
 from app.auth.dependencies import RoleChecker
 from app.niche.services import NicheService
 from app.niche.schemas import (
@@ -11,6 +17,8 @@ from app.niche.schemas import (
     NicheUpdateModel,
     NicheModel,
     NicheListResponseModel,
+    NicheReassignModel,
+    NicheReassignResponseModel,
     MessageResponseModel,
 )
 
@@ -30,16 +38,24 @@ admin_only = RoleChecker(["admin"])
     description="Get a list of all niches with optional industry filtering (public endpoint)",
 )
 async def get_all_niches(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of niches to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of niches to return"),
     industry_id: Optional[uuid.UUID] = Query(
         None, description="Filter niches by industry ID"
     ),
-    session: AsyncSession = Depends(get_session),
 ):
     """Get all niches with pagination and optional industry filtering (public endpoint)"""
+    version = await read_version(TAXONOMY_SCOPE)
+    if unchanged := not_modified(request, version):
+        return unchanged
+    set_validators(response, version)
     return await niche_service.get_all_niches(
-        session=session, skip=skip, limit=limit, industry_id=industry_id
+        skip=skip,
+        limit=limit,
+        industry_id=industry_id,
+        version=version,
     )
 
 
@@ -52,13 +68,21 @@ async def get_all_niches(
 )
 async def get_niches_by_industry(
     industry_id: uuid.UUID,
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of niches to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of niches to return"),
-    session: AsyncSession = Depends(get_session),
 ):
     """Get all niches for a specific industry (public endpoint)"""
+    version = await read_version(TAXONOMY_SCOPE)
+    if unchanged := not_modified(request, version):
+        return unchanged
+    set_validators(response, version)
     return await niche_service.get_niches_by_industry(
-        industry_id=industry_id, session=session, skip=skip, limit=limit
+        industry_id=industry_id,
+        skip=skip,
+        limit=limit,
+        version=version,
     )
 
 
@@ -71,9 +95,15 @@ async def get_niches_by_industry(
 )
 async def get_niche_by_id(
     niche_id: uuid.UUID,
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_session),
 ):
     """Get niche by ID (public endpoint)"""
+    version = await read_version(TAXONOMY_SCOPE)
+    if unchanged := not_modified(request, version):
+        return unchanged
+    set_validators(response, version)
     niche = await niche_service.get_niche_by_id(niche_id, session)
     if not niche:
         raise HTTPException(
@@ -130,3 +160,22 @@ async def delete_niche(
 ):
     """Delete a niche (admin only)"""
     return await niche_service.delete_niche(niche_id, session)
+
+
+@niche_router.post(
+    "/{niche_id}/reassign-and-delete",
+    response_model=NicheReassignResponseModel,
+    status_code=status.HTTP_200_OK,
+    summary="Reassign and delete niche",
+    description="Move a niche's courses and users to another niche of the same industry, then delete it (admin only)",
+)
+async def reassign_and_delete_niche(
+    niche_id: uuid.UUID,
+    reassign_data: NicheReassignModel,
+    _: bool = Depends(admin_only),
+    session: AsyncSession = Depends(get_session),
+):
+    """Reassign a niche's courses and users, then delete it (admin only)"""
+    return await niche_service.reassign_and_delete_niche(
+        niche_id, reassign_data, session
+    )
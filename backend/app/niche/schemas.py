@@ -23,6 +23,14 @@ class NicheUpdateModel(BaseModel):
     )
 
 
+class NicheReassignModel(BaseModel):
+    """Schema for moving a niche's courses and users before deleting it"""
+
+    target_niche_id: uuid.UUID = Field(
+        description="Niche of the same industry that receives the courses and users"
+    )
+
+
 # ==================== RESPONSE SCHEMAS ====================
 
 
@@ -46,6 +54,14 @@ class NicheListResponseModel(BaseModel):
     total: int
 
 
+class NicheReassignResponseModel(BaseModel):
+    """Schema for the result of reassigning and deleting a niche"""
+
+    message: str
+    courses_moved: int
+    users_moved: int
+
+
 class MessageResponseModel(BaseModel):
     """Schema for simple message responses"""
 
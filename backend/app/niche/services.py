@@ -1,16 +1,31 @@
 import uuid
+from datetime import datetime
+from sqlalchemy import delete, exists, literal, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select
+from sqlmodel import func, select
 from typing import List, Optional
 from fastapi import HTTPException, status
 
+from app.core.http_cache import (
+    TAXONOMY_MEMBERS_SCOPE,
+    TAXONOMY_SCOPE,
+    ResourceVersion,
+    bump_versions,
+)
+from app.core.ttl_cache import taxonomy_cache
+from app.course.cache import course_cache
+from app.models.course import Course
 from app.models.niche import Niche
 from app.models.industry import Industry
+from app.models.user_niche import UserNiche
 from app.niche.schemas import (
     NicheCreateModel,
     NicheUpdateModel,
     NicheModel,
     NicheListResponseModel,
+    NicheReassignModel,
+    NicheReassignResponseModel,
     MessageResponseModel,
 )
 
@@ -28,12 +43,24 @@ class NicheService:
 
     async def get_all_niches(
         self,
-        session: AsyncSession,
         skip: int = 0,
         limit: int = 100,
         industry_id: Optional[uuid.UUID] = None,
+        version: Optional[ResourceVersion] = None,
+    ) -> NicheListResponseModel:
+        """Get all niches with pagination and optional industry filter, cached per worker"""
+        return await taxonomy_cache.get_or_load(
+            ("niches", version.tag if version else None, skip, limit, industry_id),
+            lambda session: self._fetch_niches(session, skip, limit, industry_id),
+        )
+
+    async def _fetch_niches(
+        self,
+        session: AsyncSession,
+        skip: int,
+        limit: int,
+        industry_id: Optional[uuid.UUID],
     ) -> NicheListResponseModel:
-        """Get all niches with pagination and optional industry filtering"""
 
         # Build query
         statement = select(Niche)
@@ -50,12 +77,12 @@ class NicheService:
         niches = result.all()
 
         # Get total count
-        count_statement = select(Niche)
+        count_statement = select(func.count(Niche.id))
         if industry_id:
             count_statement = count_statement.where(Niche.industry_id == industry_id)
 
         count_result = await session.exec(count_statement)
-        total = len(count_result.all())
+        total = count_result.one()
 
         # Convert to response models
         niche_models = [NicheModel.model_validate(niche) for niche in niches]
@@ -65,11 +92,27 @@ class NicheService:
     async def get_niches_by_industry(
         self,
         industry_id: uuid.UUID,
-        session: AsyncSession,
         skip: int = 0,
         limit: int = 100,
+        version: Optional[ResourceVersion] = None,
+    ) -> NicheListResponseModel:
+        """Get all niches for a specific industry, cached per worker"""
+        return await taxonomy_cache.get_or_load(
+            (
+                "industry_niches",
+                version.tag if version else None,
+                industry_id,
+                skip,
+                limit,
+            ),
+            lambda session: self._fetch_niches_by_industry(
+                industry_id, session, skip, limit
+            ),
+        )
+
+    async def _fetch_niches_by_industry(
+        self, industry_id: uuid.UUID, session: AsyncSession, skip: int, limit: int
     ) -> NicheListResponseModel:
-        """Get all niches for a specific industry"""
 
         # Validate industry exists
         industry_statement = select(Industry).where(Industry.id == industry_id)
@@ -81,9 +124,7 @@ class NicheService:
                 status_code=status.HTTP_404_NOT_FOUND, detail="Industry not found"
             )
 
-        return await self.get_all_niches(
-            session=session, skip=skip, limit=limit, industry_id=industry_id
-        )
+        return await self._fetch_niches(session, skip, limit, industry_id)
 
     async def create_niche(
         self, niche_data: NicheCreateModel, session: AsyncSession
@@ -124,6 +165,8 @@ class NicheService:
         session.add(new_niche)
         await session.commit()
         await session.refresh(new_niche)
+        await bump_versions(TAXONOMY_SCOPE)
+        taxonomy_cache.invalidate()
 
         return NicheModel.model_validate(new_niche)
 
@@ -183,6 +226,8 @@ class NicheService:
         session.add(niche)
         await session.commit()
         await session.refresh(niche)
+        await bump_versions(TAXONOMY_SCOPE)
+        taxonomy_cache.invalidate()
 
         return NicheModel.model_validate(niche)
 
@@ -191,28 +236,116 @@ class NicheService:
     ) -> MessageResponseModel:
         """Delete a niche (hard delete)"""
 
-        # Get niche
-        niche = await self.get_niche_by_id(niche_id, session)
-        if not niche:
+        # Check the niche and its members in one round trip; the row lock keeps
+        # users and courses from being attached until the delete commits
+        statement = (
+            select(Niche.id, exists().where(UserNiche.niche_id == Niche.id))
+            .where(Niche.id == niche_id)
+            .with_for_update(of=Niche)
+        )
+        result = await session.execute(statement)
+        row = result.first()
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Niche not found"
             )
 
-        # Check if niche has associated users
-        from app.models.user_niche import UserNiche
-
-        user_niches_statement = select(UserNiche).where(UserNiche.niche_id == niche_id)
-        user_niches_result = await session.exec(user_niches_statement)
-        user_niches = user_niches_result.all()
-
-        if user_niches:
+        if row[1]:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Cannot delete niche that has associated users. Please reassign users first.",
             )
 
-        # Hard delete the niche
-        await session.delete(niche)
+        # Delete the niche's courses first to learn which cache entries to retire,
+        # then the niche itself; the database cascades the rest
+        courses_result = await session.execute(
+            delete(Course).where(Course.niche_id == niche_id).returning(Course.id)
+        )
+        course_ids = courses_result.scalars().all()
+        await session.execute(delete(Niche).where(Niche.id == niche_id))
         await session.commit()
+        await bump_versions(TAXONOMY_SCOPE)
+        taxonomy_cache.invalidate()
+
+        if course_ids:
+            await course_cache.invalidate(course_ids)
 
         return MessageResponseModel(message="Niche deleted successfully")
+
+    async def reassign_and_delete_niche(
+        self,
+        niche_id: uuid.UUID,
+        reassign_data: NicheReassignModel,
+        session: AsyncSession,
+    ) -> NicheReassignResponseModel:
+        """Move a niche's courses and users to another niche of its industry, then delete it"""
+        target_id = reassign_data.target_niche_id
+        if target_id == niche_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Target niche must be different from the niche being deleted",
+            )
+
+        # Lock both niches (in id order) so nothing is attached to the one being
+        # deleted, or the target deleted, while the rows move
+        statement = (
+            select(Niche.id, Niche.industry_id)
+            .where(Niche.id.in_([niche_id, target_id]))
+            .order_by(Niche.id)
+            .with_for_update()
+        )
+        result = await session.execute(statement)
+        industries = dict(result.all())
+        if niche_id not in industries:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Niche not found"
+            )
+        if target_id not in industries:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Target niche not found"
+            )
+        # Users' niches must stay within their industry
+        if industries[niche_id] != industries[target_id]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Target niche must belong to the same industry",
+            )
+
+        now = datetime.now()
+        courses_result = await session.execute(
+            update(Course)
+            .where(Course.niche_id == niche_id)
+            .values(niche_id=target_id, updated_at=now)
+            .returning(Course.id)
+        )
+        course_ids = courses_result.scalars().all()
+
+        # Members join the target niche unless they already belong to it
+        members = select(
+            func.uuid_generate_v7(),
+            UserNiche.user_id,
+            literal(target_id),
+            literal(now),
+            literal(now),
+        ).where(UserNiche.niche_id == niche_id)
+        await session.execute(
+            pg_insert(UserNiche)
+            .from_select(["id", "user_id", "niche_id", "created_at", "updated_at"], members)
+            .on_conflict_do_nothing(constraint="unique_user_niche")
+        )
+        users_result = await session.execute(
+            delete(UserNiche).where(UserNiche.niche_id == niche_id)
+        )
+        await session.execute(delete(Niche).where(Niche.id == niche_id))
+        await session.commit()
+
+        await bump_versions(TAXONOMY_SCOPE, TAXONOMY_MEMBERS_SCOPE)
+        taxonomy_cache.invalidate()
+        if course_ids:
+            await course_cache.invalidate(course_ids)
+
+        return NicheReassignResponseModel(
+            message="Niche reassigned and deleted successfully",
+            courses_moved=len(course_ids),
+            users_moved=users_result.rowcount,
+        )
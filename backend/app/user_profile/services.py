@@ -1,9 +1,14 @@
 import uuid
+from datetime import datetime
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from fastapi import HTTPException, status
 
+from app.core.http_cache import TAXONOMY_MEMBERS_SCOPE, bump_versions
+from app.core.ids import uuid7
 from app.models.user import User
 from app.models.industry import Industry
 from app.models.niche import Niche
@@ -59,43 +64,49 @@ class UserProfileService:
 
         return UserProfileModel.model_validate(user)
 
-    async def validate_industry_exists(
-        self, industry_id: uuid.UUID, session: AsyncSession
-    ) -> Industry:
-        """Validate that industry exists"""
-        statement = select(Industry).where(Industry.id == industry_id)
-        result = await session.exec(statement)
-        industry = result.first()
-
-        if not industry:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Industry not found",
-            )
-
-        return industry
-
-    async def validate_niches_exist(
-        self, niche_ids: List[uuid.UUID], session: AsyncSession
-    ) -> List[Niche]:
-        """Validate that all niches exist"""
+    async def validate_industry_and_niches(
+        self, industry_id: uuid.UUID, niche_ids: List[uuid.UUID], session: AsyncSession
+    ) -> Tuple[Industry, List[Niche]]:
+        """Validate that the industry and all niches exist and belong together"""
         if not niche_ids:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="At least one niche must be provided",
             )
 
-        statement = select(Niche).where(Niche.id.in_(niche_ids))
+        # One row per requested niche found (or a single row with no niche)
+        statement = (
+            select(Industry, Niche)
+            .select_from(Industry)
+            .outerjoin(Niche, Niche.id.in_(niche_ids))
+            .where(Industry.id == industry_id)
+        )
         result = await session.exec(statement)
-        niches = result.all()
+        rows = result.all()
 
-        if len(niches) != len(niche_ids):
+        if not rows:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Industry not found",
+            )
+
+        industry = rows[0][0]
+        niches_by_id = {niche.id: niche for _, niche in rows if niche is not None}
+        if len(niches_by_id) != len(niche_ids):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="One or more niches not found",
             )
 
-        return niches
+        niches = [niches_by_id[niche_id] for niche_id in niche_ids]
+        for niche in niches:
+            if niche.industry_id != industry_id:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Niche '{niche.name}' does not belong to the specified industry",
+                )
+
+        return industry, niches
 
     async def update_user_industry_and_niches(
         self,
@@ -112,34 +123,36 @@ class UserProfileService:
                 status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
             )
 
-        # Validate industry exists
-        industry = await self.validate_industry_exists(update_data.industry_id, session)
-
-        # Validate niches exist
-        niches = await self.validate_niches_exist(update_data.niche_ids, session)
-
-        # Validate that all niches belong to the specified industry
-        for niche in niches:
-            if niche.industry_id != update_data.industry_id:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Niche '{niche.name}' does not belong to the specified industry",
-                )
-
-        # Remove existing user niches
-        existing_user_niches_statement = select(UserNiche).where(
-            UserNiche.user_id == user_id
+        # Validate industry and niches in one query
+        niche_ids = list(dict.fromkeys(update_data.niche_ids))
+        industry, niches = await self.validate_industry_and_niches(
+            update_data.industry_id, niche_ids, session
         )
-        existing_user_niches_result = await session.exec(existing_user_niches_statement)
-        existing_user_niches = existing_user_niches_result.all()
-
-        for user_niche in existing_user_niches:
-            await session.delete(user_niche)
 
-        # Add new user niches
-        for niche_id in update_data.niche_ids:
-            user_niche = UserNiche(user_id=user_id, niche_id=niche_id)
-            session.add(user_niche)
+        # Remove the niches no longer chosen and add the new ones; memberships
+        # the user keeps are left untouched
+        await session.execute(
+            delete(UserNiche).where(
+                UserNiche.user_id == user_id, UserNiche.niche_id.not_in(niche_ids)
+            )
+        )
+        now = datetime.now()
+        await session.execute(
+            pg_insert(UserNiche)
+            .values(
+                [
+                    dict(
+                        id=uuid7(),
+                        user_id=user_id,
+                        niche_id=niche_id,
+                        created_at=now,
+                        updated_at=now,
+                    )
+                    for niche_id in niche_ids
+                ]
+            )
+            .on_conflict_do_nothing(constraint="unique_user_niche")
+        )
 
         # Update user's industry
         user.industry_id = update_data.industry_id
@@ -147,7 +160,7 @@ class UserProfileService:
         # Save changes
         session.add(user)
         await session.commit()
-        await session.refresh(user)
+        await bump_versions(TAXONOMY_MEMBERS_SCOPE)
 
         # Prepare response
         industry_response = IndustryModel.model_validate(industry)
@@ -184,14 +197,7 @@ class UserProfileService:
             )
 
         # Remove all user niches
-        existing_user_niches_statement = select(UserNiche).where(
-            UserNiche.user_id == user_id
-        )
-        existing_user_niches_result = await session.exec(existing_user_niches_statement)
-        existing_user_niches = existing_user_niches_result.all()
-
-        for user_niche in existing_user_niches:
-            await session.delete(user_niche)
+        await session.execute(delete(UserNiche).where(UserNiche.user_id == user_id))
 
         # Clear user's industry
         user.industry_id = None
@@ -199,5 +205,6 @@ class UserProfileService:
         # Save changes
         session.add(user)
         await session.commit()
+        await bump_versions(TAXONOMY_MEMBERS_SCOPE)
 
         return MessageResponseModel(message="Industry and niches cleared successfully")
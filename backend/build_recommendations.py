@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Build the course co-completion model used by GET /courses/recommended.
+
+Run periodically (e.g. nightly). Workers load the file on first use and keep it
+current incrementally in between; a full rebuild also drops completions of
+deleted users and courses.
+
+Usage: python build_recommendations.py [--output recommender/co_completion.npz]
+"""
+
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.course.recommendations import CoCompletionModel
+
+
+async def build(output: Path) -> None:
+    started = time.perf_counter()
+    model = CoCompletionModel()
+    async with async_session_maker() as session:
+        await model.build(session)
+    model.save(output)
+
+    print("🎉 Recommendation model built!")
+    print(f"   Courses: {len(model.course_ids)}")
+    print(f"   Users with completions: {len(model.user_index)}")
+    print(f"   Co-completion pairs: {model.co_completions.nnz}")
+    print(f"   Written to {output} in {time.perf_counter() - started:.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path(settings.RECOMMENDER_MODEL_PATH),
+        help="Where to write the model",
+    )
+    args = parser.parse_args()
+    asyncio.run(build(args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Bulk import courses from a JSON array or NDJSON file.
+
+Courses are matched on (title, industry): existing ones are updated, new ones are
+created, and missing industries and niches are created along the way.
+
+Usage: python import_courses.py courses.ndjson [--chunk-size 500]
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.course.importer import (
+    IMPORT_CHUNK_SIZE,
+    CourseImportService,
+    parse_import_payload,
+)
+
+
+async def import_file(path: Path, chunk_size: int) -> int:
+    payload = path.read_bytes()
+    # Anything that is not a JSON array is treated as one object per line
+    ndjson = not payload.lstrip().startswith(b"[")
+    try:
+        items = parse_import_payload(payload, ndjson=ndjson)
+    except ValidationError as e:
+        print(f"❌ Invalid courses in {path}:\n{e}")
+        return 1
+    except ValueError as e:
+        print(f"❌ Invalid JSON in {path}: {e}")
+        return 1
+
+    print(f"📦 Importing {len(items)} courses from {path} ...")
+    async with async_session_maker() as session:
+        result = await CourseImportService().import_courses(
+            items, session, chunk_size=chunk_size
+        )
+
+    print("🎉 Import complete!")
+    print(f"   Created: {result.created} courses")
+    print(f"   Updated: {result.updated} courses")
+    print(f"   New industries: {result.industries_created}")
+    print(f"   New niches: {result.niches_created}")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("path", type=Path, help="JSON array or NDJSON file")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=IMPORT_CHUNK_SIZE,
+        help="Courses per transaction",
+    )
+    args = parser.parse_args()
+
+    print(f"Database: {settings.DATABASE_URL.split('@')[-1] if '@' in settings.DATABASE_URL else 'configured'}")
+    sys.exit(asyncio.run(import_file(args.path, args.chunk_size)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Contract PDFs for load tests, built from the ML experiment test contracts"""
+
+import json
+import textwrap
+from pathlib import Path
+from typing import List
+
+TEST_CONTRACTS = (
+    Path(__file__).resolve().parents[2] / "ml archive" / "data" / "test_contracts.json"
+)
+LINES_PER_PAGE = 60
+
+
+def load_contract_texts(path: Path = TEST_CONTRACTS) -> List[str]:
+    """Plain text of every test contract"""
+    data = json.loads(path.read_text())
+    return [contract["text"] for contract in data["contracts"]]
+
+
+def build_pdf(text: str, repeat: int = 1) -> bytes:
+    """
+    Minimal text-only PDF (Helvetica, A4) that PyPDF2 can extract.
+    `repeat` concatenates the text to simulate longer contracts.
+    """
+    lines: List[str] = []
+    for _ in range(repeat):
+        for paragraph in text.split("\n"):
+            lines.extend(textwrap.wrap(paragraph, 95) or [""])
+    pages = [
+        lines[start : start + LINES_PER_PAGE]
+        for start in range(0, len(lines), LINES_PER_PAGE)
+    ] or [[]]
+
+    objects: List[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # page tree, filled in once the page ids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for page_lines in pages:
+        operations = ["BT /F1 10 Tf 40 800 Td 12 TL"]
+        for line in page_lines:
+            escaped = (
+                line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            )
+            operations.append(f"({escaped}) Tj T*")
+        operations.append("ET")
+        stream = "\n".join(operations).encode("latin-1", "replace")
+        objects.append(
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+        )
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Contents %d 0 R /Resources << /Font << /F1 3 0 R >> >> >>"
+            % len(objects)
+        )
+        page_ids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % page_id for page_id in page_ids),
+        len(page_ids),
+    )
+
+    output = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref_offset,
+    )
+    return output
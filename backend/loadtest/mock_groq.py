@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Offline stand-in for the Groq (OpenAI-compatible) chat completions API.
+
+Answers are sampled from the responses recorded in `ml archive/results/detailed_results.json`,
+delayed according to a configurable latency distribution, optionally streamed at a fixed
+token rate, and a share of requests is rejected with 429 like a real quota would.
+
+Run it, then point the backend at it:
+    python -m loadtest.mock_groq --port 9000 --latency lognormal:1.5:0.4 --rate-limit-ratio 0.05
+    GROQ_BASE_URL=http://127.0.0.1:9000 GROQ_API_KEY=mock uvicorn app.main:app
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+DEFAULT_CORPUS = (
+    Path(__file__).resolve().parents[2] / "ml archive" / "results" / "detailed_results.json"
+)
+FALLBACK_RESPONSE = (
+    "Summary: This agreement sets out the parties, the term, payment and "
+    "termination clauses. Please review it with a legal professional."
+)
+
+
+class LatencyDistribution:
+    """
+    Time to first token, parsed from "<kind>:<params>" (seconds):
+    fixed:1.2, uniform:0.5:3, normal:1.5:0.3, lognormal:<median>:<sigma>
+    """
+
+    def __init__(self, spec: str):
+        kind, *params = spec.split(":")
+        self.kind = kind
+        self.params = [float(p) for p in params]
+        if kind not in {"fixed", "uniform", "normal", "lognormal"}:
+            raise ValueError(f"Unknown latency distribution: {kind}")
+
+    def sample(self) -> float:
+        if self.kind == "fixed":
+            return self.params[0]
+        if self.kind == "uniform":
+            return random.uniform(self.params[0], self.params[1])
+        if self.kind == "normal":
+            return max(0.0, random.gauss(self.params[0], self.params[1]))
+        # lognormal parameterised by its median so the numbers read like latencies
+        return random.lognormvariate(math.log(self.params[0]), self.params[1])
+
+
+def load_corpus(path: Path) -> List[str]:
+    """Successful model responses from the experiment results"""
+    try:
+        records = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return [FALLBACK_RESPONSE]
+    responses = [
+        record["response"]
+        for record in records
+        if record.get("response") and record.get("error") in (None, "None", "")
+    ]
+    return responses or [FALLBACK_RESPONSE]
+
+
+def estimate_tokens(text: str) -> int:
+    """Same 1 token ≈ 4 characters estimate the backend uses"""
+    return max(1, len(text) // 4)
+
+
+def create_app(
+    latency: LatencyDistribution,
+    tokens_per_second: float,
+    rate_limit_ratio: float,
+    corpus: List[str],
+) -> FastAPI:
+    app = FastAPI(title="Mock Groq")
+    stats: Dict[str, int] = {"requests": 0, "rate_limited": 0, "streamed": 0}
+
+    def rate_limited_response() -> JSONResponse:
+        stats["rate_limited"] += 1
+        return JSONResponse(
+            status_code=429,
+            headers={"retry-after": "1"},
+            content={
+                "error": {
+                    "message": "Rate limit reached for model (mock): tokens per minute (TPM)",
+                    "type": "tokens",
+                    "code": "rate_limit_exceeded",
+                }
+            },
+        )
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        """OpenAI-compatible chat completion, streamed when the client asks for it"""
+        body: Dict[str, Any] = await request.json()
+        stats["requests"] += 1
+        if random.random() < rate_limit_ratio:
+            return rate_limited_response()
+
+        model = body.get("model", "mock")
+        prompt_tokens = sum(
+            estimate_tokens(str(message.get("content", "")))
+            for message in body.get("messages", [])
+        )
+        content = random.choice(corpus)
+        completion_tokens = estimate_tokens(content)
+        max_tokens: Optional[int] = body.get("max_tokens")
+        if max_tokens and completion_tokens > max_tokens:
+            content = content[: max_tokens * 4]
+            completion_tokens = max_tokens
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+
+        await asyncio.sleep(latency.sample())
+
+        if not body.get("stream"):
+            # Non-streaming clients still wait for the whole completion to be generated
+            if tokens_per_second > 0:
+                await asyncio.sleep(completion_tokens / tokens_per_second)
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": usage,
+            }
+
+        stats["streamed"] += 1
+
+        async def events():
+            def chunk(delta: Dict[str, str], finish_reason=None, **extra) -> str:
+                payload = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [
+                        {"index": 0, "delta": delta, "finish_reason": finish_reason}
+                    ],
+                    **extra,
+                }
+                return f"data: {json.dumps(payload)}\n\n"
+
+            yield chunk({"role": "assistant", "content": ""})
+            # ~4 characters per token, emitted at the configured rate
+            delay = 1 / tokens_per_second if tokens_per_second > 0 else 0
+            for start in range(0, len(content), 4):
+                yield chunk({"content": content[start : start + 4]})
+                if delay:
+                    await asyncio.sleep(delay)
+            yield chunk({}, "stop", x_groq={"usage": usage})
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/openai/v1/models")
+    async def list_models():
+        return {"object": "list", "data": [{"id": "mock", "object": "model"}]}
+
+    @app.get("/stats")
+    async def get_stats():
+        """Request counters, used by the load-test report"""
+        return stats
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument(
+        "--latency",
+        default="lognormal:1.5:0.4",
+        help="Time to first token: fixed:S, uniform:MIN:MAX, normal:MEAN:SD or lognormal:MEDIAN:SIGMA",
+    )
+    parser.add_argument(
+        "--tokens-per-second",
+        type=float,
+        default=400,
+        help="Generation speed; 0 returns the whole completion at once",
+    )
+    parser.add_argument(
+        "--rate-limit-ratio",
+        type=float,
+        default=0.0,
+        help="Share of requests rejected with 429 (0-1)",
+    )
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    corpus = load_corpus(args.corpus)
+    app = create_app(
+        LatencyDistribution(args.latency),
+        args.tokens_per_second,
+        args.rate_limit_ratio,
+        corpus,
+    )
+    print(f"Mock Groq serving {len(corpus)} corpus responses on {args.host}:{args.port}")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
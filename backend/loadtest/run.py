@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Load-test scenarios for the contract analysis endpoints.
+
+Virtual users sign up once and then repeat a scenario until the duration is over,
+while /health/pool is sampled to see how close the database pool and the Groq
+rate limiter get to saturation. Start the backend against loadtest.mock_groq first
+so no real Groq quota is spent:
+
+    python -m loadtest.run --base-url http://127.0.0.1:8000 --users 20 --duration 60 \
+        --scenario contract_flow --mock-url http://127.0.0.1:9000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from loadtest.fixtures import build_pdf, load_contract_texts
+
+API_PREFIX = "/api/v1"
+FOLLOW_UP_QUESTIONS = [
+    "What happens if I want to terminate early?",
+    "How and when am I paid royalties?",
+    "Who owns the masters and the copyright?",
+    "Is the agreement exclusive?",
+]
+
+
+@dataclass
+class StepStats:
+    """Latencies (seconds) and failures of one scenario step"""
+
+    latencies: List[float] = field(default_factory=list)
+    errors: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+
+class Recorder:
+    """Collects per-step timings across all virtual users"""
+
+    def __init__(self):
+        self.steps: Dict[str, StepStats] = defaultdict(StepStats)
+        self.flows_completed = 0
+
+    async def step(
+        self, name: str, request: Awaitable[httpx.Response]
+    ) -> Optional[httpx.Response]:
+        """Time a request; returns None (and records why) when it failed"""
+        started = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError as e:
+            self.steps[name].errors[type(e).__name__] += 1
+            return None
+        elapsed = time.perf_counter() - started
+        if response.status_code >= 400:
+            self.steps[name].errors[str(response.status_code)] += 1
+            return None
+        self.steps[name].latencies.append(elapsed)
+        return response
+
+
+@dataclass
+class VirtualUser:
+    client: httpx.AsyncClient
+    headers: Dict[str, str]
+    contracts: List[bytes]
+    contract_texts: List[str]
+
+
+async def sign_up(client: httpx.AsyncClient, recorder: Recorder) -> Optional[Dict[str, str]]:
+    email = f"lt-{uuid.uuid4().hex[:10]}@loadtest.local"
+    response = await recorder.step(
+        "signup",
+        client.post(
+            f"{API_PREFIX}/auth/signup/",
+            json={
+                "first_name": "Load",
+                "last_name": "Test",
+                "artist_name": "loadtest",
+                "email": email,
+                "password": "loadtest-password",
+            },
+        ),
+    )
+    if response is None:
+        return None
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def contract_flow(user: VirtualUser, recorder: Recorder) -> bool:
+    """Upload a PDF, save the analysis to a new chat, then ask a follow-up question"""
+    response = await recorder.step(
+        "upload_analyze",
+        user.client.post(
+            f"{API_PREFIX}/ai-chat/analyze-contract",
+            headers=user.headers,
+            files={"file": ("contract.pdf", random.choice(user.contracts), "application/pdf")},
+            data={"save_to_chat": "true"},
+        ),
+    )
+    if response is None:
+        return False
+    chat_id = response.json()["chat_id"]
+
+    response = await recorder.step(
+        "follow_up",
+        user.client.post(
+            f"{API_PREFIX}/ai-chat/analyze-contract",
+            headers=user.headers,
+            data={"chat_id": chat_id, "user_text": random.choice(FOLLOW_UP_QUESTIONS)},
+        ),
+    )
+    if response is None:
+        return False
+
+    response = await recorder.step(
+        "load_chat",
+        user.client.get(f"{API_PREFIX}/ai-chat/chats/{chat_id}", headers=user.headers),
+    )
+    return response is not None
+
+
+async def text_only(user: VirtualUser, recorder: Recorder) -> bool:
+    """Analyze pasted contract text without storing anything"""
+    response = await recorder.step(
+        "analyze_text",
+        user.client.post(
+            f"{API_PREFIX}/ai-chat/analyze-contract",
+            headers=user.headers,
+            data={"user_text": random.choice(user.contract_texts)},
+        ),
+    )
+    return response is not None
+
+
+async def batch_flow(user: VirtualUser, recorder: Recorder) -> bool:
+    """Stream a three-file batch analysis and read it to the summary line"""
+    files = [
+        ("files", (f"contract-{index}.pdf", pdf, "application/pdf"))
+        for index, pdf in enumerate(random.sample(user.contracts, min(3, len(user.contracts))))
+    ]
+    response = await recorder.step(
+        "batch_analyze",
+        user.client.post(
+            f"{API_PREFIX}/ai-chat/analyze-contracts/batch",
+            headers=user.headers,
+            files=files,
+        ),
+    )
+    if response is None:
+        return False
+    lines = [json.loads(line) for line in response.text.splitlines() if line]
+    return bool(lines) and lines[-1].get("type") == "summary"
+
+
+SCENARIOS: Dict[str, Callable[[VirtualUser, Recorder], Awaitable[bool]]] = {
+    "contract_flow": contract_flow,
+    "text_only": text_only,
+    "batch": batch_flow,
+}
+
+
+async def run_user(
+    client: httpx.AsyncClient,
+    scenario: Callable[[VirtualUser, Recorder], Awaitable[bool]],
+    contracts: List[bytes],
+    contract_texts: List[str],
+    recorder: Recorder,
+    deadline: float,
+):
+    headers = await sign_up(client, recorder)
+    if headers is None:
+        return
+    user = VirtualUser(
+        client=client,
+        headers=headers,
+        contracts=contracts,
+        contract_texts=contract_texts,
+    )
+    while time.monotonic() < deadline:
+        if await scenario(user, recorder):
+            recorder.flows_completed += 1
+
+
+async def sample_pool(
+    client: httpx.AsyncClient, samples: List[dict], stop: asyncio.Event, interval: float
+):
+    """Poll the backend's pool/limiter gauges until the run ends"""
+    while not stop.is_set():
+        try:
+            response = await client.get("/health/pool")
+            if response.status_code == 200:
+                samples.append(response.json())
+        except httpx.HTTPError:
+            pass
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(recorder: Recorder, pool_samples: List[dict], elapsed: float) -> dict:
+    steps = {}
+    for name, stats in recorder.steps.items():
+        latencies = sorted(stats.latencies)
+        steps[name] = {
+            "ok": len(latencies),
+            "errors": dict(stats.errors),
+            "throughput_rps": round(len(latencies) / elapsed, 2),
+            "p50_ms": round(percentile(latencies, 50) * 1000),
+            "p95_ms": round(percentile(latencies, 95) * 1000),
+            "p99_ms": round(percentile(latencies, 99) * 1000),
+            "max_ms": round(latencies[-1] * 1000) if latencies else 0,
+        }
+
+    pool = {}
+    if pool_samples:
+        database = [sample["database_pool"] for sample in pool_samples]
+        limiter = [sample["groq_rate_limiter"] for sample in pool_samples]
+        capacity = database[0]["capacity"]
+        pool = {
+            "samples": len(pool_samples),
+            "db_capacity": capacity,
+            "db_max_checked_out": max(d["checked_out"] for d in database),
+            "db_mean_checked_out": round(
+                sum(d["checked_out"] for d in database) / len(database), 2
+            ),
+            "db_saturated_pct": round(
+                100 * sum(d["checked_out"] >= capacity for d in database) / len(database), 1
+            ),
+            "groq_tpm_limit": limiter[0]["tokens_per_minute"],
+            "groq_max_tokens_in_window": max(l["tokens_in_window"] for l in limiter),
+        }
+
+    return {
+        "elapsed_s": round(elapsed, 1),
+        "flows_completed": recorder.flows_completed,
+        "flows_per_s": round(recorder.flows_completed / elapsed, 2),
+        "steps": steps,
+        "pool": pool,
+    }
+
+
+def print_report(summary: dict, mock_stats: Optional[dict]):
+    print(
+        f"\n{summary['flows_completed']} flows in {summary['elapsed_s']}s "
+        f"({summary['flows_per_s']} flows/s)\n"
+    )
+    print(f"{'step':<16}{'ok':>7}{'rps':>8}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}  errors")
+    for name, step in summary["steps"].items():
+        print(
+            f"{name:<16}{step['ok']:>7}{step['throughput_rps']:>8}"
+            f"{step['p50_ms']:>8}{step['p95_ms']:>8}{step['p99_ms']:>8}{step['max_ms']:>8}"
+            f"  {step['errors'] or '-'}"
+        )
+    pool = summary["pool"]
+    if pool:
+        print(
+            f"\nDB pool: max {pool['db_max_checked_out']}/{pool['db_capacity']} checked out, "
+            f"mean {pool['db_mean_checked_out']}, saturated in {pool['db_saturated_pct']}% of samples"
+        )
+        print(
+            f"Groq limiter: peak {pool['groq_max_tokens_in_window']}/{pool['groq_tpm_limit']} tokens in window"
+        )
+    if mock_stats:
+        print(f"Mock Groq: {mock_stats}")
+
+
+async def main_async(args):
+    contract_texts = load_contract_texts()
+    contracts = [build_pdf(text, repeat=args.contract_repeat) for text in contract_texts]
+    scenario = SCENARIOS[args.scenario]
+    recorder = Recorder()
+    pool_samples: List[dict] = []
+    stop = asyncio.Event()
+
+    limits = httpx.Limits(max_connections=args.users + 1)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, timeout=args.timeout, limits=limits
+    ) as client:
+        sampler = asyncio.create_task(
+            sample_pool(client, pool_samples, stop, args.sample_interval)
+        )
+        started = time.monotonic()
+        deadline = started + args.duration
+        users = []
+        for _ in range(args.users):
+            users.append(
+                asyncio.create_task(
+                    run_user(
+                        client, scenario, contracts, contract_texts, recorder, deadline
+                    )
+                )
+            )
+            # Ramp up instead of a thundering herd of sign-ups
+            await asyncio.sleep(args.ramp_up / max(1, args.users))
+        await asyncio.gather(*users)
+        elapsed = time.monotonic() - started
+        stop.set()
+        await sampler
+
+        mock_stats = None
+        if args.mock_url:
+            try:
+                mock_stats = (await client.get(f"{args.mock_url}/stats")).json()
+            except httpx.HTTPError:
+                pass
+
+    summary = summarize(recorder, pool_samples, elapsed)
+    print_report(summary, mock_stats)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump({**summary, "mock": mock_stats}, output, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="contract_flow")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds to keep starting flows")
+    parser.add_argument("--ramp-up", type=float, default=5, help="Seconds to start all users")
+    parser.add_argument("--timeout", type=float, default=120, help="Per-request timeout (s)")
+    parser.add_argument(
+        "--contract-repeat",
+        type=int,
+        default=20,
+        help="Repeat each test contract N times to get multi-page PDFs",
+    )
+    parser.add_argument("--sample-interval", type=float, default=0.5)
+    parser.add_argument("--mock-url", default=None, help="Mock Groq URL, to include its counters")
+    parser.add_argument("--output", default=None, help="Also write the summary as JSON")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Insert throughput and primary key index size with random (v4) vs time-ordered (v7) UUIDs.
+
+Two scratch tables shaped like user_course_progress are filled side by side, one
+committed batch at a time with the batches of the two alternating, so both see the
+same server conditions. Random keys land on random leaf pages, which splits them
+half full and touches far more of the index per batch; time-ordered keys append to
+the rightmost leaf. The tables are dropped afterwards.
+
+    python -m loadtest.uuid_keys --rows 500000 --batch 500
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict
+
+from sqlalchemy import text
+
+from app.core.database import async_engine
+from app.core.ids import uuid7
+
+KINDS: Dict[str, Callable[[], uuid.UUID]] = {"uuid4": uuid.uuid4, "uuid7": uuid7}
+
+
+def table_name(kind: str) -> str:
+    return f"loadtest_keys_{kind}"
+
+
+async def run(rows: int, batch: int) -> Dict[str, Dict[str, float]]:
+    results = {kind: {"seconds": 0.0} for kind in KINDS}
+    # The app engine logs every statement; that would dominate the timings
+    async_engine.echo = False
+    async with async_engine.connect() as connection:
+        for kind in KINDS:
+            await connection.execute(text(f"DROP TABLE IF EXISTS {table_name(kind)}"))
+            await connection.execute(
+                text(
+                    f"""
+                    CREATE TABLE {table_name(kind)} (
+                        id uuid PRIMARY KEY,
+                        user_id uuid NOT NULL,
+                        course_id uuid NOT NULL,
+                        position_seconds integer,
+                        created_at timestamp NOT NULL
+                    )
+                    """
+                )
+            )
+        await connection.commit()
+
+        try:
+            for start in range(0, rows, batch):
+                size = min(batch, rows - start)
+                for kind, new_id in KINDS.items():
+                    now = datetime.now()
+                    values = [
+                        {
+                            "id": new_id(),
+                            "user_id": uuid.uuid4(),
+                            "course_id": uuid.uuid4(),
+                            "position": position,
+                            "created_at": now,
+                        }
+                        for position in range(size)
+                    ]
+                    started = time.perf_counter()
+                    await connection.execute(
+                        text(
+                            f"INSERT INTO {table_name(kind)} "
+                            "VALUES (:id, :user_id, :course_id, :position, :created_at)"
+                        ),
+                        values,
+                    )
+                    await connection.commit()
+                    results[kind]["seconds"] += time.perf_counter() - started
+
+            has_pgstattuple = (
+                await connection.execute(
+                    text("SELECT 1 FROM pg_extension WHERE extname = 'pgstattuple'")
+                )
+            ).first() is not None
+            for kind, result in results.items():
+                index = f"{table_name(kind)}_pkey"
+                sizes = await connection.execute(
+                    text(
+                        "SELECT pg_relation_size(:index), pg_relation_size(:table)"
+                    ),
+                    {"index": index, "table": table_name(kind)},
+                )
+                index_bytes, table_bytes = sizes.one()
+                result["rows_per_second"] = rows / result["seconds"]
+                result["index_mb"] = index_bytes / 2**20
+                result["table_mb"] = table_bytes / 2**20
+                if has_pgstattuple:
+                    density = await connection.execute(
+                        text("SELECT avg_leaf_density FROM pgstatindex(:index)"),
+                        {"index": index},
+                    )
+                    result["leaf_density"] = density.scalar_one()
+        finally:
+            await connection.rollback()
+            for kind in KINDS:
+                await connection.execute(text(f"DROP TABLE IF EXISTS {table_name(kind)}"))
+            await connection.commit()
+    await async_engine.dispose()
+    return results
+
+
+def print_summary(results: Dict[str, Dict[str, float]], rows: int, batch: int) -> None:
+    print(f"\n{rows} rows in batches of {batch}")
+    print(f"{'keys':<8}{'rows/s':>10}{'index MB':>10}{'table MB':>10}{'leaf %':>8}")
+    for kind, result in results.items():
+        density = result.get("leaf_density")
+        print(
+            f"{kind:<8}{result['rows_per_second']:>10.0f}{result['index_mb']:>10.1f}"
+            f"{result['table_mb']:>10.1f}{density if density is not None else '-':>8}"
+        )
+    before, after = results["uuid4"], results["uuid7"]
+    print(
+        f"\nuuid7: {after['rows_per_second'] / before['rows_per_second']:.2f}x insert "
+        f"throughput, {after['index_mb'] / before['index_mb']:.2f}x index size"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--rows", type=int, default=500_000, help="Rows per table")
+    parser.add_argument("--batch", type=int, default=500, help="Rows per committed batch")
+    parser.add_argument("--output", default=None, help="Also write the results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.rows, args.batch))
+    print_summary(results, args.rows, args.batch)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
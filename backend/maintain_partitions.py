@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Create upcoming chat_messages partitions and detach those past retention.
+
+chat_messages is partitioned by month of created_at. Run this daily (e.g. from
+cron) so partitions exist PARTITION_MONTHS_AHEAD months ahead; months older than
+CHAT_MESSAGE_RETENTION_MONTHS are detached and kept as plain tables to archive,
+or dropped with --drop.
+
+Usage: python maintain_partitions.py [--drop]
+"""
+
+import argparse
+import asyncio
+
+from app.core.database import async_session_maker
+from app.core.partitions import maintain_partitions
+
+
+async def maintain(drop: bool) -> None:
+    async with async_session_maker() as session:
+        created, detached = await maintain_partitions(session, drop=drop)
+
+    print("🎉 Partitions maintained!")
+    print(f"   Created: {', '.join(created) or 'none'}")
+    print(f"   {'Dropped' if drop else 'Detached'}: {', '.join(detached) or 'none'}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--drop", action="store_true", help="Drop expired partitions instead of keeping them"
+    )
+    args = parser.parse_args()
+    asyncio.run(maintain(args.drop))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""partition_chat_messages_and_progress
+
+Revision ID: 3c9a7e5d14b2
+Revises: 8d3f52c0a6e1
+Create Date: 2026-10-19 20:34:12.480551
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9a7e5d14b2'
+down_revision: Union[str, Sequence[str], None] = '8d3f52c0a6e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Monthly chat_messages partitions created ahead of time; later months are added
+# by maintain_partitions.py (app.core.partitions)
+MONTHS_AHEAD = 3
+# Hash partitions of user_course_progress; changing this means rewriting the table
+PROGRESS_PARTITIONS = 8
+
+CHAT_MESSAGE_COLUMNS = (
+    'id, chat_id, role, content, reasoning, created_at, model, '
+    'prompt_tokens, completion_tokens, latency_ms, telemetry'
+)
+PROGRESS_COLUMNS = (
+    'id, user_id, course_id, is_favourite, is_completed, completed_at, created_at, '
+    'updated_at, position_seconds, duration_seconds, last_watched_at'
+)
+PROGRESS_TRIGGERS = (
+    ('INSERT', 'NEW TABLE AS new_progress'),
+    ('UPDATE', 'OLD TABLE AS old_progress NEW TABLE AS new_progress'),
+    ('DELETE', 'OLD TABLE AS old_progress'),
+)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def chat_messages_table(name: str, **kwargs) -> None:
+    op.create_table(
+        name,
+        sa.Column('id', sa.UUID(), server_default=sa.text('uuid_generate_v7()'), nullable=False),
+        sa.Column('chat_id', sa.UUID(), nullable=False),
+        sa.Column('role', sa.VARCHAR(), nullable=False),
+        sa.Column('content', sa.TEXT(), nullable=False),
+        sa.Column('reasoning', sa.TEXT(), nullable=True),
+        sa.Column('created_at', postgresql.TIMESTAMP(), nullable=False),
+        sa.Column('model', sa.VARCHAR(), nullable=True),
+        sa.Column('prompt_tokens', sa.INTEGER(), nullable=True),
+        sa.Column('completion_tokens', sa.INTEGER(), nullable=True),
+        sa.Column('latency_ms', sa.INTEGER(), nullable=True),
+        sa.Column('telemetry', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        **kwargs,
+    )
+
+
+def progress_table(name: str, **kwargs) -> None:
+    op.create_table(
+        name,
+        sa.Column('id', sa.UUID(), server_default=sa.text('uuid_generate_v7()'), nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('course_id', sa.UUID(), nullable=False),
+        sa.Column('is_favourite', sa.BOOLEAN(), nullable=False),
+        sa.Column('is_completed', sa.BOOLEAN(), nullable=False),
+        sa.Column('completed_at', postgresql.TIMESTAMP(), nullable=True),
+        sa.Column('created_at', postgresql.TIMESTAMP(), nullable=False),
+        sa.Column('updated_at', postgresql.TIMESTAMP(), nullable=False),
+        sa.Column('position_seconds', sa.INTEGER(), nullable=True),
+        sa.Column('duration_seconds', sa.INTEGER(), nullable=True),
+        sa.Column('last_watched_at', postgresql.TIMESTAMP(), nullable=True),
+        **kwargs,
+    )
+
+
+def chat_messages_constraints(primary_key: Sequence[str]) -> None:
+    op.create_primary_key('chat_messages_pkey', 'chat_messages', list(primary_key))
+    op.create_index('ix_chat_messages_chat_id', 'chat_messages', ['chat_id'], unique=False)
+    op.create_foreign_key('chat_messages_chat_id_fkey', 'chat_messages', 'chats', ['chat_id'], ['id'], ondelete='CASCADE')
+
+
+def progress_constraints(primary_key: Sequence[str]) -> None:
+    op.create_primary_key('user_course_progress_pkey', 'user_course_progress', list(primary_key))
+    op.create_unique_constraint('unique_user_course', 'user_course_progress', ['user_id', 'course_id'])
+    op.create_index('ix_user_course_progress_course_id', 'user_course_progress', ['course_id'], unique=False)
+    op.create_index('ix_user_course_progress_user_id', 'user_course_progress', ['user_id'], unique=False)
+    op.create_index('ix_user_course_progress_user_id_last_watched_at', 'user_course_progress', ['user_id', 'last_watched_at'], unique=False)
+    op.create_foreign_key('user_course_progress_course_id_fkey', 'user_course_progress', 'courses', ['course_id'], ['id'], ondelete='CASCADE')
+    op.create_foreign_key('user_course_progress_user_id_fkey', 'user_course_progress', 'users', ['user_id'], ['id'], ondelete='CASCADE')
+    # Counter triggers are created after the copy so it doesn't count rows twice
+    for event, transitions in PROGRESS_TRIGGERS:
+        op.execute(f"""
+            CREATE TRIGGER user_course_progress_counters_{event.lower()}
+            AFTER {event} ON user_course_progress
+            REFERENCING {transitions}
+            FOR EACH STATEMENT EXECUTE FUNCTION user_course_progress_counters_trigger()
+        """)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Each table is rebuilt: renamed aside, recreated partitioned, copied, and
+    # indexed after the copy. Writes to the two tables wait until this commits,
+    # so run it in a quiet period. Primary keys include the partition key, as
+    # Postgres requires; the ORM still identifies rows by id alone.
+
+    # chat_messages: monthly ranges of created_at, plus a default partition so an
+    # insert never fails when maintenance falls behind
+    op.rename_table('chat_messages', 'chat_messages_unpartitioned')
+    chat_messages_table('chat_messages', postgresql_partition_by='RANGE (created_at)')
+    oldest = op.get_bind().execute(
+        sa.text("SELECT min(created_at) FROM chat_messages_unpartitioned")
+    ).scalar()
+    this_month = date.today().replace(day=1)
+    month = oldest.date().replace(day=1) if oldest else this_month
+    while month <= add_months(this_month, MONTHS_AHEAD):
+        op.execute(
+            f"CREATE TABLE chat_messages_p{month:%Y%m} PARTITION OF chat_messages "
+            f"FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+        )
+        month = add_months(month, 1)
+    op.execute("CREATE TABLE chat_messages_default PARTITION OF chat_messages DEFAULT")
+    op.execute(
+        f"INSERT INTO chat_messages ({CHAT_MESSAGE_COLUMNS}) "
+        f"SELECT {CHAT_MESSAGE_COLUMNS} FROM chat_messages_unpartitioned"
+    )
+    op.drop_table('chat_messages_unpartitioned')
+    chat_messages_constraints(['id', 'created_at'])
+
+    # user_course_progress: hash of user_id, so a user's rows share one partition
+    op.rename_table('user_course_progress', 'user_course_progress_unpartitioned')
+    progress_table('user_course_progress', postgresql_partition_by='HASH (user_id)')
+    for remainder in range(PROGRESS_PARTITIONS):
+        op.execute(
+            f"CREATE TABLE user_course_progress_p{remainder} PARTITION OF user_course_progress "
+            f"FOR VALUES WITH (MODULUS {PROGRESS_PARTITIONS}, REMAINDER {remainder})"
+        )
+    op.execute(
+        f"INSERT INTO user_course_progress ({PROGRESS_COLUMNS}) "
+        f"SELECT {PROGRESS_COLUMNS} FROM user_course_progress_unpartitioned"
+    )
+    op.drop_table('user_course_progress_unpartitioned')
+    progress_constraints(['id', 'user_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Back to plain tables. Partitions detached by maintenance are not attached
+    # partitions any more, so their rows are not copied back.
+    op.rename_table('user_course_progress', 'user_course_progress_partitioned')
+    progress_table('user_course_progress')
+    op.execute(
+        f"INSERT INTO user_course_progress ({PROGRESS_COLUMNS}) "
+        f"SELECT {PROGRESS_COLUMNS} FROM user_course_progress_partitioned"
+    )
+    op.drop_table('user_course_progress_partitioned')
+    progress_constraints(['id'])
+
+    op.rename_table('chat_messages', 'chat_messages_partitioned')
+    chat_messages_table('chat_messages')
+    op.execute(
+        f"INSERT INTO chat_messages ({CHAT_MESSAGE_COLUMNS}) "
+        f"SELECT {CHAT_MESSAGE_COLUMNS} FROM chat_messages_partitioned"
+    )
+    op.drop_table('chat_messages_partitioned')
+    chat_messages_constraints(['id'])
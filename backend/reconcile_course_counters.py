@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Recount course favourites and completions and fix drifted counters.
+
+Database triggers keep courses.favourite_count and courses.completion_count in
+step with user_course_progress; run this after restores or manual data fixes,
+or periodically (e.g. nightly) as a safety net. Progress writes wait while it
+runs.
+
+Usage: python reconcile_course_counters.py
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.core.database import async_session_maker
+from app.course.services import CourseService
+
+
+async def reconcile() -> None:
+    started = time.perf_counter()
+    async with async_session_maker() as session:
+        corrected = await CourseService().reconcile_engagement_counters(session)
+
+    print("🎉 Course counters reconciled!")
+    print(f"   Courses corrected: {corrected}")
+    print(f"   Took {time.perf_counter() - started:.1f}s")
+
+
+def main() -> None:
+    argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip()).parse_args()
+    asyncio.run(reconcile())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,14 @@
 #!/usr/bin/env python3
 """
 Seed script to populate the database with courses for Art-Nuggets.
-Run this script after ensuring industries and niches are created in the database.
+Missing industries and niches are created; re-running updates existing courses.
 """
 
 import asyncio
-import uuid
-from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select
-from sqlalchemy.orm import sessionmaker
-from app.core.database import async_engine
+from app.core.database import async_session_maker
 from app.core.config import settings
-from app.models.industry import Industry
-from app.models.niche import Niche
-from app.course.services import CourseService
-from app.course.schemas import CourseCreateModel, KeyTakeawayCreate, AdditionalResourceCreate
+from app.course.importer import CourseImportService
+from app.course.schemas import CourseImportItem
 
 
 # Course data with industries and niches
@@ -554,114 +548,27 @@ COURSES_DATA = [
 ]
 
 
-async def get_or_create_industry(session: AsyncSession, industry_name: str) -> Industry:
-    """Get existing industry or create if it doesn't exist"""
-    statement = select(Industry).where(Industry.name == industry_name)
-    result = await session.exec(statement)
-    industry = result.first()
-    
-    if not industry:
-        industry = Industry(name=industry_name)
-        session.add(industry)
-        await session.commit()
-        await session.refresh(industry)
-        print(f"✅ Created industry: {industry_name}")
-    else:
-        print(f"✓ Found existing industry: {industry_name}")
-    
-    return industry
-
-
-async def get_or_create_niche(session: AsyncSession, niche_name: str, industry: Industry) -> Niche:
-    """Get existing niche or create if it doesn't exist"""
-    statement = select(Niche).where(
-        Niche.name == niche_name,
-        Niche.industry_id == industry.id
-    )
-    result = await session.exec(statement)
-    niche = result.first()
-    
-    if not niche:
-        niche = Niche(name=niche_name, industry_id=industry.id)
-        session.add(niche)
-        await session.commit()
-        await session.refresh(niche)
-        print(f"✅ Created niche: {niche_name}")
-    else:
-        print(f"✓ Found existing niche: {niche_name}")
-    
-    return niche
-
-
 async def seed_courses():
     """Main function to seed courses"""
     print("🌱 Starting course seeding process...\n")
-    
-    # Create session
-    Session = sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
-    async with Session() as session:
-        try:
-            course_service = CourseService()
-            created_count = 0
-            skipped_count = 0
-            
-            for course_data in COURSES_DATA:
-                try:
-                    # Get or create industry
-                    industry = await get_or_create_industry(session, course_data["industry"])
-                    
-                    # Get or create niche
-                    niche = await get_or_create_niche(session, course_data["niche"], industry)
-                    
-                    # Check if course already exists
-                    from app.models.course import Course
-                    statement = select(Course).where(
-                        Course.title == course_data["title"],
-                        Course.industry_id == industry.id
-                    )
-                    result = await session.exec(statement)
-                    existing_course = result.first()
-                    
-                    if existing_course:
-                        print(f"⏭️  Skipping existing course: {course_data['title']}")
-                        skipped_count += 1
-                        continue
-                    
-                    # Create course data model
-                    key_takeaways = [KeyTakeawayCreate(content=takeaway) for takeaway in course_data["key_takeaways"]]
-                    additional_resources = [
-                        AdditionalResourceCreate(title=res["title"], link=res["link"])
-                        for res in course_data.get("additional_resources", [])
-                    ]
-                    
-                    course_create = CourseCreateModel(
-                        title=course_data["title"],
-                        industry_id=industry.id,
-                        niche_id=niche.id,
-                        video_link=course_data["video_link"],
-                        summary=course_data["summary"],
-                        source=course_data.get("source"),
-                        key_takeaways=key_takeaways,
-                        additional_resources=additional_resources
-                    )
-                    
-                    # Create course using service
-                    await course_service.create_course(course_create, session)
-                    created_count += 1
-                    print(f"✅ Created course: {course_data['title']}\n")
-                    
-                except Exception as e:
-                    print(f"❌ Error creating course '{course_data['title']}': {e}\n")
-                    continue
-            
-            print(f"\n🎉 Seeding complete!")
-            print(f"   Created: {created_count} courses")
-            print(f"   Skipped: {skipped_count} courses")
-            
-        except Exception as e:
-            print(f"\n❌ Fatal error during seeding: {e}")
-            import traceback
-            traceback.print_exc()
+
+    try:
+        # Industries and niches are created by the import when missing, and
+        # courses that already exist are updated in place
+        items = [CourseImportItem(**course_data) for course_data in COURSES_DATA]
+        async with async_session_maker() as session:
+            result = await CourseImportService().import_courses(items, session)
+
+        print(f"\n🎉 Seeding complete!")
+        print(f"   Created: {result.created} courses")
+        print(f"   Updated: {result.updated} courses")
+        print(f"   New industries: {result.industries_created}")
+        print(f"   New niches: {result.niches_created}")
+
+    except Exception as e:
+        print(f"\n❌ Fatal error during seeding: {e}")
+        import traceback
+        traceback.print_exc()
 
 
 if __name__ == "__main__":